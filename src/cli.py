@@ -0,0 +1,374 @@
+"""
+命令行入口
+无界面批量执行扫描、解密、导出、替换等操作，便于在服务器或脚本中使用
+
+用法示例:
+    python -m src.cli scan <资源包或目录> --json
+    python -m src.cli decrypt <资源包或目录> -o <输出目录> --jobs 8
+    python -m src.cli extract <资源包或目录> -o <输出目录或 .zip/.tar 文件>
+    python -m src.cli export <资源包> --replace-dir <替换目录> -o <输出目录>
+    python -m src.cli replace-spine <原始目录> <替换目录> <输出目录>
+    python -m src.cli crosscore-decrypt <游戏资源目录>
+    python -m src.cli crosscore-encode <游戏资源目录> [索引文件]
+
+注意: 本模块不能导入 PyQt6
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import as_completed
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.BundleValidator import BundleValidator
+from src.utils.executor_registry import CPU_POOL, IO_POOL, configure, get_executor
+from src.utils.temp_store import get_temp_store
+
+# 退出码
+EXIT_OK = 0  # 全部成功
+EXIT_FAILED = 1  # 部分或全部失败
+EXIT_USAGE = 2  # 参数错误（与argparse保持一致）
+
+logger = logging.getLogger("ArknightAB.cli")
+
+
+def collect_bundles(inputs: List[str]) -> List[str]:
+    """
+    收集输入路径中的有效资源包
+
+    Args:
+        inputs: 文件或目录路径列表
+
+    Returns:
+        List[str]: 有效资源包路径列表
+    """
+    validator = BundleValidator()
+    bundles = []
+    for input_path in inputs:
+        if os.path.isfile(input_path):
+            candidates = [input_path]
+        elif os.path.isdir(input_path):
+            candidates = [os.path.join(root, file)
+                          for root, _, files in os.walk(input_path)
+                          for file in files]
+        else:
+            logger.warning(f"路径不存在，已跳过: {input_path}")
+            continue
+
+        for file_path in candidates:
+            if validator.is_valid_bundle(file_path)[0]:
+                bundles.append(file_path)
+    return bundles
+
+
+def _relative_dir(bundle_path: str, inputs: List[str]) -> str:
+    """获取资源包相对于所属输入目录的子目录，输入为单个文件时返回空字符串"""
+    bundle_path = os.path.abspath(bundle_path)
+    for input_path in inputs:
+        input_path = os.path.abspath(input_path)
+        if os.path.isdir(input_path) and os.path.commonpath([input_path, bundle_path]) == input_path:
+            return os.path.dirname(os.path.relpath(bundle_path, input_path))
+    return ""
+
+
+def run_parallel(items: List[str], func: Callable[[str], Dict], kind: str = CPU_POOL) -> List[Dict]:
+    """
+    在共享线程池中并行执行任务，单个任务失败不影响其他任务
+
+    Args:
+        items: 任务参数列表
+        func: 任务函数，返回结果字典（需包含 ok 字段）
+        kind: 线程池类型，大小由 --jobs 通过 _configure_pool 设置
+
+    Returns:
+        List[Dict]: 按输入顺序排列的结果列表
+    """
+    results = [None] * len(items)
+    executor = get_executor(kind)
+    futures = {executor.submit(func, item): index for index, item in enumerate(items)}
+    for done, future in enumerate(as_completed(futures), 1):
+        index = futures[future]
+        try:
+            results[index] = future.result()
+        except Exception as e:
+            results[index] = {"path": items[index], "ok": False, "error": str(e)}
+        logger.info(f"进度: {done}/{len(items)}")
+    return results
+
+
+def _scan_one(bundle_path: str, keep_temp: bool) -> Dict:
+    """扫描单个资源包"""
+    from src.core.asset_extractor import AssetExtractor
+
+    extractor = AssetExtractor()
+    # 保留临时目录时需要真实文件，供用户直接查看
+    files, temp_dir = extractor.scan_asset(bundle_path, use_pack=not keep_temp)
+    result = {
+        "path": bundle_path,
+        "ok": True,
+        "files": [{
+            "name": file["name"],
+            "type": file["type"],
+            "path_id": file["path_id"],
+            "size": file["size"],
+        } for file in files],
+    }
+    if keep_temp:
+        result["temp_dir"] = temp_dir
+    else:
+        get_temp_store().remove_dir(temp_dir)
+    return result
+
+
+def cmd_scan(args) -> List[Dict]:
+    """scan 子命令：输出资源包内的对象目录"""
+    bundles = collect_bundles(args.inputs)
+    logger.info(f"找到 {len(bundles)} 个资源包")
+    _configure_pool(args, CPU_POOL)
+    return run_parallel(bundles, lambda path: _scan_one(path, args.keep_temp))
+
+
+def cmd_decrypt(args) -> List[Dict]:
+    """decrypt 子命令：解密资源包到输出目录，保留相对目录结构"""
+    from src.core.asset_extractor import AssetExtractor
+
+    bundles = collect_bundles(args.inputs)
+    logger.info(f"找到 {len(bundles)} 个资源包")
+
+    def decrypt_one(bundle_path: str) -> Dict:
+        output_dir = os.path.join(args.output, _relative_dir(bundle_path, args.inputs))
+        ok = AssetExtractor().decrypt_ab(bundle_path, output_dir)
+        return {"path": bundle_path, "ok": ok, "output_dir": output_dir}
+
+    _configure_pool(args, CPU_POOL)
+    return run_parallel(bundles, decrypt_one)
+
+
+def cmd_extract(args) -> List[Dict]:
+    """extract 子命令：导出资源包中的所有对象到输出目录，输出路径为 .zip/.tar 文件时直接写入压缩包"""
+    from src.core.asset_extractor import AssetExtractor
+    from src.utils.archive_writer import open_archive
+
+    bundles = collect_bundles(args.inputs)
+    logger.info(f"找到 {len(bundles)} 个资源包")
+
+    # 所有资源包顺序写入同一个压缩包，每个资源包内部由进程池并行转换
+    archive = open_archive(args.output)
+    results = []
+    try:
+        for done, bundle_path in enumerate(bundles, 1):
+            try:
+                relative_dir = _relative_dir(bundle_path, args.inputs)
+                output_dir = None if archive else os.path.join(args.output, relative_dir)
+                stats = AssetExtractor().extract_objects(bundle_path, None, output_dir, max_workers=args.jobs,
+                                                         archive=archive, archive_dir=relative_dir)
+                results.append({"path": bundle_path, "ok": stats["failed"] == 0, **stats})
+            except Exception as e:
+                results.append({"path": bundle_path, "ok": False, "error": str(e)})
+            logger.info(f"进度: {done}/{len(bundles)}")
+    except BaseException:
+        if archive:
+            archive.abort()
+        raise
+    if archive:
+        archive.close()
+    return results
+
+
+def cmd_export(args) -> List[Dict]:
+    """export 子命令：用替换目录中的文件导出新的资源包"""
+    from src.core.asset_extractor import AssetExtractor
+
+    # 替换文件需要命名为 {名称}_{Path_ID} 形式
+    replace_files = []
+    for root, _, files in os.walk(args.replace_dir):
+        for file in files:
+            replace_path = os.path.join(root, file)
+            replace_files.append(((file, "", replace_path), replace_path))
+    logger.info(f"找到 {len(replace_files)} 个替换文件")
+
+    def export_one(bundle_path: str) -> Dict:
+        ok = AssetExtractor().export_ab(bundle_path, args.output, replace_files)
+        return {"path": bundle_path, "ok": ok}
+
+    _configure_pool(args, CPU_POOL)
+    return run_parallel(args.bundles, export_one)
+
+
+def cmd_replace_spine(args) -> List[Dict]:
+    """replace-spine 子命令：批量替换Spine资源"""
+    from src.core.asset_batch_replacer import AssetBatchReplacer
+
+    results = []
+
+    def on_bundle_done(done: int, total: int, result: Dict):
+        logger.info(f"进度: {done}/{total}")
+        results.append({"path": result["path"], "ok": result["ok"],
+                        "output": result["output"], "error": result["error"]})
+
+    replacer = AssetBatchReplacer()
+
+    def build(incremental: bool) -> List[Dict]:
+        results.clear()
+        ok = replacer.replace_spine_files(args.data_dir, args.replace_dir, args.target_dir,
+                                          max_workers=args.jobs, progress_callback=on_bundle_done,
+                                          incremental=incremental)
+        if not ok and all(result["ok"] for result in results):
+            # 参数错误等整体失败
+            results.append({"path": args.data_dir, "ok": False, "error": "批量替换失败"})
+        return list(results)
+
+    report = build(incremental=not args.full)
+    if not args.watch:
+        return report
+
+    # 监视模式：替换目录变化后增量重新打包，按 Ctrl+C 退出，结果为最后一轮打包
+    from src.core.replace_watcher import ReplaceDirWatcher
+
+    def on_change(changed_files):
+        nonlocal report
+        logger.info(f"{len(changed_files)} 个文件变化，重新打包")
+        report = build(incremental=True)
+
+    logger.info("监视模式已开启，按 Ctrl+C 退出")
+    try:
+        ReplaceDirWatcher(args.replace_dir).watch(on_change, lambda: False)
+    except KeyboardInterrupt:
+        logger.info("已退出监视模式")
+    return report
+
+
+def _configure_pool(args, kind: str):
+    """按 --jobs 参数设置共享线程池大小，未指定时使用配置或默认值"""
+    if args.jobs is not None:
+        configure(kind, args.jobs)
+
+
+def cmd_crosscore_decrypt(args) -> List[Dict]:
+    """crosscore-decrypt 子命令：原地解密交错战线资源目录"""
+    from src.core.crosscore_cryptor import CrosscoreCryptor
+
+    _configure_pool(args, IO_POOL)
+    stats = CrosscoreCryptor().decrypt(Path(args.game_dir))
+    return [{"path": args.game_dir, "ok": stats["failed"] == 0, **stats}]
+
+
+def cmd_crosscore_encode(args) -> List[Dict]:
+    """crosscore-encode 子命令：按文件头索引原地加密交错战线资源目录"""
+    from src.core.crosscore_cryptor import CrosscoreCryptor
+
+    _configure_pool(args, IO_POOL)
+    stats = CrosscoreCryptor().encode(Path(args.game_dir), args.cache_file)
+    return [{"path": args.game_dir, "ok": stats["failed"] == 0, **stats}]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器"""
+    # 各子命令通用的输出参数
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-v", "--verbose", action="store_true", help="输出调试日志")
+    common.add_argument("--json", action="store_true", help="以JSON格式输出结果到标准输出")
+    common.add_argument("--output-json", metavar="FILE", help="将JSON结果写入文件")
+
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Unity资源包命令行工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scan_parser = subparsers.add_parser("scan", parents=[common], help="扫描资源包并输出对象目录")
+    scan_parser.add_argument("inputs", nargs="+", help="资源包文件或目录")
+    scan_parser.add_argument("-j", "--jobs", type=int, default=None, help="并行数，默认按配置或CPU核心数")
+    scan_parser.add_argument("--keep-temp", action="store_true", help="保留扫描生成的临时目录")
+    scan_parser.set_defaults(func=cmd_scan)
+
+    decrypt_parser = subparsers.add_parser("decrypt", parents=[common], help="解密资源包")
+    decrypt_parser.add_argument("inputs", nargs="+", help="资源包文件或目录")
+    decrypt_parser.add_argument("-o", "--output", required=True, help="输出目录")
+    decrypt_parser.add_argument("-j", "--jobs", type=int, default=None, help="并行数，默认按配置或CPU核心数")
+    decrypt_parser.set_defaults(func=cmd_decrypt)
+
+    extract_parser = subparsers.add_parser("extract", parents=[common], help="导出资源包中的所有对象")
+    extract_parser.add_argument("inputs", nargs="+", help="资源包文件或目录")
+    extract_parser.add_argument("-o", "--output", required=True,
+                                help="输出目录，以 .zip/.tar/.tar.gz 结尾时直接写入压缩包")
+    extract_parser.add_argument("-j", "--jobs", type=int, default=None, help="并行进程数，默认按配置或CPU核心数")
+    extract_parser.set_defaults(func=cmd_extract)
+
+    export_parser = subparsers.add_parser("export", parents=[common], help="使用替换文件导出资源包")
+    export_parser.add_argument("bundles", nargs="+", help="原始资源包")
+    export_parser.add_argument("-r", "--replace-dir", required=True, help="替换文件目录（{名称}_{Path_ID} 命名）")
+    export_parser.add_argument("-o", "--output", required=True, help="输出目录")
+    export_parser.add_argument("-j", "--jobs", type=int, default=None, help="并行数，默认按配置或CPU核心数")
+    export_parser.set_defaults(func=cmd_export)
+
+    spine_parser = subparsers.add_parser("replace-spine", parents=[common], help="批量替换Spine资源")
+    spine_parser.add_argument("data_dir", help="原始资源目录")
+    spine_parser.add_argument("replace_dir", help="替换资源目录")
+    spine_parser.add_argument("target_dir", help="目标输出目录")
+    spine_parser.add_argument("-j", "--jobs", type=int, default=None, help="并行进程数，默认按配置或CPU核心数")
+    spine_parser.add_argument("--full", action="store_true", help="忽略构建清单，重新打包所有资源包")
+    spine_parser.add_argument("--watch", action="store_true", help="监视替换目录，文件变化后自动重新打包")
+    spine_parser.set_defaults(func=cmd_replace_spine)
+
+    cc_decrypt_parser = subparsers.add_parser("crosscore-decrypt", parents=[common], help="原地解密交错战线资源目录")
+    cc_decrypt_parser.add_argument("game_dir", help="游戏资源目录")
+    cc_decrypt_parser.add_argument("-j", "--jobs", type=int, default=None, help="I/O并行数，默认按配置或自动")
+    cc_decrypt_parser.set_defaults(func=cmd_crosscore_decrypt)
+
+    cc_encode_parser = subparsers.add_parser("crosscore-encode", parents=[common], help="原地加密交错战线资源目录")
+    cc_encode_parser.add_argument("game_dir", help="游戏资源目录")
+    cc_encode_parser.add_argument("cache_file", nargs="?", default=None,
+                                  help="解密时生成的文件头索引，默认使用该目录的索引；也支持旧版index_cache JSON")
+    cc_encode_parser.add_argument("-j", "--jobs", type=int, default=None, help="I/O并行数，默认按配置或自动")
+    cc_encode_parser.set_defaults(func=cmd_crosscore_encode)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """命令行入口函数"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    # 日志输出到标准错误，标准输出留给JSON结果
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        stream=sys.stderr
+    )
+
+    jobs = getattr(args, "jobs", None)
+    if jobs is not None and jobs < 1:
+        parser.error("--jobs 必须大于0")
+
+    try:
+        results = args.func(args)
+    except Exception as e:
+        logger.error(f"执行 {args.command} 时出错: {str(e)}")
+        results = [{"ok": False, "error": str(e)}]
+
+    failed = sum(1 for result in results if not result.get("ok"))
+    report = {
+        "command": args.command,
+        "total": len(results),
+        "failed": failed,
+        "results": results,
+    }
+
+    if args.output_json:
+        with open(args.output_json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        logger.info(f"{args.command} 完成: 共 {len(results)} 项，失败 {failed} 项")
+
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -30,6 +30,7 @@ class AppSettings:
     
     # 资源编辑设置
     ab_export_default_dir: Optional[str] = None  # 导出AB资源包默认保存目录
+    extract_to_archive: bool = False  # 提取资源时直接写入压缩包
     
     # 实验室MOD设置
     lab_mod_default_password: str = ""  # 默认压缩密码
@@ -37,6 +38,16 @@ class AppSettings:
     lab_mod_default_description: str = ""  # 默认MOD描述
     lab_mod_export_default_dir: Optional[str] = None  # 导出实验室MOD默认保存目录
     
+    # 性能设置
+    io_workers: int = 0  # I/O线程池线程数，0 表示自动
+    cpu_workers: int = 0  # 计算线程池线程数，0 表示自动
+    session_temp_budget_mb: int = 2048  # 已扫描资源包临时文件的磁盘预算（MB），0 表示不限制
+    session_memory_budget_mb: int = 256  # 已扫描资源包文件列表的内存预算（MB），0 表示不限制
+    temp_max_mb: int = 10240  # 临时目录占用上限（MB），超过时中止扫描或导出，0 表示不限制
+    scan_pack_outputs: bool = True  # 扫描结果写入单个打包文件，预览或提取时才生成真实文件
+    texture_cache_memory_mb: int = 256  # 解码后贴图缓存的内存预算（MB），0 表示不缓存
+    texture_cache_disk_mb: int = 0  # 贴图缓存淘汰时写入临时目录的磁盘预算（MB），0 表示不写入磁盘
+    
     # 其他设置（预留扩展）
     auto_check_update: bool = True
     language: str = "zh_CN"
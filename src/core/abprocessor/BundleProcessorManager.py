@@ -51,6 +51,24 @@ class BundleProcessorManager:
         processor_class = self._processors[game_type]
         return processor_class()
 
+    @staticmethod
+    def detect_game_type(file_path: str) -> GameType:
+        """
+        根据AB文件格式判断游戏类型
+
+        Args:
+            file_path: ab文件路径
+
+        Returns:
+            GameType: 游戏类型，无法区分的通用格式（包括Arknights等）返回 GameType.Common
+        """
+        # 使用各个处理器的 is_valid_bundle 方法判断文件类型
+        if Re1999BundleProcessor.is_valid_bundle(file_path):
+            return GameType.RE1999
+        if CrossCoreBundleProcessor.is_valid_bundle(file_path):
+            return GameType.CROSSCORE
+        return GameType.Common
+
     # 重载get_processor方法
     def get_processor_by_ab_type(self, file_path: str) -> BundleProcessor:
         """
@@ -65,15 +83,8 @@ class BundleProcessorManager:
         Raises:
             ValueError: 如果指定的游戏类型不存在
         """
-        # 使用各个处理器的 is_valid_bundle 方法判断文件类型
-     
-        if Re1999BundleProcessor.is_valid_bundle(file_path):
-            processor_class = self._processors[GameType.RE1999]
-        elif CrossCoreBundleProcessor.is_valid_bundle(file_path):
-             processor_class = self._processors[GameType.CROSSCORE]
-        else:  # Common格式（包括Arknights等）
-            processor_class = self._processors[GameType.Common]
-   
+        processor_class = self._processors[self.detect_game_type(file_path)]
+
         # 缓存处理器实例，避免重复创建
         if self._path_processors.get(file_path) is None:
             processor = processor_class()
@@ -1,12 +1,11 @@
-import re
 from abc import ABC, abstractmethod
-from binascii import hexlify
 from pathlib import Path
 from typing import Optional, Union, Tuple
 import logging
 
 from src.core.abprocessor.CompressionMethod import CompressionMethod
 from src.core.abprocessor.BundleProcessor import BundleProcessor
+from src.utils.signature_scanner import find_signature_offsets
 
 
 class CommonBundleProcessor(BundleProcessor):
@@ -31,16 +30,13 @@ class CommonBundleProcessor(BundleProcessor):
             bool: 如果是Common格式返回True
         """
         try:
-            with open(file_path, "rb") as f:
-                file_data = f.read()
-            
             # 检查是否为CrossCore格式（交错加密）
-            openFileHex = hexlify(file_data)
-            unityFS_len = len(re.findall(b"556e6974794653000000000", openFileHex))
-            if unityFS_len == 2:
+            if len(find_signature_offsets(file_path, max_count=3)) == 2:
                 return False
-            
+
             # 检查是否为Re1999格式
+            with open(file_path, "rb") as f:
+                file_data = f.read(2)
             if len(file_data) >= 2 and file_data[0] ^ 0x55 == file_data[1] ^ 0x6e:
                 return False
             
@@ -1,12 +1,11 @@
-import re
 from abc import ABC, abstractmethod
-from binascii import hexlify
 from pathlib import Path
 from typing import Optional, Union, Tuple
 import logging
 
 from src.core.abprocessor.CompressionMethod import CompressionMethod
 from src.core.abprocessor.BundleProcessor import BundleProcessor
+from src.utils.signature_scanner import find_signature_offsets, find_embedded_unityfs
 
 
 class CrossCoreBundleProcessor(BundleProcessor):
@@ -31,11 +30,8 @@ class CrossCoreBundleProcessor(BundleProcessor):
             bool: 如果是CrossCore资源包返回True，否则返回False
         """
         try:
-            with open(file_path, "rb") as f:
-                file_data = f.read()
-            openFileHex = hexlify(file_data)
-            unityFS_len = len(re.findall(b"556e6974794653000000000", openFileHex))
-            return unityFS_len == 2  # 交错加密格式有两个UnityFS标识
+            offsets = find_signature_offsets(file_path, max_count=3)
+            return len(offsets) == 2  # 交错加密格式有两个UnityFS标识
         except Exception:
             return False
 
@@ -51,18 +47,15 @@ class CrossCoreBundleProcessor(BundleProcessor):
             Tuple[bytes, Optional[bytes]]: (处理后的数据, 原始header数据)
         """
         try:
+            unityFS_index = find_embedded_unityfs(file_path)
             with open(file_path, "rb") as f:
                 file_data = f.read()
 
-            openFileHex = hexlify(file_data)
-            unityFS_len = len(re.findall(b"556e6974794653000000000", openFileHex))
-            if unityFS_len < 2:
+            if unityFS_index == -1:
                 return file_data, None
-            else:
-                unityFS_index = openFileHex.find(b"556e6974794653000000000",1)
 
             # 处理数据
-            self.header_size = unityFS_index // 2
+            self.header_size = unityFS_index
             processed_data = file_data[self.header_size:]
             # 保存处理后的数据
             header = file_data[:self.header_size]
@@ -35,8 +35,8 @@ class Re1999BundleProcessor(BundleProcessor):
         """
         try:
             with open(file_path, "rb") as f:
-                file_data = f.read()
-            
+                file_data = f.read(5)
+
             # 检查文件是否足够长（至少需要5个字节来验证"Unity"）
             if len(file_data) < 5:
                 return False
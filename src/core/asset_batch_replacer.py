@@ -1,15 +1,57 @@
 import logging
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 
 import UnityPy
 from PIL import Image
 from UnityPy.enums import TextureFormat
 
 from src.core.abprocessor.BundleProcessorManager import BundleProcessorManager
+from src.core.bundle_object_index import REPLACEABLE_TYPES, BundleObjectIndex, read_bundle_objects
+from src.core.build_manifest import BuildManifest
+from src.core.replace_index import ReplaceEntry, ReplaceIndex
+from src.utils.executor_registry import CPU_POOL, pool_size
 
 """批量资源替换器"""
 
+# 子进程中的替换器和替换目录索引，由进程池初始化函数设置
+_process_replacer: Optional['AssetBatchReplacer'] = None
+_process_replace_index: Optional[ReplaceIndex] = None
+
+
+def _init_replace_process(replace_index: ReplaceIndex):
+    """进程池初始化函数，每个子进程只接收一次替换目录索引"""
+    global _process_replacer, _process_replace_index
+    _process_replacer = AssetBatchReplacer()
+    _process_replace_index = replace_index
+
+
+def _replace_bundle_job(bundle_path: str, output_path: str) -> Dict:
+    """在子进程中处理单个资源包"""
+    return _process_replacer._run_job(bundle_path, output_path, _process_replace_index)
+
+
+def atomic_write_bytes(output_path: str, data: bytes):
+    """
+    原子写入文件：先写入同目录下的临时文件，再替换目标文件
+
+    Args:
+        output_path: 输出路径
+        data: 文件内容
+    """
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, output_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
 
 class AssetBatchReplacer:
     """
@@ -29,17 +71,25 @@ class AssetBatchReplacer:
 
         self.logger = logging.getLogger(__name__)
 
-    def replace_spine_files(self, data_dir: str, replace_dir: str, target_dir: str) -> bool:
+    def replace_spine_files(self, data_dir: str, replace_dir: str, target_dir: str,
+                            max_workers: Optional[int] = None,
+                            progress_callback: Optional[Callable[[int, int, Dict], None]] = None,
+                            incremental: bool = True) -> bool:
         """
         替换Spine动画资源
 
+        每个资源包在独立进程中处理，单个资源包失败不影响其他资源包
+
         Args:
             data_dir: 原始资源目录
             replace_dir: 替换资源目录
             target_dir: 目标输出目录
+            max_workers: 并行进程数，默认按配置的计算线程数
+            progress_callback: 进度回调，参数为 (已完成数, 总数, 单个资源包的结果)
+            incremental: 是否增量打包，只重新构建原始资源包或替换文件有变化的资源包
 
         Returns:
-            bool: 是否替换成功
+            bool: 是否全部替换成功
         """
         try:
             # 参数验证
@@ -53,111 +103,267 @@ class AssetBatchReplacer:
             if not target_path.parent.exists():
                 target_path.parent.mkdir(parents=True)
                 self.logger.info(f"创建目录: {target_path.parent}")
-            # 是否被处理
-            # 创建一个不能重复的列表
-            processed_files = set()
-
-            for root, _, files in os.walk(data_dir):
-                for file in files:
-                    if not file.endswith('.ab'):
-                        continue
-
-                    self.logger.info(f"处理文件: {file}")
-
-                    try:
-                        # 构建路径
-                        full_path = os.path.normpath(os.path.join(root, file))
-                        base_path = os.path.normpath(data_dir)
-                        relative_path = os.path.relpath(full_path, base_path)
-                        bundle_path = os.path.join(root, file)
-
-                        # 加载资源包
-                        bundle_processor = self.bundle_processor_manager.get_processor_by_ab_type(bundle_path)
-                        am = UnityPy.AssetsManager(bundle_processor.preprocess(asset_path)[0])
-
-                        # 处理资源包中的对象
-                        for obj in am.objects:
-                            try:
-                                if obj.type.name == 'TextAsset':
-                                    data = obj.read()
-
-                                    # 处理.skel文件
-                                    if data.m_Name.endswith('.skel'):
-                                        for root1, dirs1, files1 in os.walk(replace_dir):
-                                            for file1 in files1:
-                                                if f"{data.m_Name}_{obj.path_id}" in file1:
-                                                    fp = os.path.join(root1, file1)
-                                                    self.logger.info(f"替换.skel文件: {fp}")
-                                                    with open(fp, 'rb') as f:
-                                                        data.m_Script = f.read().decode("utf-8", "surrogateescape")
-                                                    data.save()
-                                                    processed_files.add(file)
-                                                    self.logger.info(f"已替换.skel文件: {data.m_Name}")
-
-                                    # 处理.atlas文件
-                                    elif data.m_Name.endswith('.atlas'):
-                                        for root1, dirs1, files1 in os.walk(replace_dir):
-                                            for file1 in files1:
-                                                if f"{data.m_Name}_{obj.path_id}" in file1:
-                                                    fp = os.path.join(root1, file1)
-                                                    # 检查关联文件
-                                                    json_path = os.path.join(root1,
-                                                                             data.m_Name.replace('.atlas', '.json'))
-                                                    skel_path = os.path.join(root1,
-                                                                             data.m_Name.replace('.atlas', '.skel'))
-                                                    if os.path.exists(json_path):
-                                                        if not os.path.exists(skel_path):
-                                                            self.logger.info(
-                                                                f"找到.json文件但缺少.skel文件，跳过: {data.m_Name}")
-                                                            continue
-                                                    self.logger.info(f"替换.atlas文件: {fp}")
-                                                    with open(fp, 'rb') as f:
-                                                        data.m_Script = f.read().decode("utf-8", "surrogateescape")
-                                                    data.save()
-                                                    processed_files.add(file)
-                                                    self.logger.info(f"已替换.atlas文件: {data.m_Name}")
-
-                                elif obj.type.name == 'Texture2D':
-                                    data = obj.read()
-                                    for root1, dirs1, files1 in os.walk(replace_dir):
-                                        for file1 in files1:
-                                            if f"{data.m_Name}_{obj.path_id}" in file1:
-                                                # 检查关联文件
-                                                json_path = os.path.join(root1, f"{data.m_Name}.json")
-                                                skel_path = os.path.join(root1, f"{data.m_Name}.skel")
-                                                if os.path.exists(json_path):
-                                                    if not os.path.exists(skel_path):
-                                                        self.logger.info(
-                                                            f"找到.json文件但缺少.skel文件，跳过: {data.m_Name}")
-                                                        continue
-                                                # 替换图片
-                                                fp = os.path.join(root1, file1)
-                                                self.logger.info(f"替换图片: {fp}")
-                                                pil_img = Image.open(fp).convert("RGBA")
-                                                data.set_image(img=pil_img, target_format=TextureFormat.RGBA32)
-                                                data.save()
-                                                processed_files.add(file)
-                                                self.logger.info(f"已替换图片: {data.m_Name}")
-
-                            except Exception as e:
-                                self.logger.error(f"处理对象时出错: {str(e)}")
-                                continue
-
-                        # 保存修改后的资源包
-                        if file in processed_files:
-                            output_path = os.path.join(target_dir, relative_path)
-                            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                            with open(output_path, "wb") as f:
-                                envdata = am.file.save(packer=bundle_processor.compression_method().value)
-                                f.write(envdata)
-                            self.logger.info(f"已保存资源包: {output_path}")
-
-                    except Exception as e:
-                        self.logger.error(f"处理资源包 {bundle_path} 时出错: {str(e)}")
-                        continue
 
-            return True
+            # 一次性索引替换目录，避免每个对象都重新遍历
+            replace_index = ReplaceIndex(replace_dir)
+            self.logger.info(f"替换目录索引完成，共 {len(replace_index)} 个文件")
+
+            # 预检：只加载包含替换目标的资源包
+            plan = self.plan_bundles(data_dir, replace_index)
+            manifest = BuildManifest(target_dir)
+
+            jobs = []
+            snapshots = {}
+            output_paths = []
+            up_to_date = 0
+            for bundle_path, input_paths in plan.items():
+                relative_path = os.path.relpath(os.path.normpath(bundle_path), os.path.normpath(data_dir))
+                output_path = os.path.join(target_dir, relative_path)
+                output_paths.append(output_path)
+                if incremental and manifest.is_up_to_date(output_path, bundle_path, input_paths):
+                    up_to_date += 1
+                    continue
+                # 在构建开始前记录输入状态，构建期间保存的文件下次会被视为有变化
+                snapshots[bundle_path] = manifest.snapshot(bundle_path, input_paths)
+                jobs.append((bundle_path, output_path))
+            if up_to_date:
+                self.logger.info(f"{up_to_date} 个资源包的输入未变化，跳过重新构建")
+
+            # 替换文件被删除后，不再有替换目标的资源包的旧输出已经过期
+            for removed_path in manifest.prune_deleted_inputs(output_paths):
+                self.logger.info(f"替换文件已删除，移除过期输出: {removed_path}")
+
+            results = self.run_jobs(jobs, replace_index, max_workers, progress_callback)
+
+            # 更新构建清单
+            for result in results:
+                if result["ok"] and result["replaced"]:
+                    manifest.record(result["output"], snapshots[result["path"]])
+                else:
+                    manifest.discard(result["output"])
+            try:
+                manifest.save()
+            except Exception as e:
+                self.logger.warning(f"保存构建清单失败: {str(e)}")
+
+            failed = [result for result in results if not result["ok"]]
+            for result in failed:
+                self.logger.error(f"处理资源包 {result['path']} 失败: {result['error']}")
+            self.logger.info(f"批量替换完成: 共 {len(results)} 个资源包，失败 {len(failed)} 个")
+            return not failed
 
         except Exception as e:
             self.logger.error(f"批量替换资源时出错: {str(e)}")
             return False
+
+    def run_jobs(self, jobs: List[Tuple[str, str]], replace_index: ReplaceIndex,
+                 max_workers: Optional[int] = None,
+                 progress_callback: Optional[Callable[[int, int, Dict], None]] = None) -> List[Dict]:
+        """
+        并行处理资源包替换任务
+
+        资源包加载、替换和保存都受GIL限制，因此使用进程池，只有一个任务时直接在当前进程处理
+
+        Args:
+            jobs: (资源包路径, 输出路径) 列表
+            replace_index: 替换目录索引
+            max_workers: 并行进程数，默认按配置的计算线程数
+            progress_callback: 进度回调，参数为 (已完成数, 总数, 单个资源包的结果)
+
+        Returns:
+            List[Dict]: 每个资源包的结果 {"path", "output", "ok", "replaced", "error"}
+        """
+        total = len(jobs)
+        max_workers = max(1, min(max_workers or pool_size(CPU_POOL), total or 1))
+        results = []
+
+        def collect(result: Dict):
+            results.append(result)
+            if progress_callback:
+                progress_callback(len(results), total, result)
+
+        if max_workers == 1 or total <= 1:
+            for bundle_path, output_path in jobs:
+                collect(self._run_job(bundle_path, output_path, replace_index))
+            return results
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_replace_process,
+                                 initargs=(replace_index,)) as executor:
+            futures = {executor.submit(_replace_bundle_job, bundle_path, output_path): (bundle_path, output_path)
+                       for bundle_path, output_path in jobs}
+            for future in as_completed(futures):
+                bundle_path, output_path = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # 子进程崩溃等情况，只影响当前资源包
+                    result = {"path": bundle_path, "output": output_path,
+                              "ok": False, "replaced": False, "error": str(e)}
+                collect(result)
+        return results
+
+    def _run_job(self, bundle_path: str, output_path: str, replace_index: ReplaceIndex) -> Dict:
+        """处理单个资源包并返回结果字典"""
+        result = {"path": bundle_path, "output": output_path, "ok": True, "replaced": False, "error": None}
+        try:
+            result["replaced"] = self.replace_bundle(bundle_path, output_path, replace_index, raise_errors=True)
+        except Exception as e:
+            result.update(ok=False, error=str(e))
+        return result
+
+    def plan_bundles(self, data_dir: str, replace_index: ReplaceIndex) -> Dict[str, List[str]]:
+        """
+        预检原始资源目录，找出包含替换目标的资源包
+
+        资源包中的对象名称记录在持久化索引中，文件未变化时无需重新加载资源包
+
+        Args:
+            data_dir: 原始资源目录
+            replace_index: 替换目录索引
+
+        Returns:
+            Dict[str, List[str]]: 需要处理的资源包路径到其使用的替换文件路径的映射
+        """
+        bundles = [os.path.join(root, file)
+                   for root, _, files in os.walk(data_dir)
+                   for file in files if file.endswith('.ab')]
+
+        planned = {}
+        indexed = 0
+        with BundleObjectIndex() as object_index:
+            for bundle_path in bundles:
+                try:
+                    objects = object_index.get(bundle_path)
+                    if objects is None:
+                        objects = read_bundle_objects(bundle_path, self.bundle_processor_manager)
+                        object_index.put(bundle_path, objects)
+                        indexed += 1
+                except Exception as e:
+                    self.logger.error(f"读取资源包 {bundle_path} 的对象列表时出错: {str(e)}")
+                    continue
+
+                input_paths = [entry.path for entry in
+                               (self._find_replace_target(type_name, name, path_id, replace_index)
+                                for path_id, type_name, name in objects) if entry]
+                if input_paths:
+                    planned[bundle_path] = input_paths
+
+        self.logger.info(f"预检完成: 共 {len(bundles)} 个资源包，新建索引 {indexed} 个，需要处理 {len(planned)} 个")
+        return planned
+
+    @staticmethod
+    def _find_replace_target(type_name: str, name: str, path_id: int,
+                             replace_index: ReplaceIndex) -> Optional[ReplaceEntry]:
+        """查找对象对应的替换文件，与 _replace_object 的处理范围一致"""
+        if type_name == 'TextAsset' and not name.endswith(('.skel', '.atlas')):
+            return None
+        if type_name not in REPLACEABLE_TYPES:
+            return None
+        return replace_index.find(name, path_id)
+
+    def replace_bundle(self, bundle_path: str, output_path: str, replace_index: ReplaceIndex,
+                       raise_errors: bool = False) -> bool:
+        """
+        替换单个资源包中的Spine资源，有对象被替换时保存到输出路径
+
+        输出先写入同目录下的临时文件再重命名，中途失败不会留下不完整的资源包
+
+        Args:
+            bundle_path: 资源包路径
+            output_path: 输出路径
+            replace_index: 替换目录索引
+            raise_errors: 出错时是否抛出异常，默认记录日志并返回False
+
+        Returns:
+            bool: 是否有对象被替换并保存
+        """
+        try:
+            # 加载资源包
+            bundle_processor = self.bundle_processor_manager.get_processor_by_ab_type(bundle_path)
+            am = UnityPy.AssetsManager(bundle_processor.preprocess(bundle_path)[0])
+
+            # 处理资源包中的对象
+            replaced = False
+            for obj in am.objects:
+                try:
+                    if self._replace_object(obj, replace_index):
+                        replaced = True
+                except Exception as e:
+                    self.logger.error(f"处理对象时出错: {str(e)}")
+                    continue
+
+            # 保存修改后的资源包
+            if replaced:
+                envdata = am.file.save(packer=bundle_processor.compression_method().value)
+                atomic_write_bytes(output_path, envdata)
+                self.logger.info(f"已保存资源包: {output_path}")
+            return replaced
+
+        except Exception as e:
+            self.logger.error(f"处理资源包 {bundle_path} 时出错: {str(e)}")
+            if raise_errors:
+                raise
+            return False
+
+    def _replace_object(self, obj, replace_index: ReplaceIndex) -> bool:
+        """
+        按替换目录索引替换单个对象
+
+        Args:
+            obj: UnityPy对象
+            replace_index: 替换目录索引
+
+        Returns:
+            bool: 是否替换
+        """
+        if obj.type.name == 'TextAsset':
+            data = obj.read()
+
+            # 处理.skel文件
+            if data.m_Name.endswith('.skel'):
+                entry = replace_index.find(data.m_Name, obj.path_id)
+                if entry is None:
+                    return False
+                self.logger.info(f"替换.skel文件: {entry.path}")
+                with open(entry.path, 'rb') as f:
+                    data.m_Script = f.read().decode("utf-8", "surrogateescape")
+                data.save()
+                self.logger.info(f"已替换.skel文件: {data.m_Name}")
+                return True
+
+            # 处理.atlas文件
+            if data.m_Name.endswith('.atlas'):
+                entry = replace_index.find(data.m_Name, obj.path_id)
+                if entry is None:
+                    return False
+                # 检查关联文件
+                if replace_index.missing_skel(entry.directory,
+                                              data.m_Name.replace('.atlas', '.json'),
+                                              data.m_Name.replace('.atlas', '.skel')):
+                    self.logger.info(f"找到.json文件但缺少.skel文件，跳过: {data.m_Name}")
+                    return False
+                self.logger.info(f"替换.atlas文件: {entry.path}")
+                with open(entry.path, 'rb') as f:
+                    data.m_Script = f.read().decode("utf-8", "surrogateescape")
+                data.save()
+                self.logger.info(f"已替换.atlas文件: {data.m_Name}")
+                return True
+
+        elif obj.type.name == 'Texture2D':
+            data = obj.read()
+            entry = replace_index.find(data.m_Name, obj.path_id)
+            if entry is None:
+                return False
+            # 检查关联文件
+            if replace_index.missing_skel(entry.directory, f"{data.m_Name}.json", f"{data.m_Name}.skel"):
+                self.logger.info(f"找到.json文件但缺少.skel文件，跳过: {data.m_Name}")
+                return False
+            # 替换图片
+            self.logger.info(f"替换图片: {entry.path}")
+            pil_img = Image.open(entry.path).convert("RGBA")
+            data.set_image(img=pil_img, target_format=TextureFormat.RGBA32)
+            data.save()
+            self.logger.info(f"已替换图片: {data.m_Name}")
+            return True
+
+        return False
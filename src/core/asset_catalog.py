@@ -0,0 +1,513 @@
+"""
+全局资源目录
+扫描整个游戏安装目录，把所有资源包中的对象记录到本地 SQLite 索引中，
+可以在不打开资源包的情况下按名称、类型或容器路径查找对象所在的资源包，
+或按 TextAsset 文本和 MonoBehaviour 字符串字段的内容全文搜索
+
+索引按文件修改时间和大小增量更新，资源包在进程池中并行解析:
+    bundles(path, original_path, ...)       path 为规范化路径，只用于比较；original_path 为原始路径，返回给界面
+    objects(bundle_path, path_id, type, name, container, byte_size)
+    texts(bundle_path, path_id, content)    FTS5 全文索引
+    text_rows(text_rowid, bundle_path)      全文记录所属的资源包，按 rowid 删除全文记录
+    names(name, container)                  objects 的 FTS5 外部内容索引，名称和容器路径的子串搜索
+"""
+import logging
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import UnityPy
+
+from src.core.abprocessor.BundleProcessorManager import BundleProcessorManager
+from src.utils.BundleValidator import BundleValidator
+from src.utils.executor_registry import CPU_POOL, IO_POOL, get_executor, pool_size
+from src.utils.path_helper import get_user_data_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bundles (
+    path TEXT PRIMARY KEY,
+    original_path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    game_type TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS objects (
+    id INTEGER PRIMARY KEY,
+    bundle_path TEXT NOT NULL REFERENCES bundles(path) ON DELETE CASCADE,
+    path_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    container TEXT NOT NULL,
+    byte_size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_catalog_bundle ON objects(bundle_path);
+CREATE INDEX IF NOT EXISTS idx_catalog_name ON objects(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_catalog_type ON objects(type);
+"""
+
+# trigram 分词支持中文等无空格文本的子串搜索，查询至少需要3个字符
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS texts USING fts5(
+    bundle_path UNINDEXED,
+    path_id UNINDEXED,
+    content,
+    tokenize = 'trigram'
+);
+CREATE TABLE IF NOT EXISTS text_rows (
+    text_rowid INTEGER PRIMARY KEY,
+    bundle_path TEXT NOT NULL REFERENCES bundles(path) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_text_rows_bundle ON text_rows(bundle_path);
+CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5(
+    name,
+    container,
+    content = 'objects',
+    content_rowid = 'id',
+    tokenize = 'trigram'
+);
+CREATE TRIGGER IF NOT EXISTS objects_names_insert AFTER INSERT ON objects BEGIN
+    INSERT INTO names (rowid, name, container) VALUES (new.id, new.name, new.container);
+END;
+CREATE TRIGGER IF NOT EXISTS objects_names_delete AFTER DELETE ON objects BEGIN
+    INSERT INTO names (names, rowid, name, container) VALUES ('delete', old.id, old.name, old.container);
+END;
+"""
+
+# 索引结构版本，结构变化时清空旧索引重新构建
+CATALOG_VERSION = 5
+
+# 需要建立全文索引的对象类型
+TEXT_TYPES = ("TextAsset", "MonoBehaviour")
+
+# 单个对象最多索引的字符数，避免超大文本撑大索引
+MAX_TEXT_LENGTH = 1 << 20
+
+# 全文索引的最短查询长度（trigram 分词限制）
+MIN_FTS_QUERY_LENGTH = 3
+
+# 每解析多少个资源包提交一次事务
+COMMIT_INTERVAL = 50
+
+# 单次查询默认返回的最大条数
+DEFAULT_SEARCH_LIMIT = 500
+
+# (path_id, 类型, 名称, 容器路径, 序列化大小)
+CatalogRow = Tuple[int, str, str, str, int]
+
+
+@dataclass
+class CatalogEntry:
+    """资源目录中的单个对象"""
+    bundle_path: str
+    game_type: str
+    path_id: int
+    type: str
+    name: str
+    container: str
+    byte_size: int
+
+
+@dataclass
+class TextMatch:
+    """全文搜索结果"""
+    bundle_path: str
+    path_id: int
+    type: str
+    name: str
+    snippet: str
+
+
+def default_catalog_path() -> Path:
+    """
+    获取默认的资源目录索引路径
+
+    Returns:
+        Path: 索引文件路径
+    """
+    cache_dir = get_user_data_dir() / "cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir / "asset_catalog.db"
+
+
+def _object_name(obj) -> str:
+    """读取对象名称，没有名称的对象返回空字符串"""
+    try:
+        if hasattr(obj, "peek_name"):
+            return obj.peek_name() or ""
+        return getattr(obj.read(), "m_Name", "") or ""
+    except Exception:
+        return ""
+
+
+def _collect_strings(value, out: List[str]):
+    """递归收集类型树中的字符串字段"""
+    if isinstance(value, str):
+        if value:
+            out.append(value)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect_strings(item, out)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_strings(item, out)
+
+
+def _object_text(obj) -> str:
+    """
+    读取对象中可搜索的文本，二进制 TextAsset 和无类型树的 MonoBehaviour 返回空字符串
+
+    Args:
+        obj: UnityPy 对象
+
+    Returns:
+        str: 文本内容
+    """
+    try:
+        if obj.type.name == "TextAsset":
+            script = obj.read().m_Script
+            if isinstance(script, bytes):
+                script = script.decode("utf-8", errors="ignore")
+            text = script or ""
+            if "\x00" in text[:1024]:
+                return ""
+        else:
+            strings: List[str] = []
+            _collect_strings(obj.read_typetree(), strings)
+            text = "\n".join(strings)
+    except Exception:
+        return ""
+    return text[:MAX_TEXT_LENGTH]
+
+
+def read_catalog_rows(bundle_path: str) -> Tuple[str, List[CatalogRow], List[Tuple[int, str]]]:
+    """
+    解析资源包中的所有对象（在子进程中执行）
+
+    Args:
+        bundle_path: 资源包路径
+
+    Returns:
+        Tuple: (游戏类型名称, 对象列表, [(path_id, 文本内容)])
+    """
+    manager = BundleProcessorManager()
+    game_type = manager.detect_game_type(bundle_path)
+    bundle_processor = manager.get_processor_by_game_type(game_type)
+    am = UnityPy.AssetsManager(bundle_processor.preprocess(bundle_path)[0])
+
+    # 容器路径（例如 assets/xxx/char_002_amiya.prefab）按 path_id 反查
+    containers = {}
+    for container_path, reader in am.container.items():
+        path_id = getattr(reader, "path_id", getattr(reader, "m_PathID", None))
+        if path_id is not None:
+            containers.setdefault(path_id, container_path)
+
+    rows = [(obj.path_id, obj.type.name, _object_name(obj),
+             containers.get(obj.path_id, ""), getattr(obj, "byte_size", 0) or 0)
+            for obj in am.objects]
+
+    texts = []
+    for obj in am.objects:
+        if obj.type.name in TEXT_TYPES:
+            text = _object_text(obj)
+            if text.strip():
+                texts.append((obj.path_id, text))
+    return game_type.name, rows, texts
+
+
+class AssetCatalog:
+    """全局资源目录（SQLite）"""
+
+    def __init__(self, db_path: Union[str, Path, None] = None):
+        """
+        打开或创建资源目录
+
+        Args:
+            db_path: 索引文件路径，默认位于用户数据目录
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_path = Path(db_path) if db_path else default_catalog_path()
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != CATALOG_VERSION:
+            # 旧版本索引结构不同（缺少全文数据或原始路径），清空后重新构建
+            self.conn.executescript("DROP TABLE IF EXISTS names; DROP TABLE IF EXISTS text_rows; "
+                                    "DROP TABLE IF EXISTS texts; DROP TABLE IF EXISTS objects; "
+                                    "DROP TABLE IF EXISTS bundles;")
+            self.conn.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+        self.conn.executescript(_SCHEMA)
+        self.scoped = False
+        try:
+            self.conn.executescript(_FTS_SCHEMA)
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            self.fts_enabled = False
+            self.logger.warning(f"当前 SQLite 不支持 FTS5 全文索引，已禁用全文搜索: {str(e)}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """关闭资源目录"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    @staticmethod
+    def _key(bundle_path: str) -> str:
+        """规范化资源包路径（Windows 下转为小写），只用于比较和查找，不返回给界面"""
+        return os.path.normcase(os.path.abspath(bundle_path))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        获取资源目录统计信息
+
+        Returns:
+            Dict[str, int]: {"bundles", "objects", "texts"}
+        """
+        bundles = self.conn.execute("SELECT COUNT(*) FROM bundles WHERE 1 = 1" +
+                                    self._scope_filter("path")).fetchone()[0]
+        objects = self.conn.execute("SELECT COUNT(*) FROM objects WHERE 1 = 1" +
+                                    self._scope_filter("bundle_path")).fetchone()[0]
+        texts = self.conn.execute("SELECT COUNT(*) FROM text_rows WHERE 1 = 1" +
+                                  self._scope_filter("bundle_path")).fetchone()[0] if self.fts_enabled else 0
+        return {"bundles": bundles, "objects": objects, "texts": texts}
+
+    def _stale_bundles(self, bundle_paths: Iterable[str]) -> List[str]:
+        """筛选出未索引或修改时间、大小发生变化的资源包"""
+        known = {path: (mtime_ns, size) for path, mtime_ns, size in
+                 self.conn.execute("SELECT path, mtime_ns, size FROM bundles")}
+        stale = []
+        for bundle_path in bundle_paths:
+            try:
+                stat = os.stat(bundle_path)
+            except OSError:
+                continue
+            if known.get(self._key(bundle_path)) != (stat.st_mtime_ns, stat.st_size):
+                stale.append(bundle_path)
+        return stale
+
+    def _remove_missing(self, root_dirs: List[str], bundle_paths: List[str]) -> int:
+        """删除扫描目录下已不存在的资源包记录"""
+        present = {self._key(path) for path in bundle_paths}
+        removed = 0
+        for root_dir in root_dirs:
+            prefix = self._key(root_dir).rstrip(os.sep) + os.sep
+            rows = self.conn.execute("SELECT path FROM bundles WHERE substr(path, 1, ?) = ?",
+                                     (len(prefix), prefix)).fetchall()
+            for (path,) in rows:
+                if path not in present:
+                    self._delete_bundle(path)
+                    removed += 1
+        self.conn.commit()
+        return removed
+
+    def _delete_bundle(self, key: str):
+        """删除资源包及其对象、全文记录（全文表不支持外键级联，按 rowid 删除，避免扫描整个全文表）"""
+        if self.fts_enabled:
+            rowids = self.conn.execute("SELECT text_rowid FROM text_rows WHERE bundle_path = ?", (key,)).fetchall()
+            self.conn.executemany("DELETE FROM texts WHERE rowid = ?", rowids)
+        self.conn.execute("DELETE FROM bundles WHERE path = ?", (key,))
+
+    def put(self, bundle_path: str, game_type: str, rows: List[CatalogRow],
+            texts: Iterable[Tuple[int, str]] = ()):
+        """
+        写入单个资源包的对象列表和文本内容，覆盖旧记录（不提交事务）
+
+        Args:
+            bundle_path: 资源包路径
+            game_type: 游戏类型名称
+            rows: 对象列表
+            texts: [(path_id, 文本内容)]
+        """
+        key = self._key(bundle_path)
+        stat = os.stat(bundle_path)
+        self._delete_bundle(key)
+        self.conn.execute("INSERT INTO bundles (path, original_path, mtime_ns, size, game_type) "
+                          "VALUES (?, ?, ?, ?, ?)",
+                          (key, bundle_path, stat.st_mtime_ns, stat.st_size, game_type))
+        self.conn.executemany(
+            "INSERT INTO objects (bundle_path, path_id, type, name, container, byte_size) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(key,) + tuple(row) for row in rows]
+        )
+        if self.fts_enabled:
+            for path_id, text in texts:
+                cursor = self.conn.execute("INSERT INTO texts (bundle_path, path_id, content) VALUES (?, ?, ?)",
+                                           (key, path_id, text))
+                self.conn.execute("INSERT INTO text_rows (text_rowid, bundle_path) VALUES (?, ?)",
+                                  (cursor.lastrowid, key))
+
+    def build(self, root_dirs: List[str], max_workers: Optional[int] = None,
+              progress_callback: Optional[Callable[[int, int, str], None]] = None,
+              should_stop: Optional[Callable[[], bool]] = None) -> Dict[str, int]:
+        """
+        扫描目录并增量更新资源目录
+
+        Args:
+            root_dirs: 游戏资源目录列表
+            max_workers: 并行进程数，默认按配置的计算线程数
+            progress_callback: 进度回调，参数为 (已完成数, 总数, 资源包路径)
+            should_stop: 是否中止，已解析的资源包会保留
+
+        Returns:
+            Dict[str, int]: 统计信息 {"total", "updated", "failed", "removed"}
+        """
+        validator = BundleValidator()
+        candidates = list(validator.iter_candidates(root_dirs))
+        signatures = get_executor(IO_POOL).map(validator.has_unity_signature, candidates)
+        bundle_paths = [path for path, is_bundle in zip(candidates, signatures) if is_bundle]
+        removed = self._remove_missing(root_dirs, bundle_paths)
+        stats = self.index_bundles(bundle_paths, max_workers, progress_callback, should_stop)
+        stats["removed"] = removed
+        return stats
+
+    def index_bundles(self, bundle_paths: List[str], max_workers: Optional[int] = None,
+                      progress_callback: Optional[Callable[[int, int, str], None]] = None,
+                      should_stop: Optional[Callable[[], bool]] = None) -> Dict[str, int]:
+        """
+        增量索引指定的资源包（只解析未索引或已变化的资源包）
+
+        Args:
+            bundle_paths: 资源包路径列表
+            max_workers: 并行进程数，默认按配置的计算线程数
+            progress_callback: 进度回调，参数为 (已完成数, 总数, 资源包路径)
+            should_stop: 是否中止，已解析的资源包会保留
+
+        Returns:
+            Dict[str, int]: 统计信息 {"total", "updated", "failed", "removed"}
+        """
+        stale = self._stale_bundles(bundle_paths)
+        stats = {"total": len(bundle_paths), "updated": 0, "failed": 0, "removed": 0}
+        self.logger.info(f"资源目录: 共 {len(bundle_paths)} 个资源包，需要更新 {len(stale)} 个")
+        if not stale:
+            return stats
+
+        max_workers = max(1, min(max_workers or pool_size(CPU_POOL), len(stale)))
+        # 不使用 with 语句：退出 with 时会等待所有已提交的资源包解析完成，停止时无法及时返回
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {executor.submit(read_catalog_rows, path): path for path in stale}
+            for done, future in enumerate(as_completed(futures), 1):
+                bundle_path = futures[future]
+                try:
+                    game_type, rows, texts = future.result()
+                    self.put(bundle_path, game_type, rows, texts)
+                    stats["updated"] += 1
+                except Exception as e:
+                    stats["failed"] += 1
+                    self.logger.error(f"解析资源包 {bundle_path} 时出错: {str(e)}")
+
+                if done % COMMIT_INTERVAL == 0:
+                    self.conn.commit()
+                if progress_callback:
+                    progress_callback(done, len(stale), bundle_path)
+                if should_stop and should_stop():
+                    break
+        finally:
+            # 取消尚未开始的解析，正在解析的资源包在子进程中自行结束
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self.conn.commit()
+        return stats
+
+    def set_scope(self, bundle_paths: Optional[Iterable[str]]):
+        """
+        限定查询范围，之后的搜索和统计只包含这些资源包（只对当前连接生效）
+
+        Args:
+            bundle_paths: 资源包路径列表，None 表示整个资源目录
+        """
+        self.scoped = bundle_paths is not None
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS scope (path TEXT PRIMARY KEY)")
+        self.conn.execute("DELETE FROM temp.scope")
+        if self.scoped:
+            self.conn.executemany("INSERT OR IGNORE INTO temp.scope (path) VALUES (?)",
+                                  [(self._key(path),) for path in bundle_paths])
+        self.conn.commit()
+
+    def _scope_filter(self, column: str) -> str:
+        """生成限定查询范围的 SQL 条件"""
+        return f" AND {column} IN (SELECT path FROM temp.scope)" if self.scoped else ""
+
+    def search(self, text: str = "", type_name: Optional[str] = None,
+               limit: int = DEFAULT_SEARCH_LIMIT) -> List[CatalogEntry]:
+        """
+        按名称或容器路径查找对象（不区分大小写的子串匹配）
+        搜索文本不少于3个字符时使用 trigram 全文索引，否则逐条匹配
+
+        Args:
+            text: 搜索文本，为空时不限制名称
+            type_name: 对象类型，例如 Texture2D，None 表示全部类型
+            limit: 最多返回的条数
+
+        Returns:
+            List[CatalogEntry]: 匹配的对象
+        """
+        sql = ("SELECT b.original_path, b.game_type, o.path_id, o.type, o.name, o.container, o.byte_size "
+               "FROM objects o JOIN bundles b ON o.bundle_path = b.path")
+        params = []
+        if text and self.fts_enabled and len(text) >= MIN_FTS_QUERY_LENGTH:
+            # 整体作为短语匹配，双引号需要转义
+            sql += " JOIN names ON names.rowid = o.id WHERE names MATCH ?"
+            params.append('"' + text.replace('"', '""') + '"')
+        else:
+            sql += " WHERE 1 = 1"
+            if text:
+                pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                sql += " AND (o.name LIKE ? ESCAPE '\\' OR o.container LIKE ? ESCAPE '\\')"
+                params += [pattern, pattern]
+        sql += self._scope_filter("o.bundle_path")
+        if type_name:
+            sql += " AND o.type = ?"
+            params.append(type_name)
+        # 与 idx_catalog_name 的排序规则一致，不带搜索文本浏览时可以按索引顺序读取
+        sql += " ORDER BY o.name COLLATE NOCASE LIMIT ?"
+        params.append(limit)
+        return [CatalogEntry(*row) for row in self.conn.execute(sql, params)]
+
+    def search_text(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[TextMatch]:
+        """
+        按文本内容全文搜索 TextAsset 和 MonoBehaviour（不区分大小写的子串匹配）
+
+        Args:
+            query: 搜索文本
+            limit: 最多返回的条数
+
+        Returns:
+            List[TextMatch]: 匹配的对象及内容片段
+        """
+        query = query.strip()
+        if not query or not self.fts_enabled:
+            return []
+
+        sql = ("SELECT b.original_path, texts.path_id, COALESCE(o.type, ''), COALESCE(o.name, ''), "
+               "snippet(texts, 2, '[', ']', '…', 24) FROM texts "
+               "JOIN bundles b ON b.path = texts.bundle_path "
+               "LEFT JOIN objects o ON o.bundle_path = texts.bundle_path AND o.path_id = texts.path_id ")
+        if len(query) >= MIN_FTS_QUERY_LENGTH:
+            # 整体作为短语匹配，双引号需要转义
+            sql += "WHERE texts MATCH ?" + self._scope_filter("texts.bundle_path") + " ORDER BY rank LIMIT ?"
+            params = ['"' + query.replace('"', '""') + '"', limit]
+        else:
+            # 过短的查询无法使用 trigram 索引，退化为逐条扫描
+            sql += "WHERE texts.content LIKE ? ESCAPE '\\'" + self._scope_filter("texts.bundle_path") + " LIMIT ?"
+            pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            params = [pattern, limit]
+        return [TextMatch(*row) for row in self.conn.execute(sql, params)]
+
+    def types(self) -> List[str]:
+        """
+        获取资源目录中出现过的对象类型
+
+        Returns:
+            List[str]: 类型名称列表
+        """
+        sql = "SELECT DISTINCT type FROM objects WHERE 1 = 1" + self._scope_filter("bundle_path") + " ORDER BY type"
+        return [row[0] for row in self.conn.execute(sql)]
@@ -3,16 +3,15 @@
 """
 import os
 import logging
-import tempfile
-import shutil
 import traceback
-from typing import List, Tuple, Optional, Dict, Union, Any
+import itertools
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Tuple, Optional, Dict, Any, Callable
 from UnityPy import AssetsManager
 from PIL import Image
 import io
 import datetime
 import json
-from pathlib import Path
 
 from UnityPy.enums import TextureFormat, CompressionFlags
 from UnityPy.helpers import CompressionHelper
@@ -20,10 +19,44 @@ from UnityPy.helpers import CompressionHelper
 from src.core.crosscore_cryptor import CrosscoreCryptor
 from src.core.abprocessor.BundleProcessorManager import BundleProcessorManager
 from src.core.customdcompressor.lz4_ak import decompress_lz4ak
+from src.config.config_manager import ConfigManager
+from src.utils import scratch_pack
+from src.utils.archive_writer import ArchiveWriter
+from src.utils.executor_registry import CPU_POOL, pool_size
+from src.utils.temp_store import SCAN_PREFIX, TempQuotaExceeded, get_temp_store
+from src.utils.texture_cache import bundle_fingerprint, get_texture_cache
 
 
 CompressionHelper.DECOMPRESSION_MAP[CompressionFlags.LZHAM] = decompress_lz4ak
 
+# 直接导出时每个子进程任务包含的对象数
+EXTRACT_CHUNK_SIZE = 32
+# 选中的对象不超过该数量时在当前线程导出（子进程需要各自加载一次资源包，对象少时得不偿失）
+EXTRACT_IN_PROCESS_LIMIT = 128
+# 每个子进程同时排队的任务数，写入压缩包时内存中最多只有 进程数 × 该值 个对象的内容
+EXTRACT_TASKS_PER_WORKER = 2
+
+# 子进程中的提取器和资源包对象，由进程池初始化函数设置
+_process_extractor: Optional['AssetExtractor'] = None
+_process_objects: Dict[int, Any] = {}
+
+
+def _init_extract_process(asset_path: str):
+    """进程池初始化函数，每个子进程只加载一次资源包"""
+    global _process_extractor, _process_objects
+    _process_extractor = AssetExtractor()
+    _process_objects = _process_extractor._load_objects(asset_path)
+
+
+def _extract_chunk_job(path_ids: List[int], ab_dir: str) -> Tuple[int, int]:
+    """在子进程中导出一组对象"""
+    return _process_extractor._extract_chunk(_process_objects, path_ids, ab_dir)
+
+
+def _export_chunk_job(path_ids: List[int]) -> Tuple[List[Tuple[str, bytes]], int]:
+    """在子进程中转换一组对象，内容返回给主进程写入压缩包"""
+    return _process_extractor._export_chunk(_process_objects, path_ids)
+
 
 class AssetExtractor:
     """资源提取器"""
@@ -42,13 +75,14 @@ class AssetExtractor:
         self.crosscoreCryptor = CrosscoreCryptor()
         self.bundle_processor_manager = BundleProcessorManager()
 
-    def scan_asset(self, asset_path: str) -> (List[{str, str, str, str, str}], str):
+    def scan_asset(self, asset_path: str, use_pack: Optional[bool] = None) -> (List[{str, str, str, str, str}], str):
         # print("开始执行扫描----")
         """
         扫描资源包中的文件
 
         Args:
             asset_path: 资源包路径，可以是字符串、列表或元组
+            use_pack: 是否把导出内容写入单个打包文件（通过 scratch_pack 读取），None 时读取配置 scan_pack_outputs
 
         Returns:
             files: 文件列表，每个元素为(文件名, 文件类型, 临时文件路径)的元组
@@ -75,11 +109,16 @@ class AssetExtractor:
             if os.path.getsize(asset_path) == 0:
                 raise ValueError(f"资源包文件为空: {asset_path}")
 
-            # 创建临时目录
-            if self.temp_dir and os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir)
-            self.temp_dir = tempfile.mkdtemp(prefix='arknight_ab_')
+            # 在受管理的临时目录下创建扫描目录
+            temp_store = get_temp_store()
+            temp_store.remove_dir(self.temp_dir)
+            self.temp_dir = temp_store.create_dir(SCAN_PREFIX)
             self.logger.info(f"创建临时目录: {self.temp_dir}")
+            if use_pack is None:
+                use_pack = ConfigManager().get('scan_pack_outputs', True)
+            fingerprint = bundle_fingerprint(asset_path)
+            texture_cache = get_texture_cache()
+            pack = scratch_pack.open_pack(self.temp_dir) if use_pack else None
 
             # 加载资源包
             self.logger.info(f"正在加载资源包: {asset_path}")
@@ -97,103 +136,32 @@ class AssetExtractor:
             for obj in am.objects:
 
                 try:
-                    if not hasattr(obj, 'read'):
-                        self.logger.warning(f"跳过无效对象: {obj}")
-                        continue
-
-                    data = obj.read()
-                    if not data:
-                        self.logger.warning(f"跳过空数据对象: {obj}")
+                    exported = self._export_object(obj, fingerprint)
+                    if exported is None:
                         continue
-
-                    file_type = obj.type.name if hasattr(obj, 'type') else "Unknown"
-
-                    # 处理名称为空的情况
-                    name = f"{data.m_Name}_{obj.path_id}" if hasattr(data,
-                                                                     'm_Name') and f"{data.m_Name}_{obj.path_id}" else f"unnamed_{obj.path_id}"
-                    if file_type != "TextAsset":
-                        file_name = os.path.basename(name)
-                        # 截取文件后缀
-                        file_ext = os.path.splitext(file_name)[1]
-                        name = name.replace(file_ext, "")
-                    else:
-                        # 截取文件后缀
-                        file_name = os.path.basename(data.m_Name)
-                        file_ext = os.path.splitext(file_name)[1]
-                        name = name.replace(file_ext, "")
-                    if file_type == "TextAsset":
-                        temp_path = os.path.join(self.temp_dir, f"{name}{file_ext}")
-                        # logging.debug(f"保存文本资源到临时文件: {temp_path}")
-                        with open(temp_path, "wb") as f:
-                            f.write(data.m_Script.encode("utf-8", "surrogateescape"))
-                    elif file_type == "Texture2D":
-                        # 保存图片资源到临时文件
-                        file_ext = ".png"
-                        temp_path = os.path.join(self.temp_dir, f"{name}{file_ext}")
-                        data.image.save(temp_path)
-
-                    elif file_type == "AudioClip":
-                        # 保存音频资源到临时文件
-                        file_ext = ".wav"
-                        temp_path = os.path.join(self.temp_dir, f"{name}{file_ext}")
-                        for name1, data1 in data.samples.items():
-                            with open(temp_path, "wb") as f:
-                                f.write(data1)
-                        # files.append((f"{data_name}.wav", file_type, temp_path))
-                        raw_dict = obj.read_typetree()
-                    elif file_type == "Mesh":
-                        # 保存网格资源到临时文件
-                        file_ext = ".mesh"
-                        temp_path = os.path.join(self.temp_dir, f"{name}{file_ext}")
-                        with open(temp_path, "w") as f:
-                            f.write(str(data.m_VertexData))
-                        # files.append((data_name, file_type, temp_path))
-
-                    elif file_type == "Material":
-                        # 保存材质资源到临时文件
-                        file_ext = ".mat"
-                        temp_path = os.path.join(self.temp_dir, f"{name}{file_ext}")
-                        with open(temp_path, "w") as f:
-                            f.write(str(data.m_Shader))
-                        # files.append((data_name, file_type, temp_path))
-                    elif file_type == "MonoBehaviour":
-
-                        # 保存材质资源到临时文件
-                        file_ext = ".json"
-                        temp_path = os.path.join(self.temp_dir, f"{name}{file_ext}")
-                        if obj.serialized_type.node:
-                            # save decoded data
-                            tree = obj.read_typetree()
-                            with open(temp_path, "wt", encoding = "utf8") as f:
-                                json.dump(tree, f, ensure_ascii = False, indent = 4)
-                        # files.append((data_name, file_type, temp_path))
+                    display_name, file_type, file_name, content = exported
+                    temp_path = os.path.join(self.temp_dir, file_name)
+                    # 超过临时目录上限时中止扫描
+                    temp_store.charge(len(content))
+                    if pack is not None:
+                        pack.add(temp_path, content)
                     else:
-                        # 保存其他类型的资源到临时文件
-                        temp_path = os.path.join(self.temp_dir, f"{name}.{file_type.lower()}")
-                        #创建父目录
                         os.makedirs(os.path.dirname(temp_path), exist_ok=True)
-                        try:
-                            # 尝试将对象转换为JSON字符串
-                            obj_data = {
-                                'type': file_type,
-                                'name': name,
-                                'path_id': obj.path_id,
-                                'data': str(data)
-                            }
-                            with open(temp_path, "w", encoding='utf-8') as f:
-                                json.dump(obj_data, f, ensure_ascii=False, indent=2)
-                            # files.append((data_name, "Other", temp_path))
-                        except Exception as e:
-                            self.logger.warning(f"无法保存资源 {name} ({file_type}): {str(e)}")
-                            continue
+                        with open(temp_path, "wb") as f:
+                            f.write(content)
+                    if file_type == "Texture2D":
+                        # 预览和导出图片时按路径找到解码结果
+                        texture_cache.alias(temp_path, (fingerprint, obj.path_id), len(content))
                     files.append({
-                        "name": f"{name}{file_ext}",
+                        "name": display_name,
                         "type": file_type,
                         "path": temp_path,
                         "path_id": obj.path_id,
-                        "size": os.path.getsize(temp_path),
+                        "size": len(content),
                     })
 
+                except TempQuotaExceeded:
+                    raise
                 except Exception as e:
                     self.logger.warning(f"处理资源时出错: {str(e)}")
                     #打印堆栈
@@ -205,11 +173,341 @@ class AssetExtractor:
 
         except Exception as e:
             self.logger.error(f"扫描资源包时出错: {str(e)}")
-            if self.temp_dir and os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir)
+            get_temp_store().remove_dir(self.temp_dir)
+            self.temp_dir = None
             raise
 
 
+    def _export_object(self, obj, fingerprint: Optional[str] = None) -> Optional[Tuple[str, str, str, bytes]]:
+        """
+        把单个对象转换为导出文件内容
+
+        Args:
+            obj: 资源包中的对象
+            fingerprint: 资源包指纹，指定时贴图解码结果使用贴图缓存
+
+        Returns:
+            Optional[Tuple[str, str, str, bytes]]: (显示名称, 类型, 文件名, 文件内容)，没有可导出内容时返回None
+        """
+        if not hasattr(obj, 'read'):
+            self.logger.warning(f"跳过无效对象: {obj}")
+            return None
+
+        data = obj.read()
+        if not data:
+            self.logger.warning(f"跳过空数据对象: {obj}")
+            return None
+
+        file_type = obj.type.name if hasattr(obj, 'type') else "Unknown"
+
+        # 处理名称为空的情况
+        name = f"{data.m_Name}_{obj.path_id}" if hasattr(data,
+                                                         'm_Name') and f"{data.m_Name}_{obj.path_id}" else f"unnamed_{obj.path_id}"
+        if file_type != "TextAsset":
+            file_name = os.path.basename(name)
+            # 截取文件后缀
+            file_ext = os.path.splitext(file_name)[1]
+            name = name.replace(file_ext, "")
+        else:
+            # 截取文件后缀
+            file_name = os.path.basename(data.m_Name)
+            file_ext = os.path.splitext(file_name)[1]
+            name = name.replace(file_ext, "")
+        if file_type == "TextAsset":
+            file_name = f"{name}{file_ext}"
+            content = data.m_Script.encode("utf-8", "surrogateescape")
+        elif file_type == "Texture2D":
+            # 保存图片资源
+            file_ext = ".png"
+            file_name = f"{name}{file_ext}"
+            if fingerprint:
+                # 同一次运行中预览、导出图片、再次提取时复用解码结果
+                image = get_texture_cache().get_or_decode((fingerprint, obj.path_id), lambda: data.image)
+            else:
+                image = data.image
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG")
+            content = buffer.getvalue()
+
+        elif file_type == "AudioClip":
+            # 保存音频资源（多个采样时保留最后一个）
+            file_ext = ".wav"
+            file_name = f"{name}{file_ext}"
+            content = None
+            for name1, data1 in data.samples.items():
+                content = data1
+        elif file_type == "Mesh":
+            # 保存网格资源
+            file_ext = ".mesh"
+            file_name = f"{name}{file_ext}"
+            content = str(data.m_VertexData).encode("utf-8")
+
+        elif file_type == "Material":
+            # 保存材质资源
+            file_ext = ".mat"
+            file_name = f"{name}{file_ext}"
+            content = str(data.m_Shader).encode("utf-8")
+        elif file_type == "MonoBehaviour":
+            # 保存解码后的类型树
+            file_ext = ".json"
+            file_name = f"{name}{file_ext}"
+            content = None
+            if obj.serialized_type.node:
+                tree = obj.read_typetree()
+                content = json.dumps(tree, ensure_ascii=False, indent=4).encode("utf-8")
+        else:
+            # 保存其他类型的资源
+            file_name = f"{name}.{file_type.lower()}"
+            try:
+                # 尝试将对象转换为JSON字符串
+                obj_data = {
+                    'type': file_type,
+                    'name': name,
+                    'path_id': obj.path_id,
+                    'data': str(data)
+                }
+                content = json.dumps(obj_data, ensure_ascii=False, indent=2).encode("utf-8")
+            except Exception as e:
+                self.logger.warning(f"无法保存资源 {name} ({file_type}): {str(e)}")
+                return None
+
+        if content is None:
+            self.logger.warning(f"跳过没有可导出内容的资源: {name} ({file_type})")
+            return None
+        return f"{name}{file_ext}", file_type, file_name, bytes(content)
+
+    def _load_objects(self, asset_path: str) -> Dict[int, Any]:
+        """
+        加载资源包并按 path_id 索引对象
+
+        Args:
+            asset_path: 资源包路径
+
+        Returns:
+            Dict[int, Any]: path_id 到对象的映射
+        """
+        bundle_processor = self.bundle_processor_manager.get_processor_by_ab_type(asset_path)
+        am = AssetsManager(bundle_processor.preprocess(asset_path)[0])
+        return {obj.path_id: obj for obj in am.objects}
+
+    def _export_chunk(self, objects: Dict[int, Any], path_ids: List[int],
+                      fingerprint: Optional[str] = None) -> Tuple[List[Tuple[str, bytes]], int]:
+        """
+        转换一组对象的导出内容
+
+        Args:
+            objects: path_id 到对象的映射
+            path_ids: 要导出的对象
+            fingerprint: 资源包指纹，指定时贴图解码结果使用贴图缓存
+
+        Returns:
+            Tuple[List[Tuple[str, bytes]], int]: ([(类型/文件名, 文件内容)], 失败数)
+        """
+        entries = []
+        failed = 0
+        for path_id in path_ids:
+            try:
+                obj = objects.get(path_id)
+                if obj is None:
+                    raise KeyError(f"资源包中没有对象 {path_id}")
+                exported = self._export_object(obj, fingerprint)
+                if exported is None:
+                    failed += 1
+                    continue
+                _, file_type, file_name, content = exported
+                entries.append((f"{file_type}/{file_name}", content))
+            except Exception as e:
+                self.logger.error(f"导出对象 {path_id} 失败: {str(e)}")
+                failed += 1
+        return entries, failed
+
+    def _extract_chunk(self, objects: Dict[int, Any], path_ids: List[int], ab_dir: str,
+                       fingerprint: Optional[str] = None) -> Tuple[int, int]:
+        """
+        导出一组对象到 资源包目录/类型/文件名
+
+        Args:
+            objects: path_id 到对象的映射
+            path_ids: 要导出的对象
+            ab_dir: 资源包对应的输出目录
+            fingerprint: 资源包指纹，指定时贴图解码结果使用贴图缓存
+
+        Returns:
+            Tuple[int, int]: (成功数, 失败数)
+        """
+        entries, failed = self._export_chunk(objects, path_ids, fingerprint)
+        extracted, save_failed = self._save_entries(entries, ab_dir)
+        return extracted, failed + save_failed
+
+    def _save_entries(self, entries: List[Tuple[str, bytes]], ab_dir: str) -> Tuple[int, int]:
+        """
+        把导出的内容写入 资源包目录/类型/文件名
+
+        Args:
+            entries: [(类型/文件名, 文件内容)]
+            ab_dir: 资源包对应的输出目录
+
+        Returns:
+            Tuple[int, int]: (成功数, 失败数)
+        """
+        extracted = 0
+        failed = 0
+        for relative_path, content in entries:
+            try:
+                target_path = os.path.join(ab_dir, *relative_path.split("/"))
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                with open(target_path, "wb") as f:
+                    f.write(content)
+                extracted += 1
+            except Exception as e:
+                self.logger.error(f"保存文件失败 {relative_path}: {str(e)}")
+                failed += 1
+        return extracted, failed
+
+    def extract_objects(self, asset_path: str, path_ids: Optional[List[int]], output_dir: Optional[str] = None,
+                        max_workers: Optional[int] = None,
+                        progress_callback: Optional[Callable[[int, int], None]] = None,
+                        should_stop: Optional[Callable[[], bool]] = None,
+                        archive: Optional[ArchiveWriter] = None, archive_dir: str = "",
+                        replaced_files: Optional[Dict[int, Tuple[str, str]]] = None) -> Dict:
+        """
+        把选中的对象直接导出到 输出目录/资源包名/类型/文件名，不依赖扫描时的临时文件
+
+        对象解码（图片转PNG、类型树转JSON）受GIL限制，选中的对象较多时分块交给进程池，
+        每个子进程只加载一次资源包；对象较少时直接在当前线程处理，避免重复加载资源包。
+        指定 archive 时不创建目录，子进程每个任务只转换一个对象，内容返回后由当前线程立即写入压缩包；
+        排队的任务数有上限，不会在内存中积压大量转换结果
+
+        Args:
+            asset_path: 资源包路径
+            path_ids: 要导出的对象 path_id 列表，None 表示资源包中的所有对象
+            output_dir: 输出目录，写入压缩包时不需要
+            max_workers: 并行进程数，默认按配置的计算线程数
+            progress_callback: 进度回调，参数为 (已处理数, 总数)
+            should_stop: 返回True时停止导出，已导出的文件会保留
+            archive: 压缩包写入器，条目名称为 [archive_dir/]资源包名/类型/文件名
+            archive_dir: 压缩包中的上级目录，批量导出多个目录中的同名资源包时区分
+            replaced_files: path_id 到 (类型/文件名, 文件路径) 的映射，这些对象在界面中编辑或替换过，
+                直接写入对应的文件，不从资源包重新导出
+
+        Returns:
+            Dict: {"total", "extracted", "failed", "output", "cancelled"}
+        """
+        ab_name = os.path.splitext(os.path.basename(asset_path))[0]
+        if archive is not None:
+            ab_dir = None
+            output = archive.output_path
+            entry_root = "/".join(part for part in archive_dir.replace("\\", "/").split("/") + [ab_name] if part)
+        else:
+            ab_dir = os.path.join(output_dir, ab_name)
+            os.makedirs(ab_dir, exist_ok=True)
+            output = ab_dir
+
+        objects = None
+        if path_ids is None:
+            objects = self._load_objects(asset_path)
+            path_ids = list(objects)
+
+        replaced_files = replaced_files or {}
+        replaced_ids = [path_id for path_id in path_ids if path_id in replaced_files]
+        path_ids = [path_id for path_id in path_ids if path_id not in replaced_files]
+
+        total = len(path_ids) + len(replaced_ids)
+        stats = {"total": total, "extracted": 0, "failed": 0, "output": output, "cancelled": False}
+        done = 0
+
+        def collect(path_count: int, extracted: int, failed: int):
+            nonlocal done
+            done += path_count
+            stats["extracted"] += extracted
+            stats["failed"] += failed
+            if progress_callback:
+                progress_callback(done, total)
+
+        def write_entries(path_count: int, entries: List[Tuple[str, bytes]], failed: int):
+            # 压缩包写入失败时整体中止，避免生成不完整的压缩包
+            for relative_path, content in entries:
+                archive.add_bytes(f"{entry_root}/{relative_path}", content)
+            collect(path_count, len(entries), failed)
+
+        chunk_size = 1 if archive is not None else EXTRACT_CHUNK_SIZE
+        chunks = [path_ids[i:i + chunk_size] for i in range(0, len(path_ids), chunk_size)]
+        max_workers = max(1, min(max_workers or pool_size(CPU_POOL), len(chunks) or 1))
+        self.logger.info(f"开始导出 {total} 个对象: {asset_path} -> {output}")
+
+        for path_id in replaced_ids:
+            if should_stop and should_stop():
+                stats["cancelled"] = True
+                break
+            relative_path, source_path = replaced_files[path_id]
+            try:
+                content = scratch_pack.read_bytes(source_path)
+            except Exception as e:
+                self.logger.error(f"读取替换文件失败 {source_path}: {str(e)}")
+                collect(1, 0, 1)
+                continue
+            if archive is not None:
+                write_entries(1, [(relative_path, content)], 0)
+            else:
+                collect(1, *self._save_entries([(relative_path, content)], ab_dir))
+
+        if stats["cancelled"] or not path_ids:
+            # 只选中了替换过的对象时不需要加载资源包
+            self.logger.info(f"导出完成: 成功 {stats['extracted']} 个，失败 {stats['failed']} 个")
+            return stats
+
+        if max_workers == 1 or len(path_ids) <= EXTRACT_IN_PROCESS_LIMIT:
+            if objects is None:
+                objects = self._load_objects(asset_path)
+            # 在当前进程中提取时复用扫描、预览时缓存的贴图
+            fingerprint = bundle_fingerprint(asset_path)
+            for path_id in path_ids:
+                if should_stop and should_stop():
+                    stats["cancelled"] = True
+                    break
+                if archive is not None:
+                    write_entries(1, *self._export_chunk(objects, [path_id], fingerprint))
+                else:
+                    collect(1, *self._extract_chunk(objects, [path_id], ab_dir, fingerprint))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_extract_process,
+                                     initargs=(asset_path,)) as executor:
+                def submit(chunk: List[int]):
+                    if archive is not None:
+                        return executor.submit(_export_chunk_job, chunk)
+                    return executor.submit(_extract_chunk_job, chunk, ab_dir)
+
+                queued = iter(chunks)
+                futures = {submit(chunk): chunk
+                           for chunk in itertools.islice(queued, max_workers * EXTRACT_TASKS_PER_WORKER)}
+                while futures:
+                    finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        chunk = futures.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            # 子进程崩溃或资源包加载失败，只影响当前分块
+                            self.logger.error(f"导出对象时子进程出错: {str(e)}")
+                            collect(len(chunk), 0, len(chunk))
+                        else:
+                            if archive is not None:
+                                write_entries(len(chunk), *result)
+                            else:
+                                collect(len(chunk), *result)
+                    if should_stop and should_stop():
+                        stats["cancelled"] = True
+                        for pending in futures:
+                            pending.cancel()
+                        break
+                    # 完成几个任务就补充几个，保持每个子进程都有任务
+                    for chunk in itertools.islice(queued, len(finished)):
+                        futures[submit(chunk)] = chunk
+
+        self.logger.info(f"导出完成: 成功 {stats['extracted']} 个，失败 {stats['failed']} 个")
+        return stats
+
+
     def export_ab(self, asset_path: str, output_dir: str,
                   replace_files: List[Tuple[Tuple[str, str, str], str]]) -> bool:
         # print(replace_files)
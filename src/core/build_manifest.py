@@ -0,0 +1,191 @@
+"""
+批量打包构建清单
+记录每个输出资源包所依赖的原始资源包和替换文件（修改时间、大小、哈希），
+再次打包时只重新构建输入发生变化的资源包
+
+输入状态在构建开始前记录（snapshot），构建期间保存的替换文件与记录不一致，下次打包时会重新构建
+
+清单以 JSON 保存在用户数据目录下，按输出目录区分:
+    {
+        "输出相对路径": {
+            "source": {"path", "mtime_ns", "size", "sha1"},
+            "inputs": [{"path", "mtime_ns", "size", "sha1"}, ...]
+        }
+    }
+"""
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.utils.file_hash import hash_file
+from src.utils.path_helper import get_user_data_dir
+
+
+def default_manifest_path(target_dir: str) -> Path:
+    """
+    获取输出目录对应的构建清单路径
+
+    Args:
+        target_dir: 输出目录
+
+    Returns:
+        Path: 清单文件路径
+    """
+    key = hashlib.sha1(str(Path(target_dir).resolve()).encode("utf-8")).hexdigest()[:16]
+    cache_dir = get_user_data_dir() / "cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir / f"build_manifest_{key}.json"
+
+
+def _file_state(path: str, sha1: Optional[str] = None) -> Dict:
+    """记录文件当前状态，未提供哈希时计算"""
+    stat = os.stat(path)
+    return {
+        "path": os.path.abspath(path),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha1": sha1 or hash_file(path),
+    }
+
+
+def _normalize_inputs(input_paths: List[str]) -> List[str]:
+    """替换文件路径转为绝对路径、去重并排序，记录和比较时使用同一种形式"""
+    return sorted({os.path.abspath(path) for path in input_paths})
+
+
+class BuildManifest:
+    """批量打包构建清单"""
+
+    def __init__(self, target_dir: str, manifest_path: Optional[Path] = None):
+        """
+        加载输出目录的构建清单，不存在或损坏时视为空清单
+
+        Args:
+            target_dir: 输出目录
+            manifest_path: 清单文件路径，默认位于用户数据目录
+        """
+        self.logger = logging.getLogger(__name__)
+        self.target_dir = target_dir
+        self.manifest_path = manifest_path or default_manifest_path(target_dir)
+        self.entries: Dict[str, Dict] = {}
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                self.logger.warning(f"构建清单读取失败，将完整重建: {str(e)}")
+
+    def _output_key(self, output_path: str) -> str:
+        return os.path.relpath(os.path.abspath(output_path), os.path.abspath(self.target_dir)).replace(os.sep, "/")
+
+    @staticmethod
+    def _unchanged(state: Dict) -> bool:
+        """
+        判断文件是否与记录一致：修改时间和大小相同直接视为未变化，
+        仅修改时间变化时比较哈希，并更新记录的修改时间
+        """
+        try:
+            stat = os.stat(state["path"])
+        except OSError:
+            return False
+        if stat.st_size != state["size"]:
+            return False
+        if stat.st_mtime_ns == state["mtime_ns"]:
+            return True
+        if hash_file(state["path"]) != state["sha1"]:
+            return False
+        state["mtime_ns"] = stat.st_mtime_ns
+        return True
+
+    def is_up_to_date(self, output_path: str, source_path: str, input_paths: List[str]) -> bool:
+        """
+        判断输出资源包是否为最新
+
+        Args:
+            output_path: 输出资源包路径
+            source_path: 原始资源包路径
+            input_paths: 使用的替换文件路径
+
+        Returns:
+            bool: 输出存在且所有输入都未变化时返回True
+        """
+        entry = self.entries.get(self._output_key(output_path))
+        if entry is None or not os.path.exists(output_path):
+            return False
+        if entry["source"]["path"] != os.path.abspath(source_path):
+            return False
+        if sorted(state["path"] for state in entry["inputs"]) != _normalize_inputs(input_paths):
+            return False
+        return self._unchanged(entry["source"]) and all(self._unchanged(state) for state in entry["inputs"])
+
+    @staticmethod
+    def snapshot(source_path: str, input_paths: List[str]) -> Dict:
+        """
+        记录构建开始前的输入状态
+
+        Args:
+            source_path: 原始资源包路径
+            input_paths: 使用的替换文件路径
+
+        Returns:
+            Dict: {"source", "inputs"}，构建成功后传给 record
+        """
+        return {
+            "source": _file_state(source_path),
+            "inputs": [_file_state(path) for path in _normalize_inputs(input_paths)],
+        }
+
+    def record(self, output_path: str, snapshot: Dict):
+        """
+        记录输出资源包的输入状态
+
+        Args:
+            output_path: 输出资源包路径
+            snapshot: 构建开始前通过 snapshot 记录的输入状态
+        """
+        self.entries[self._output_key(output_path)] = snapshot
+
+    def prune_deleted_inputs(self, keep_outputs: List[str]) -> List[str]:
+        """
+        删除替换文件已被删除的输出资源包及其记录（不再有替换目标的资源包不会重新构建，旧输出会一直保留替换内容）
+
+        Args:
+            keep_outputs: 本次仍需构建或检查的输出资源包路径，不会被删除
+
+        Returns:
+            List[str]: 被删除的输出资源包路径
+        """
+        keep = {self._output_key(path) for path in keep_outputs}
+        removed = []
+        for key, entry in list(self.entries.items()):
+            if key in keep or all(os.path.exists(state["path"]) for state in entry["inputs"]):
+                continue
+            output_path = os.path.join(self.target_dir, *key.split("/"))
+            try:
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+            except OSError as e:
+                self.logger.warning(f"删除过期输出失败 {output_path}: {str(e)}")
+                continue
+            del self.entries[key]
+            removed.append(output_path)
+        return removed
+
+    def discard(self, output_path: str):
+        """
+        删除输出资源包的记录，下次打包时重新构建
+
+        Args:
+            output_path: 输出资源包路径
+        """
+        self.entries.pop(self._output_key(output_path), None)
+
+    def save(self):
+        """保存构建清单"""
+        temp_path = self.manifest_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.manifest_path)
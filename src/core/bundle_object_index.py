@@ -0,0 +1,149 @@
+"""
+资源包对象索引
+持久化记录每个资源包中可替换对象的名称和 Path_ID，按文件修改时间和大小判断是否失效，
+批量替换前据此筛选出真正包含替换目标的资源包，避免加载所有资源包
+
+索引使用 SQLite 存储:
+    bundles(path, mtime_ns, size)
+    objects(bundle_path, path_id, type, name)
+"""
+import logging
+import os
+import sqlite3
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import UnityPy
+
+from src.core.abprocessor.BundleProcessorManager import BundleProcessorManager
+from src.utils.path_helper import get_user_data_dir
+
+# 批量替换会处理的对象类型
+REPLACEABLE_TYPES = ("TextAsset", "Texture2D")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bundles (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS objects (
+    bundle_path TEXT NOT NULL REFERENCES bundles(path) ON DELETE CASCADE,
+    path_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_objects_bundle ON objects(bundle_path);
+"""
+
+# (path_id, 类型, 名称)
+ObjectEntry = Tuple[int, str, str]
+
+
+def default_object_index_path() -> Path:
+    """
+    获取默认的资源包对象索引路径
+
+    Returns:
+        Path: 索引文件路径
+    """
+    cache_dir = get_user_data_dir() / "cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir / "bundle_objects.db"
+
+
+def _peek_name(obj) -> str:
+    """读取对象名称，新版UnityPy支持不解析整个对象只读取名称"""
+    if hasattr(obj, "peek_name"):
+        return obj.peek_name() or ""
+    return getattr(obj.read(), "m_Name", "") or ""
+
+
+def read_bundle_objects(bundle_path: str,
+                        bundle_processor_manager: Optional[BundleProcessorManager] = None) -> List[ObjectEntry]:
+    """
+    加载资源包并读取其中可替换对象的名称
+
+    Args:
+        bundle_path: 资源包路径
+        bundle_processor_manager: 资源包处理器管理器
+
+    Returns:
+        List[ObjectEntry]: 对象列表
+    """
+    manager = bundle_processor_manager or BundleProcessorManager()
+    bundle_processor = manager.get_processor_by_ab_type(bundle_path)
+    am = UnityPy.AssetsManager(bundle_processor.preprocess(bundle_path)[0])
+    return [(obj.path_id, obj.type.name, _peek_name(obj))
+            for obj in am.objects if obj.type.name in REPLACEABLE_TYPES]
+
+
+class BundleObjectIndex:
+    """资源包对象索引（SQLite）"""
+
+    def __init__(self, db_path: Union[str, Path, None] = None):
+        """
+        打开或创建索引
+
+        Args:
+            db_path: 索引文件路径，默认位于用户数据目录
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_path = Path(db_path) if db_path else default_object_index_path()
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """关闭索引"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    @staticmethod
+    def _key(bundle_path: str) -> str:
+        return os.path.normcase(os.path.abspath(bundle_path))
+
+    def get(self, bundle_path: str) -> Optional[List[ObjectEntry]]:
+        """
+        获取资源包的对象列表，文件修改时间或大小变化时视为失效
+
+        Args:
+            bundle_path: 资源包路径
+
+        Returns:
+            Optional[List[ObjectEntry]]: 对象列表，未索引或已失效时返回None
+        """
+        key = self._key(bundle_path)
+        stat = os.stat(bundle_path)
+        row = self.conn.execute("SELECT mtime_ns, size FROM bundles WHERE path = ?", (key,)).fetchone()
+        if row is None or row[0] != stat.st_mtime_ns or row[1] != stat.st_size:
+            return None
+        return self.conn.execute(
+            "SELECT path_id, type, name FROM objects WHERE bundle_path = ?", (key,)
+        ).fetchall()
+
+    def put(self, bundle_path: str, objects: List[ObjectEntry]):
+        """
+        写入资源包的对象列表，覆盖旧记录
+
+        Args:
+            bundle_path: 资源包路径
+            objects: 对象列表
+        """
+        key = self._key(bundle_path)
+        stat = os.stat(bundle_path)
+        with self.conn:
+            self.conn.execute("DELETE FROM bundles WHERE path = ?", (key,))
+            self.conn.execute("INSERT INTO bundles (path, mtime_ns, size) VALUES (?, ?, ?)",
+                              (key, stat.st_mtime_ns, stat.st_size))
+            self.conn.executemany(
+                "INSERT INTO objects (bundle_path, path_id, type, name) VALUES (?, ?, ?, ?)",
+                [(key, path_id, type_name, name) for path_id, type_name, name in objects]
+            )
@@ -0,0 +1,182 @@
+"""
+资源包会话管理
+记录主窗口中每个已扫描资源包的文件列表和临时目录，估算内存和磁盘占用，
+超出预算时按最近最少使用的顺序释放没有打开窗口的资源包（删除临时目录和文件列表），
+释放后的资源包再次打开时重新扫描
+"""
+import logging
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from src.utils.temp_store import get_temp_store
+
+# 默认预算（MB），0 表示不限制
+DEFAULT_TEMP_BUDGET_MB = 2048
+DEFAULT_MEMORY_BUDGET_MB = 256
+
+
+def estimate_files_memory(files: List[Dict]) -> int:
+    """
+    估算文件列表占用的内存（字节）
+
+    Args:
+        files: 扫描得到的文件信息列表
+
+    Returns:
+        int: 估算的字节数
+    """
+    total = sys.getsizeof(files)
+    for file_info in files:
+        total += sys.getsizeof(file_info)
+        total += sum(sys.getsizeof(value) for value in file_info.values())
+    return total
+
+
+@dataclass
+class BundleSession:
+    """单个资源包的会话数据"""
+    asset_path: str
+    files: List[Dict]
+    temp_path: str
+    temp_bytes: int = 0
+    memory_bytes: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class BundleSessionManager:
+    """资源包会话管理器"""
+
+    def __init__(self, temp_budget_mb: int = DEFAULT_TEMP_BUDGET_MB,
+                 memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB):
+        """
+        初始化会话管理器
+
+        Args:
+            temp_budget_mb: 所有资源包临时目录的磁盘预算（MB），0 表示不限制
+            memory_budget_mb: 所有资源包文件列表的内存预算（MB），0 表示不限制
+        """
+        self.logger = logging.getLogger(__name__)
+        self.temp_budget = max(0, int(temp_budget_mb)) * 1024 * 1024
+        self.memory_budget = max(0, int(memory_budget_mb)) * 1024 * 1024
+        # 按最近使用顺序排列，最久未使用的在最前面
+        self.sessions: "OrderedDict[str, BundleSession]" = OrderedDict()
+
+    def __contains__(self, asset_path: str) -> bool:
+        return asset_path in self.sessions
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    @property
+    def temp_bytes(self) -> int:
+        return sum(session.temp_bytes for session in self.sessions.values())
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(session.memory_bytes for session in self.sessions.values())
+
+    def add(self, asset_path: str, files: List[Dict], temp_path: str) -> BundleSession:
+        """
+        记录新扫描的资源包，已有记录时先删除旧的临时目录
+
+        Args:
+            asset_path: 资源包路径
+            files: 扫描得到的文件信息列表
+            temp_path: 扫描使用的临时目录
+
+        Returns:
+            BundleSession: 会话数据
+        """
+        old = self.sessions.pop(asset_path, None)
+        if old is not None and old.temp_path != temp_path:
+            self._delete_temp(old)
+
+        session = BundleSession(
+            asset_path=asset_path,
+            files=files,
+            temp_path=temp_path,
+            temp_bytes=sum(file_info.get("size", 0) for file_info in files),
+            memory_bytes=estimate_files_memory(files),
+        )
+        self.sessions[asset_path] = session
+        return session
+
+    def get(self, asset_path: str) -> Optional[BundleSession]:
+        """
+        获取资源包的会话数据并标记为最近使用
+
+        Args:
+            asset_path: 资源包路径
+
+        Returns:
+            Optional[BundleSession]: 会话数据，已被释放或从未扫描时返回None
+        """
+        session = self.sessions.get(asset_path)
+        if session is not None:
+            session.last_used = time.monotonic()
+            self.sessions.move_to_end(asset_path)
+        return session
+
+    def remove(self, asset_path: str):
+        """
+        移除资源包并删除临时目录
+
+        Args:
+            asset_path: 资源包路径
+        """
+        session = self.sessions.pop(asset_path, None)
+        if session is not None:
+            self._delete_temp(session)
+
+    def clear(self) -> int:
+        """
+        移除所有资源包并删除临时目录
+
+        Returns:
+            int: 删除的临时目录数
+        """
+        count = 0
+        for session in self.sessions.values():
+            if self._delete_temp(session):
+                count += 1
+        self.sessions.clear()
+        return count
+
+    def over_budget(self) -> bool:
+        """是否超出磁盘或内存预算"""
+        return ((self.temp_budget and self.temp_bytes > self.temp_budget) or
+                (self.memory_budget and self.memory_bytes > self.memory_budget))
+
+    def evict(self, active_paths: Iterable[str]) -> List[str]:
+        """
+        超出预算时按最近最少使用的顺序释放没有打开窗口的资源包
+
+        Args:
+            active_paths: 正在使用（有打开窗口）的资源包路径，不会被释放
+
+        Returns:
+            List[str]: 被释放的资源包路径
+        """
+        active = set(active_paths)
+        evicted = []
+        for asset_path in list(self.sessions):
+            if not self.over_budget():
+                break
+            if asset_path in active:
+                continue
+            session = self.sessions.pop(asset_path)
+            self._delete_temp(session)
+            evicted.append(asset_path)
+            self.logger.info(f"释放资源包会话: {asset_path} (临时文件 {session.temp_bytes / 1024 / 1024:.1f} MB)")
+        return evicted
+
+    def _delete_temp(self, session: BundleSession) -> bool:
+        """删除会话的临时目录"""
+        try:
+            return get_temp_store().remove_dir(session.temp_path)
+        except Exception as e:
+            self.logger.error(f"清理临时目录失败 {session.temp_path}: {str(e)}")
+        return False
@@ -2,19 +2,16 @@
 加密解密核心功能模块
 """
 import logging
-import os
-import re
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 from pathlib import Path
-from binascii import hexlify, unhexlify
+from typing import Optional
 import json
-from datetime import datetime
 
-# 创建线程池，优化线程数
-CPU_COUNT = os.cpu_count() or 4
-DECRYPT_EXECUTOR = ThreadPoolExecutor(max_workers=CPU_COUNT * 2, thread_name_prefix="DecryptThread")
-ENCRYPT_EXECUTOR = ThreadPoolExecutor(max_workers=CPU_COUNT * 2, thread_name_prefix="EncryptThread")
+from src.core.crosscore_index import CrosscoreHeaderIndex, HeaderRecord, default_index_path
+from src.utils.executor_registry import IO_POOL, get_executor
+from src.utils.file_shift import insert_prefix_in_place, strip_prefix_in_place
+from src.utils.signature_scanner import find_embedded_unityfs
 
 
 class CrosscoreCryptor:
@@ -31,23 +28,17 @@ class CrosscoreCryptor:
         self.logger = logging.getLogger(__name__)
 
 
-    def find_next_unityFS_index(self, file_data: bytes):
+    def find_next_unityFS_index(self, file_path: Path) -> int:
         """
-        查找UnityFS索引位置
+        查找第二个UnityFS文件头的位置
 
         Args:
-            file_data: 文件二进制数据
+            file_path: 文件路径
 
         Returns:
-            int: UnityFS索引位置，如果未找到则返回-1
+            int: UnityFS文件头的字节偏移，如果未找到则返回-1
         """
-        openFileHex = hexlify(file_data)
-        unityFS_len = len(re.findall(b"556e6974794653000000000", openFileHex))
-        if unityFS_len < 2:
-            return -1
-        else:
-            unityFS_index = openFileHex.find(b"556e6974794653000000000",1)
-            return unityFS_index
+        return find_embedded_unityfs(file_path)
 
     def decrypt_file(self, file_path: Path):
         """
@@ -55,46 +46,65 @@ class CrosscoreCryptor:
 
         Args:
             file_path: 文件路径
-            log_callback: 日志回调函数
 
         Returns:
             bool: 解密是否成功
         """
-        try:
-            file_data = b""
-            # 读取文件
-            with open(file_path, "rb") as f:
-                file_data = f.read()
+        return self.decrypt_file_with_header(file_path, file_path.name) is not None
+
+    def decrypt_file_with_header(self, file_path: Path, rel_path: str) -> Optional[HeaderRecord]:
+        """
+        解密单个文件并返回被去除的文件头记录
+
+        Args:
+            file_path: 文件路径
+            rel_path: 写入索引的相对路径
 
+        Returns:
+            Optional[HeaderRecord]: 文件头记录，文件未加密或解密失败时返回None
+        """
+        try:
             # 查找索引
-            unityFS_index = self.find_next_unityFS_index(file_data)
+            unityFS_index = self.find_next_unityFS_index(file_path)
             if unityFS_index == -1:
-                return False
+                return None
+
+            self.logger.debug(f"文件 {file_path.name} 的UnityFS索引位置: {unityFS_index}")
+            with open(file_path, "rb") as f:
+                header = f.read(unityFS_index)
 
-            print(f"文件 {file_path.name} 的UnityFS索引位置: {unityFS_index}")
-            # 保存解密后的文件
-            with open(str(file_path), "wb") as f:
-                f.write(file_data[unityFS_index // 2:])
+            # 原地去除伪造文件头，真实数据前移到文件开头
+            payload_size = strip_prefix_in_place(file_path, unityFS_index)
 
-            return True
+            return HeaderRecord(
+                rel_path=rel_path,
+                header=header,
+                payload_size=payload_size,
+                payload_mtime_ns=file_path.stat().st_mtime_ns
+            )
         except Exception as e:
             self.logger.error(f"解密文件 {file_path.name} 时出错: {str(e)}")
-            return False
+            return None
 
-    def decrypt(self, game_bundles_path: Path):
-        self.logger.info("dadadada")
+    def decrypt(self, game_bundles_path: Path) -> dict:
         """
         解密目录下的所有资源文件
 
         Args:
             game_bundles_path: 游戏资源目录
             log_callback: 日志回调函数
+
+        Returns:
+            dict: 统计信息 {"successful", "skipped", "failed", "cache_file"}，
+                cache_file 为文件头索引路径，加密时使用
         """
+        stats = {"successful": 0, "skipped": 0, "failed": 0}
 
         # 确保路径存在
         if not game_bundles_path.exists():
             self.logger.error(f"错误: 路径 {game_bundles_path} 不存在\n")
-            return
+            stats["failed"] = 1
+            return stats
 
 
         self.logger.info(f"正在扫描目录: {game_bundles_path}\n")
@@ -106,27 +116,54 @@ class CrosscoreCryptor:
 
         if not bundle_files:
             self.logger.info("未找到需要解密的文件\n")
-            return
+            return stats
 
         self.logger.info(f"找到 {len(bundle_files)} 个可能需要解密的文件\n")
+
+        # 上次解密后没有修改过的文件（大小和修改时间与索引相同）直接跳过，不打开文件
+        known = {}
+        try:
+            index_file = default_index_path(game_bundles_path)
+            if index_file.is_file():
+                with CrosscoreHeaderIndex(index_file) as index:
+                    known = index.all()
+        except Exception as e:
+            self.logger.warning(f"读取文件头索引失败，全部文件重新检查: {str(e)}")
+        pending = []
+        for file in bundle_files:
+            record = known.get(file.relative_to(game_bundles_path).as_posix())
+            if record is None or not record.is_unchanged(file):
+                pending.append(file)
+        if len(pending) < len(bundle_files):
+            self.logger.info(f"{len(bundle_files) - len(pending)} 个文件已解密且未修改，跳过\n")
         self.logger.info("开始解密资源文件...\n")
 
         # 计数器
         successful = 0
         failed = 0
-        skipped = 0
-        total = len(bundle_files)
+        skipped = len(bundle_files) - len(pending)
+        total = len(pending)
         last_progress = 0
 
+        records = []
+
+        # 解密只是原地移动文件数据，瓶颈在磁盘而不是CPU，使用I/O线程池
+        executor = get_executor(IO_POOL)
+
         # 提交所有任务
-        futures = {DECRYPT_EXECUTOR.submit(self.decrypt_file, file): file for file in bundle_files}
+        futures = {
+            executor.submit(self.decrypt_file_with_header, file,
+                                    file.relative_to(game_bundles_path).as_posix()): file
+            for file in pending
+        }
 
         # 处理结果
         for i, future in enumerate(as_completed(futures), 1):
             file = futures[future]
             try:
-                result = future.result()
-                if result:
+                record = future.result()
+                if record:
+                    records.append(record)
                     successful += 1
                     # 仅在完成重要进度时输出日志，减少日志刷屏
                     progress = int(i / total * 100)
@@ -139,79 +176,120 @@ class CrosscoreCryptor:
                 failed += 1
                 self.logger.info(f"处理 {file.name} 时出错: {str(e)}")
 
-        # 生成index_cache文件（存储目录信息）
+        # 写入文件头索引，同一目录重复解密时只更新本次解密的文件，保留已有记录
         try:
-            # 提取目录结构
-            directory_structure = {}
-            for file in bundle_files:
-                rel_path = str(file.relative_to(game_bundles_path))
-                directory_structure[rel_path] = str(rel_path)
-
-            # 保存为JSON文件
-            cache_dir = Path("cache")
-            cache_dir.mkdir(exist_ok=True)
+            cache_file = default_index_path(game_bundles_path)
+            with CrosscoreHeaderIndex(cache_file) as index:
+                index.put_many(records)
+                indexed = len(index)
 
-            cache_file = cache_dir / f"index_cache_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(directory_structure, f, ensure_ascii=False, indent=2)
-
-            self.logger.info(f"\n目录索引已保存至: {cache_file}\n")
+            stats["cache_file"] = str(cache_file)
+            self.logger.info(f"\n文件头索引已保存至: {cache_file}（共 {indexed} 个文件）\n")
         except Exception as e:
-            self.logger.error(f"\n保存目录索引时出错: {str(e)}\n")
+            self.logger.error(f"\n保存文件头索引时出错: {str(e)}\n")
 
         # 打印统计信息
         elapsed = time.time() - start_time
         self.logger.info(f"\n解密完成! 耗时: {elapsed:.2f}秒")
         self.logger.info(f"成功: {successful}, 跳过: {skipped}, 失败: {failed}\n")
+        stats.update(successful=successful, skipped=skipped, failed=failed)
+        return stats
 
     def encode_file(self, file_path: Path, header_len):
         """
         加密单个文件
 
+        旧版 index_cache JSON 使用的处理方式，去除固定长度的文件头
+
         Args:
             file_path: 文件路径
             header_len: 文件头长度
-            log_callback: 日志回调函数
 
         Returns:
             bool: 加密是否成功
         """
         try:
-            file_content = b""
+            if file_path.stat().st_size <= header_len:
+                self.logger.warning(f"文件 {file_path.name} 长度不足 {header_len} 字节，已跳过")
+                return False
+
+            # 原地去除文件头
+            strip_prefix_in_place(file_path, header_len)
+
+            return True
+        except Exception as e:
+            self.logger.error(f"加密文件 {file_path.name} 时出错: {str(e)}")
+            return False
+
+    def restore_file_header(self, file_path: Path, record: HeaderRecord) -> Optional[bool]:
+        """
+        按索引记录恢复单个文件的文件头
+
+        Args:
+            file_path: 文件路径
+            record: 解密时记录的文件头
+
+        Returns:
+            Optional[bool]: 恢复成功返回True，文件已带有相同文件头返回None，失败返回False
+        """
+        try:
+            size = file_path.stat().st_size
             with open(file_path, "rb") as f:
-                file_content = f.read()
+                current_header = f.read(record.header_len)
 
-            encoded = file_content[header_len:]
+            # 文件已经是加密状态，无需处理
+            if current_header == record.header and size == record.header_len + record.payload_size:
+                return None
 
-            with open(file_path, "wb") as f:
-                f.write(encoded)
+            if size != record.payload_size:
+                self.logger.debug(f"文件 {file_path.name} 大小与解密时不同，可能已被替换")
 
+            insert_prefix_in_place(file_path, record.header)
             return True
         except Exception as e:
             self.logger.error(f"加密文件 {file_path.name} 时出错: {str(e)}")
             return False
 
-    def encode(self, game_bundles_path: Path, cache_file):
+    def encode(self, game_bundles_path: Path, cache_file=None) -> dict:
         """
         加密目录下的所有资源文件
 
         Args:
             game_bundles_path: 游戏资源目录
-            cache_file: 目录索引缓存文件
-            log_callback: 日志回调函数
+            cache_file: 文件头索引，默认使用解密时生成的索引；
+                传入旧版 index_cache JSON 时按固定文件头长度处理
+
+        Returns:
+            dict: 统计信息 {"successful", "skipped", "failed"}
         """
+        stats = {"successful": 0, "skipped": 0, "failed": 0}
+
         # 确保路径存在
         if not game_bundles_path.exists():
             self.logger.error(f"错误: 路径 {game_bundles_path} 不存在\n")
-            return
-
-        # 读取index_cache文件
+            stats["failed"] = 1
+            return stats
+
+        if cache_file is None:
+            cache_file = default_index_path(game_bundles_path)
+        cache_file = Path(cache_file)
+        if not cache_file.is_file():
+            self.logger.error(f"索引文件 {cache_file} 不存在，请先解密该目录\n")
+            stats["failed"] = 1
+            return stats
+
+        # 读取索引文件
         try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                cache_data = json.load(f)
+            if cache_file.suffix.lower() == ".json":
+                with open(cache_file, "r", encoding="utf-8") as f:
+                    records = {rel_path: None for rel_path in json.load(f)}
+            else:
+                with CrosscoreHeaderIndex(cache_file) as index:
+                    records = index.all()
         except Exception as e:
-            self.logger.error(f"加载index_cache文件时出错: {str(e)}\n")
-            return
+            self.logger.error(f"加载索引文件时出错: {str(e)}\n")
+            stats["failed"] = 1
+            return stats
 
         self.logger.info(f"正在扫描目录: {game_bundles_path}\n")
         self.logger.info(f"使用索引文件: {cache_file}\n")
@@ -219,53 +297,66 @@ class CrosscoreCryptor:
 
         # 收集要加密的文件
         bundle_files = []
-        for rel_path in cache_data.keys():
+        for rel_path, record in records.items():
             file_path = game_bundles_path / rel_path
-            if file_path.exists() and file_path.is_file():
-                bundle_files.append(file_path)
+            if file_path.is_file():
+                bundle_files.append((file_path, record))
 
         if not bundle_files:
             self.logger.error("未找到需要加密的文件\n")
-            return
+            return stats
 
         self.logger.info(f"找到 {len(bundle_files)} 个文件需要加密\n")
         self.logger.info("开始加密资源文件...\n")
 
-        # 加载标准Header
-        # with open(os.path.join(os.path.dirname(__file__), "..", "..", "resources", "header.txt"), "r") as f:
-        #     header = f.read().strip()
-        # header_binary = unhexlify(header)
-        header_len = 336
+        # 旧版索引没有记录文件头，沿用固定长度
+        legacy_header_len = 336
 
         # 计数器
         successful = 0
+        skipped = 0
         failed = 0
         total = len(bundle_files)
         last_progress = 0
 
+        executor = get_executor(IO_POOL)
+
         # 提交所有任务
-        futures = {ENCRYPT_EXECUTOR.submit(self.encode_file, file, header_len): file for file in bundle_files}
+        futures = {}
+        for file, record in bundle_files:
+            if record is None:
+                future = executor.submit(self.encode_file, file, legacy_header_len)
+            else:
+                future = executor.submit(self.restore_file_header, file, record)
+            futures[future] = file
 
         # 处理结果
         for i, future in enumerate(as_completed(futures), 1):
             file = futures[future]
             try:
                 result = future.result()
-                if result:
+                if result is None:
+                    skipped += 1
+                elif result:
                     successful += 1
-                    # 仅在完成重要进度时输出日志
-                    progress = int(i / total * 100)
-                    if progress >= last_progress + 10 or i == total:
-                        self.logger.info(f"进度: {progress}% ({i}/{total})")
-                        last_progress = progress
+                else:
+                    failed += 1
             except Exception as e:
                 failed += 1
                 self.logger.info(f"处理 {file.name} 时出错: {str(e)}")
 
+            # 仅在完成重要进度时输出日志
+            progress = int(i / total * 100)
+            if progress >= last_progress + 10 or i == total:
+                self.logger.info(f"进度: {progress}% ({i}/{total})")
+                last_progress = progress
+
         # 打印统计信息
         elapsed = time.time() - start_time
         self.logger.info(f"\n加密完成! 耗时: {elapsed:.2f}秒")
-        self.logger.info(f"成功: {successful}, 失败: {failed}\n")
+        self.logger.info(f"成功: {successful}, 跳过: {skipped}, 失败: {failed}\n")
+        stats.update(successful=successful, skipped=skipped, failed=failed)
+        return stats
 
 
 if __name__ == "__main__":
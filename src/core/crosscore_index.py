@@ -0,0 +1,183 @@
+"""
+交错战线文件头索引
+解密时记录每个文件被去除的文件头，加密时据此原样恢复
+
+索引使用 SQLite 存储，相同的文件头只保存一份:
+    headers(header_hash, data)
+    files(rel_path, header_hash, header_len, payload_size, payload_mtime_ns)
+
+payload_size / payload_mtime_ns 是去除文件头后的文件状态，用于不读取文件内容就判断文件在解密后是否被修改过
+"""
+import hashlib
+import logging
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+from src.utils.path_helper import get_user_data_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS headers (
+    header_hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    rel_path TEXT PRIMARY KEY,
+    header_hash TEXT NOT NULL REFERENCES headers(header_hash),
+    header_len INTEGER NOT NULL,
+    payload_size INTEGER NOT NULL,
+    payload_mtime_ns INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# 旧版索引记录了解密后文件的 sha1，迁移时丢弃（修改时间记为0，视为未知）
+_MIGRATE_PAYLOAD_HASH = """
+ALTER TABLE files RENAME TO files_old;
+CREATE TABLE files (
+    rel_path TEXT PRIMARY KEY,
+    header_hash TEXT NOT NULL REFERENCES headers(header_hash),
+    header_len INTEGER NOT NULL,
+    payload_size INTEGER NOT NULL,
+    payload_mtime_ns INTEGER NOT NULL DEFAULT 0
+);
+INSERT INTO files (rel_path, header_hash, header_len, payload_size)
+    SELECT rel_path, header_hash, header_len, payload_size FROM files_old;
+DROP TABLE files_old;
+"""
+
+
+@dataclass
+class HeaderRecord:
+    """单个文件的文件头记录"""
+    rel_path: str
+    header: bytes
+    payload_size: int
+    payload_mtime_ns: int = 0
+
+    @property
+    def header_len(self) -> int:
+        return len(self.header)
+
+    @property
+    def header_hash(self) -> str:
+        return hashlib.sha1(self.header).hexdigest()
+
+    def is_unchanged(self, file_path: Path) -> bool:
+        """
+        文件是否仍是解密后的状态（大小和修改时间都与记录相同），只读取文件状态
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            bool: 未被修改返回True
+        """
+        if not self.payload_mtime_ns:
+            return False
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return False
+        return stat.st_size == self.payload_size and stat.st_mtime_ns == self.payload_mtime_ns
+
+
+def default_index_path(game_bundles_path: Path) -> Path:
+    """
+    获取游戏资源目录对应的默认索引文件路径，位于用户数据目录下，与当前工作目录无关
+
+    Args:
+        game_bundles_path: 游戏资源目录
+
+    Returns:
+        Path: 索引文件路径
+    """
+    key = hashlib.sha1(str(game_bundles_path.resolve()).encode("utf-8")).hexdigest()[:16]
+    cache_dir = get_user_data_dir() / "cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir / f"crosscore_index_{key}.db"
+
+
+class CrosscoreHeaderIndex:
+    """交错战线文件头索引（SQLite）"""
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        打开或创建索引
+
+        Args:
+            db_path: 索引文件路径
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(files)")}
+        if "payload_hash" in columns:
+            self.logger.info(f"升级文件头索引: {self.db_path}")
+            self.conn.executescript(_MIGRATE_PAYLOAD_HASH)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """关闭索引"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def put_many(self, records: Iterable[HeaderRecord]):
+        """
+        批量写入文件头记录，已存在的路径会被覆盖
+
+        Args:
+            records: 文件头记录
+        """
+        with self.conn:
+            for record in records:
+                header_hash = record.header_hash
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO headers (header_hash, data) VALUES (?, ?)",
+                    (header_hash, record.header)
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO files "
+                    "(rel_path, header_hash, header_len, payload_size, payload_mtime_ns) VALUES (?, ?, ?, ?, ?)",
+                    (record.rel_path, header_hash, record.header_len, record.payload_size, record.payload_mtime_ns)
+                )
+
+    def get(self, rel_path: str) -> Optional[HeaderRecord]:
+        """
+        按相对路径查找文件头记录
+
+        Args:
+            rel_path: 相对于游戏资源目录的路径
+
+        Returns:
+            Optional[HeaderRecord]: 文件头记录，不存在时返回None
+        """
+        row = self.conn.execute(
+            "SELECT f.rel_path, h.data, f.payload_size, f.payload_mtime_ns "
+            "FROM files f JOIN headers h ON f.header_hash = h.header_hash WHERE f.rel_path = ?",
+            (rel_path,)
+        ).fetchone()
+        return HeaderRecord(*row) if row else None
+
+    def all(self) -> Dict[str, HeaderRecord]:
+        """
+        读取全部文件头记录
+
+        Returns:
+            Dict[str, HeaderRecord]: 相对路径到文件头记录的映射
+        """
+        rows = self.conn.execute(
+            "SELECT f.rel_path, h.data, f.payload_size, f.payload_mtime_ns "
+            "FROM files f JOIN headers h ON f.header_hash = h.header_hash"
+        )
+        return {row[0]: HeaderRecord(*row) for row in rows}
@@ -0,0 +1,94 @@
+"""
+替换目录索引
+批量替换前一次性遍历替换目录，按 Path_ID 建立索引，
+替换时每个对象只需查找同一 Path_ID 下的少量候选文件，不再重复遍历目录
+"""
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+# 替换文件名中的 Path_ID 部分，例如 char_002_amiya.skel_-123456.skel
+_PATH_ID_PATTERN = re.compile(r"_(-?\d+)")
+
+
+@dataclass(frozen=True)
+class ReplaceEntry:
+    """替换目录中的单个文件"""
+    file_name: str
+    directory: str
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, self.file_name)
+
+
+class ReplaceIndex:
+    """替换目录索引"""
+
+    def __init__(self, replace_dir: str):
+        """
+        遍历替换目录并建立索引
+
+        Args:
+            replace_dir: 替换资源目录
+        """
+        self.replace_dir = replace_dir
+        self.by_path_id: Dict[int, List[ReplaceEntry]] = {}
+        self.dir_files: Dict[str, Set[str]] = {}
+
+        for root, _, files in os.walk(replace_dir):
+            # 排序保证同名候选的匹配顺序稳定
+            files = sorted(files)
+            self.dir_files[root] = set(files)
+            for file_name in files:
+                entry = ReplaceEntry(file_name, root)
+                for path_id in {int(match) for match in _PATH_ID_PATTERN.findall(file_name)}:
+                    self.by_path_id.setdefault(path_id, []).append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(files) for files in self.dir_files.values())
+
+    def find(self, name: str, path_id: int) -> Optional[ReplaceEntry]:
+        """
+        查找对象对应的替换文件，文件名需要包含 {名称}_{Path_ID}
+
+        Args:
+            name: 对象名称
+            path_id: 对象 Path_ID
+
+        Returns:
+            Optional[ReplaceEntry]: 替换文件，不存在时返回None
+        """
+        key = f"{name}_{path_id}"
+        for entry in self.by_path_id.get(path_id, ()):
+            if key in entry.file_name:
+                return entry
+        return None
+
+    def has_file(self, directory: str, file_name: str) -> bool:
+        """
+        判断替换目录的某个子目录中是否存在指定文件
+
+        Args:
+            directory: 子目录路径（来自 ReplaceEntry.directory）
+            file_name: 文件名
+
+        Returns:
+            bool: 是否存在
+        """
+        return file_name in self.dir_files.get(directory, ())
+
+    def missing_skel(self, directory: str, json_name: str, skel_name: str) -> bool:
+        """
+        判断 Spine 资源是否只有 .json 而缺少 .skel，此时不应替换
+
+        Args:
+            directory: 子目录路径
+            json_name: .json 文件名
+            skel_name: .skel 文件名
+
+        Returns:
+            bool: 存在 .json 但缺少 .skel 时返回True
+        """
+        return self.has_file(directory, json_name) and not self.has_file(directory, skel_name)
@@ -0,0 +1,109 @@
+"""
+替换目录监视器
+轮询替换目录的文件修改时间和大小，连续保存时等待变化平息后再触发一次重新打包，
+不依赖第三方文件系统事件库
+"""
+import logging
+import os
+import time
+from typing import Callable, Dict, Set, Tuple
+
+# 轮询间隔（秒）
+POLL_INTERVAL = 1.0
+
+# 最后一次变化后等待多久再触发（秒），用于合并连续保存
+DEBOUNCE_DELAY = 1.5
+
+# 文件路径 -> (修改时间, 大小)
+Snapshot = Dict[str, Tuple[int, int]]
+
+
+class ReplaceDirWatcher:
+    """替换目录监视器"""
+
+    def __init__(self, replace_dir: str, poll_interval: float = POLL_INTERVAL,
+                 debounce_delay: float = DEBOUNCE_DELAY):
+        """
+        初始化监视器
+
+        Args:
+            replace_dir: 替换资源目录
+            poll_interval: 轮询间隔（秒）
+            debounce_delay: 最后一次变化后等待多久再触发（秒）
+        """
+        self.logger = logging.getLogger(__name__)
+        self.replace_dir = replace_dir
+        self.poll_interval = poll_interval
+        self.debounce_delay = debounce_delay
+
+    def snapshot(self) -> Snapshot:
+        """
+        记录替换目录中所有文件的修改时间和大小
+
+        Returns:
+            Snapshot: 文件状态快照
+        """
+        result = {}
+        for root, _, files in os.walk(self.replace_dir):
+            for file in files:
+                path = os.path.join(root, file)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    # 文件在遍历过程中被删除或正在写入
+                    continue
+                result[path] = (stat.st_mtime_ns, stat.st_size)
+        return result
+
+    @staticmethod
+    def diff(old: Snapshot, new: Snapshot) -> Set[str]:
+        """
+        比较两个快照，返回新增、删除或修改的文件
+
+        Args:
+            old: 旧快照
+            new: 新快照
+
+        Returns:
+            Set[str]: 变化的文件路径
+        """
+        changed = {path for path, state in new.items() if old.get(path) != state}
+        changed.update(path for path in old if path not in new)
+        return changed
+
+    def watch(self, on_change: Callable[[Set[str]], None], should_stop: Callable[[], bool]):
+        """
+        持续监视替换目录，直到 should_stop 返回True
+
+        Args:
+            on_change: 变化平息后的回调，参数为这段时间内变化的文件
+            should_stop: 是否停止监视
+        """
+        last = self.snapshot()
+        pending: Set[str] = set()
+        last_change_time = 0.0
+        self.logger.info(f"开始监视替换目录: {self.replace_dir}")
+
+        while not should_stop():
+            time.sleep(self.poll_interval)
+            if should_stop():
+                break
+
+            current = self.snapshot()
+            changed = self.diff(last, current)
+            last = current
+            if changed:
+                pending.update(changed)
+                last_change_time = time.monotonic()
+                continue
+
+            if pending and time.monotonic() - last_change_time >= self.debounce_delay:
+                self.logger.info(f"检测到 {len(pending)} 个文件变化")
+                changed_files, pending = pending, set()
+                try:
+                    on_change(changed_files)
+                except Exception as e:
+                    self.logger.error(f"处理文件变化时出错: {str(e)}")
+                # 不在回调后重新取快照，回调期间保存的文件会在下一轮被检测到
+
+        self.logger.info("已停止监视替换目录")
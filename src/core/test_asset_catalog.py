@@ -0,0 +1,184 @@
+"""
+全局资源目录测试
+只测试 SQLite 索引的写入和查询，不解析资源包；未安装 UnityPy 时使用空模块代替，
+不依赖 Qt，可以直接运行本文件或使用 pytest
+"""
+import os
+import sys
+import tempfile
+import types
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# asset_catalog 在模块级导入 UnityPy，这里的测试用不到
+sys.modules.setdefault("UnityPy", types.ModuleType("UnityPy"))
+
+from src.core.asset_catalog import AssetCatalog
+
+
+def _write(path: str, data: bytes = b"bundle") -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def _open(temp_dir: str) -> AssetCatalog:
+    return AssetCatalog(os.path.join(temp_dir, "catalog.db"))
+
+
+def test_put_and_search():
+    """按名称、容器路径的子串（含少于3个字符的查询）和类型查找对象，覆盖写入时替换旧记录"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bundle = _write(os.path.join(temp_dir, "game", "char_002_amiya.ab"))
+        with _open(temp_dir) as catalog:
+            catalog.put(bundle, "ARKNIGHTS", [
+                (1, "Texture2D", "char_002_amiya", "assets/char/char_002_amiya.png", 1024),
+                (2, "Sprite", "char_002_amiya", "", 64),
+                (3, "TextAsset", "dialogue_amiya", "", 10),
+            ])
+            catalog.conn.commit()
+
+            assert {entry.path_id for entry in catalog.search("AMIYA")} == {1, 2, 3}
+            assert [entry.path_id for entry in catalog.search("amiya", "Texture2D")] == [1]
+            assert [entry.path_id for entry in catalog.search("assets/char")] == [1]
+            assert {entry.path_id for entry in catalog.search("ch")} == {1, 2}
+            assert catalog.search("50%") == []
+            entry = catalog.search("dialogue")[0]
+            assert (entry.bundle_path, entry.game_type, entry.byte_size) == (bundle, "ARKNIGHTS", 10)
+            assert catalog.types() == ["Sprite", "TextAsset", "Texture2D"]
+
+            catalog.put(bundle, "ARKNIGHTS", [(4, "Texture2D", "char_002_amiya_2", "", 1)])
+            catalog.conn.commit()
+            assert [entry.path_id for entry in catalog.search("amiya")] == [4]
+            assert catalog.stats()["objects"] == 1
+
+
+def test_original_path():
+    """搜索结果返回写入时的原始路径，按规范化路径比较：不同写法的同一个资源包不会重复索引"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bundle = _write(os.path.join(temp_dir, "Game", "Char_002.ab"))
+        original = os.path.join(temp_dir, "Game", ".", "Char_002.ab")
+        with _open(temp_dir) as catalog:
+            catalog.put(original, "ARKNIGHTS", [(1, "Texture2D", "char_002", "", 1)])
+            catalog.conn.commit()
+            assert catalog.search("char_002")[0].bundle_path == original
+            assert catalog._stale_bundles([bundle, original]) == []
+
+            catalog.put(bundle, "ARKNIGHTS", [(1, "Texture2D", "char_002", "", 1)])
+            catalog.conn.commit()
+            assert catalog.stats()["bundles"] == 1
+            assert catalog.search("char_002")[0].bundle_path == bundle
+
+
+def test_stale_and_remove_missing():
+    """修改过的资源包需要重新索引，扫描目录下已删除的资源包记录被移除，其他目录的记录保留"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        first = _write(os.path.join(temp_dir, "game", "a.ab"))
+        second = _write(os.path.join(temp_dir, "game", "b.ab"))
+        other = _write(os.path.join(temp_dir, "game2", "c.ab"))
+        with _open(temp_dir) as catalog:
+            for path in (first, second, other):
+                catalog.put(path, "ARKNIGHTS", [(1, "Texture2D", os.path.basename(path), "", 1)])
+            catalog.conn.commit()
+            assert catalog._stale_bundles([first, second, other]) == []
+
+            _write(first, b"modified bundle")
+            assert catalog._stale_bundles([first, second, other]) == [first]
+
+            os.remove(second)
+            assert catalog._remove_missing([os.path.join(temp_dir, "game")], [first]) == 1
+            assert {entry.bundle_path for entry in catalog.search()} == {first, other}
+
+
+def test_search_text():
+    """按文本内容搜索（中文子串和少于3个字符的查询），结果包含对象名称和匹配片段"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bundle = _write(os.path.join(temp_dir, "game", "story.ab"))
+        with _open(temp_dir) as catalog:
+            if not catalog.fts_enabled:
+                return
+            catalog.put(bundle, "ARKNIGHTS",
+                        [(1, "TextAsset", "level_main_01", "", 10), (2, "MonoBehaviour", "", "", 5)],
+                        [(1, "博士，欢迎回到罗德岛。"), (2, "skeleton_amiya\nidle")])
+            catalog.conn.commit()
+
+            match = catalog.search_text("罗德岛")[0]
+            assert (match.bundle_path, match.path_id, match.type, match.name) == \
+                   (bundle, 1, "TextAsset", "level_main_01")
+            assert "[罗德岛]" in match.snippet
+            assert [match.path_id for match in catalog.search_text("SKELETON_amiya")] == [2]
+            assert [match.path_id for match in catalog.search_text("博士")] == [1]
+            assert catalog.search_text('"quoted"') == []
+            assert catalog.search_text("   ") == []
+            assert catalog.stats()["texts"] == 2
+
+
+def test_delete_bundle_texts():
+    """重新写入或删除资源包时旧的全文记录一起删除，其他资源包的全文记录保留"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        first = _write(os.path.join(temp_dir, "game", "a.ab"))
+        second = _write(os.path.join(temp_dir, "game", "b.ab"))
+        with _open(temp_dir) as catalog:
+            if not catalog.fts_enabled:
+                return
+            catalog.put(first, "ARKNIGHTS", [(1, "TextAsset", "a", "", 1)], [(1, "old dialogue")])
+            catalog.put(second, "ARKNIGHTS", [(1, "TextAsset", "b", "", 1)], [(1, "other dialogue")])
+            catalog.put(first, "ARKNIGHTS", [(1, "TextAsset", "a", "", 1)], [(1, "new dialogue")])
+            catalog.conn.commit()
+            assert catalog.search_text("old dialogue") == []
+            assert [match.bundle_path for match in catalog.search_text("dialogue")].count(first) == 1
+
+            catalog._delete_bundle(catalog._key(first))
+            catalog.conn.commit()
+            assert [match.bundle_path for match in catalog.search_text("dialogue")] == [second]
+            assert catalog.conn.execute("SELECT COUNT(*) FROM texts").fetchone()[0] == 1
+            assert catalog.stats() == {"bundles": 1, "objects": 1, "texts": 1}
+
+
+def test_set_scope():
+    """限定范围后搜索、全文搜索、类型和统计只包含批量导入的资源包，取消限定后恢复整个资源目录"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        first = _write(os.path.join(temp_dir, "game", "a.ab"))
+        second = _write(os.path.join(temp_dir, "game", "b.ab"))
+        with _open(temp_dir) as catalog:
+            catalog.put(first, "ARKNIGHTS", [(1, "Texture2D", "shared_name", "", 1)], [(1, "shared text")])
+            catalog.put(second, "ARKNIGHTS", [(1, "TextAsset", "shared_name", "", 1)], [(1, "shared text")])
+            catalog.conn.commit()
+
+            # 不同写法的同一路径也在范围内
+            catalog.set_scope([os.path.join(temp_dir, "game", ".", "a.ab"), first])
+            assert [entry.bundle_path for entry in catalog.search("shared")] == [first]
+            assert catalog.types() == ["Texture2D"]
+            assert catalog.stats()["bundles"] == 1
+            if catalog.fts_enabled:
+                assert [match.bundle_path for match in catalog.search_text("shared")] == [first]
+
+            catalog.set_scope([])
+            assert catalog.search("shared") == []
+            assert catalog.stats() == {"bundles": 0, "objects": 0, "texts": 0}
+
+            catalog.set_scope(None)
+            assert {entry.bundle_path for entry in catalog.search("shared")} == {first, second}
+            assert catalog.stats()["objects"] == 2
+
+
+def test_scope_per_connection():
+    """查询范围只对当前连接生效，不影响同一个索引文件的其他连接"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        first = _write(os.path.join(temp_dir, "game", "a.ab"))
+        second = _write(os.path.join(temp_dir, "game", "b.ab"))
+        with _open(temp_dir) as scoped, _open(temp_dir) as full:
+            for path in (first, second):
+                scoped.put(path, "ARKNIGHTS", [(1, "Texture2D", "shared_name", "", 1)])
+            scoped.conn.commit()
+            scoped.set_scope([second])
+            assert [entry.bundle_path for entry in scoped.search("shared")] == [second]
+            assert len(full.search("shared")) == 2
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"{name} 通过")
@@ -0,0 +1,126 @@
+"""
+批量打包构建清单测试
+覆盖增量跳过、构建期间保存的替换文件、重复的替换文件路径以及替换文件删除后的清理，
+不依赖 Qt 和 UnityPy，可以直接运行本文件或使用 pytest
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.build_manifest import BuildManifest
+
+
+def _write(path: str, data: bytes) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def _touch_later(path: str):
+    """修改文件的修改时间，不改变内容"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_incremental_skip():
+    """输入未变化时跳过构建；仅修改时间变化而内容相同时仍视为最新；内容变化时重新构建"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        target_dir = os.path.join(temp_dir, "out")
+        source = _write(os.path.join(temp_dir, "src", "a.ab"), b"source")
+        replacement = _write(os.path.join(temp_dir, "replace", "a_1.png"), b"png")
+        output = _write(os.path.join(target_dir, "a.ab"), b"built")
+        manifest_path = Path(temp_dir) / "manifest.json"
+
+        manifest = BuildManifest(target_dir, manifest_path)
+        assert not manifest.is_up_to_date(output, source, [replacement])
+        manifest.record(output, BuildManifest.snapshot(source, [replacement]))
+        manifest.save()
+
+        manifest = BuildManifest(target_dir, manifest_path)
+        assert manifest.is_up_to_date(output, source, [replacement])
+        # 替换文件列表变化
+        assert not manifest.is_up_to_date(output, source, [])
+
+        _touch_later(replacement)
+        assert manifest.is_up_to_date(output, source, [replacement])
+
+        _write(replacement, b"new png")
+        assert not manifest.is_up_to_date(output, source, [replacement])
+
+        manifest.discard(output)
+        assert not manifest.is_up_to_date(output, source, [replacement])
+
+
+def test_duplicate_inputs():
+    """同一个替换文件在输入列表中出现多次（或使用不同的相对形式）时仍视为最新"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        target_dir = os.path.join(temp_dir, "out")
+        source = _write(os.path.join(temp_dir, "src", "a.ab"), b"source")
+        replacement = _write(os.path.join(temp_dir, "replace", "a_1.png"), b"png")
+        output = _write(os.path.join(target_dir, "a.ab"), b"built")
+        manifest = BuildManifest(target_dir, Path(temp_dir) / "manifest.json")
+
+        duplicated = [replacement, replacement, os.path.join(temp_dir, "replace", ".", "a_1.png")]
+        manifest.record(output, BuildManifest.snapshot(source, duplicated))
+        assert len(manifest.entries["a.ab"]["inputs"]) == 1
+        assert manifest.is_up_to_date(output, source, duplicated)
+        assert manifest.is_up_to_date(output, source, [replacement])
+
+
+def test_save_during_build():
+    """构建期间保存的替换文件与构建前的记录不一致，下次打包时重新构建"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        target_dir = os.path.join(temp_dir, "out")
+        source = _write(os.path.join(temp_dir, "src", "a.ab"), b"source")
+        replacement = _write(os.path.join(temp_dir, "replace", "a_1.png"), b"png")
+        manifest = BuildManifest(target_dir, Path(temp_dir) / "manifest.json")
+
+        snapshot = BuildManifest.snapshot(source, [replacement])
+        # 构建过程中替换文件被再次保存
+        _write(replacement, b"saved while building")
+        output = _write(os.path.join(target_dir, "a.ab"), b"built from old png")
+        manifest.record(output, snapshot)
+
+        assert not manifest.is_up_to_date(output, source, [replacement])
+
+
+def test_prune_deleted_inputs():
+    """替换文件被删除后删除对应的输出和记录，仍需构建的输出保留"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        target_dir = os.path.join(temp_dir, "out")
+        manifest = BuildManifest(target_dir, Path(temp_dir) / "manifest.json")
+        outputs = {}
+        for name in ("a", "b", "c"):
+            source = _write(os.path.join(temp_dir, "src", f"{name}.ab"), b"source")
+            replacement = _write(os.path.join(temp_dir, "replace", f"{name}_1.png"), b"png")
+            outputs[name] = _write(os.path.join(target_dir, f"{name}.ab"), b"built")
+            manifest.record(outputs[name], BuildManifest.snapshot(source, [replacement]))
+
+        os.remove(os.path.join(temp_dir, "replace", "a_1.png"))
+        os.remove(os.path.join(temp_dir, "replace", "b_1.png"))
+        removed = manifest.prune_deleted_inputs([outputs["b"]])
+
+        assert [os.path.abspath(path) for path in removed] == [os.path.abspath(outputs["a"])]
+        assert not os.path.exists(outputs["a"])
+        assert os.path.exists(outputs["b"]) and os.path.exists(outputs["c"])
+        assert set(manifest.entries) == {"b.ab", "c.ab"}
+
+
+def test_corrupt_manifest():
+    """清单损坏时视为空清单，完整重建"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manifest_path = Path(_write(os.path.join(temp_dir, "manifest.json"), b"{not json"))
+        manifest = BuildManifest(os.path.join(temp_dir, "out"), manifest_path)
+        assert manifest.entries == {}
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"{name} 通过")
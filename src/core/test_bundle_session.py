@@ -0,0 +1,113 @@
+"""
+资源包会话管理测试
+覆盖预算判断、按最近最少使用的顺序释放没有打开窗口的资源包以及释放时删除临时目录，
+不依赖 Qt 和 UnityPy，可以直接运行本文件或使用 pytest
+"""
+import os
+import sys
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.bundle_session import BundleSessionManager
+from src.utils import temp_store
+from src.utils.temp_store import SCAN_PREFIX, TempStore
+
+# 每个资源包的临时文件大小，两个资源包即超过 1MB 的磁盘预算
+FILE_SIZE = 600 * 1024
+
+
+def _with_store(test):
+    """使用单独的临时目录运行测试，释放的会话从该目录删除"""
+    def run():
+        with tempfile.TemporaryDirectory() as root:
+            old = temp_store._store
+            temp_store._store = TempStore(root, max_mb=0)
+            try:
+                test()
+            finally:
+                temp_store._store = old
+    run.__name__ = test.__name__
+    run.__doc__ = test.__doc__
+    return run
+
+
+def _add(manager: BundleSessionManager, asset_path: str) -> str:
+    """记录一个扫描结果，临时目录中写入一个 FILE_SIZE 大小的文件"""
+    temp_path = temp_store.get_temp_store().create_dir(SCAN_PREFIX)
+    file_path = os.path.join(temp_path, "a.png")
+    with open(file_path, "wb") as f:
+        f.write(b"\0" * FILE_SIZE)
+    manager.add(asset_path, [{"name": "a.png", "path": file_path, "size": FILE_SIZE}], temp_path)
+    return temp_path
+
+
+@_with_store
+def test_over_budget():
+    """磁盘或内存占用超过预算时超出，预算为0时不限制"""
+    manager = BundleSessionManager(temp_budget_mb=1, memory_budget_mb=0)
+    _add(manager, "a.ab")
+    assert not manager.over_budget()
+    _add(manager, "b.ab")
+    assert manager.temp_bytes == 2 * FILE_SIZE
+    assert manager.over_budget()
+
+    unlimited = BundleSessionManager(temp_budget_mb=0, memory_budget_mb=0)
+    _add(unlimited, "a.ab")
+    _add(unlimited, "b.ab")
+    assert not unlimited.over_budget()
+
+    memory_only = BundleSessionManager(temp_budget_mb=0, memory_budget_mb=1)
+    memory_only.add("big.ab", [{"name": "x" * 100, "size": 0} for _ in range(10000)], "")
+    assert memory_only.memory_bytes > 1024 * 1024
+    assert memory_only.over_budget()
+
+
+@_with_store
+def test_evict_lru():
+    """按最近最少使用的顺序释放，直到回到预算以内；get 会把资源包标记为最近使用"""
+    manager = BundleSessionManager(temp_budget_mb=1, memory_budget_mb=0)
+    temp_paths = {name: _add(manager, name) for name in ("a.ab", "b.ab", "c.ab")}
+    manager.get("a.ab")
+
+    assert manager.evict([]) == ["b.ab", "c.ab"]
+    assert list(manager.sessions) == ["a.ab"]
+    assert not os.path.exists(temp_paths["b.ab"])
+    assert not os.path.exists(temp_paths["c.ab"])
+    assert os.path.exists(temp_paths["a.ab"])
+    assert manager.get("b.ab") is None
+    assert manager.evict([]) == []
+
+
+@_with_store
+def test_evict_skips_active():
+    """有打开窗口的资源包不释放，即使仍然超出预算"""
+    manager = BundleSessionManager(temp_budget_mb=1, memory_budget_mb=0)
+    for name in ("a.ab", "b.ab", "c.ab"):
+        _add(manager, name)
+
+    assert manager.evict(["a.ab", "b.ab"]) == ["c.ab"]
+    assert list(manager.sessions) == ["a.ab", "b.ab"]
+    assert manager.evict(["a.ab", "b.ab"]) == []
+    assert manager.over_budget()
+
+
+@_with_store
+def test_add_replaces_temp_dir():
+    """重新扫描同一个资源包时删除旧的临时目录"""
+    manager = BundleSessionManager()
+    old_temp = _add(manager, "a.ab")
+    new_temp = _add(manager, "a.ab")
+    assert not os.path.exists(old_temp)
+    assert os.path.exists(new_temp)
+    assert len(manager) == 1
+    assert manager.clear() == 1
+    assert not os.path.exists(new_temp)
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"{name} 通过")
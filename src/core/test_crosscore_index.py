@@ -0,0 +1,121 @@
+"""
+交错战线文件头索引测试
+覆盖解密/加密往返、相同文件头共享、按大小和修改时间跳过未修改的文件以及旧版索引迁移，
+不依赖 Qt 和 UnityPy，可以直接运行本文件或使用 pytest
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.crosscore_cryptor import CrosscoreCryptor
+from src.core.crosscore_index import CrosscoreHeaderIndex, HeaderRecord
+from src.utils.signature_scanner import UNITYFS_SIGNATURE
+
+
+def _encrypted(path: Path, header: bytes, payload_size: int = 5000) -> bytes:
+    data = header + UNITYFS_SIGNATURE + os.urandom(payload_size)
+    path.write_bytes(data)
+    return data
+
+
+def test_header_round_trip():
+    """解密记录的文件头在加密时原样恢复，已带有文件头的文件跳过"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        header = UNITYFS_SIGNATURE + os.urandom(325)
+        path = Path(temp_dir) / "a.ab"
+        original = _encrypted(path, header)
+        cryptor = CrosscoreCryptor()
+
+        record = cryptor.decrypt_file_with_header(path, "a.ab")
+        assert record is not None
+        assert record.header == header
+        assert path.read_bytes() == original[len(header):]
+        assert record.is_unchanged(path)
+
+        index_path = os.path.join(temp_dir, "index.db")
+        with CrosscoreHeaderIndex(index_path) as index:
+            index.put_many([record])
+        with CrosscoreHeaderIndex(index_path) as index:
+            stored = index.get("a.ab")
+            assert len(index) == 1
+            assert index.get("missing.ab") is None
+        assert stored == record
+
+        assert cryptor.restore_file_header(path, stored) is True
+        assert path.read_bytes() == original
+        assert not stored.is_unchanged(path)
+        assert cryptor.restore_file_header(path, stored) is None
+        assert path.read_bytes() == original
+
+        # 未加密的文件不记录
+        plain = Path(temp_dir) / "plain.ab"
+        plain.write_bytes(UNITYFS_SIGNATURE + b"payload")
+        assert cryptor.decrypt_file_with_header(plain, "plain.ab") is None
+
+
+def test_headers_shared():
+    """相同的文件头只保存一份，重复写入同一路径时覆盖"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        header = UNITYFS_SIGNATURE + b"\x01" * 100
+        cryptor = CrosscoreCryptor()
+        records = []
+        for name in ("a.ab", "b.ab"):
+            path = Path(temp_dir) / name
+            _encrypted(path, header, 100)
+            records.append(cryptor.decrypt_file_with_header(path, name))
+
+        with CrosscoreHeaderIndex(os.path.join(temp_dir, "index.db")) as index:
+            index.put_many(records)
+            index.put_many(records[:1])
+            assert len(index) == 2
+            assert index.conn.execute("SELECT COUNT(*) FROM headers").fetchone()[0] == 1
+            assert set(index.all()) == {"a.ab", "b.ab"}
+
+
+def test_is_unchanged():
+    """大小或修改时间与记录不同时视为已修改，旧版记录（修改时间未知）始终视为已修改"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "a.ab"
+        path.write_bytes(b"payload")
+        stat = path.stat()
+        record = HeaderRecord("a.ab", b"header", stat.st_size, stat.st_mtime_ns)
+        assert record.is_unchanged(path)
+
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert not record.is_unchanged(path)
+        assert not HeaderRecord("a.ab", b"header", stat.st_size).is_unchanged(path)
+        assert not record.is_unchanged(Path(temp_dir) / "missing.ab")
+
+
+def test_migrate_payload_hash():
+    """旧版索引（记录 payload_hash）打开时迁移，文件头保留"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index_path = os.path.join(temp_dir, "old.db")
+        conn = sqlite3.connect(index_path)
+        conn.executescript(
+            "CREATE TABLE headers (header_hash TEXT PRIMARY KEY, data BLOB NOT NULL);"
+            "CREATE TABLE files (rel_path TEXT PRIMARY KEY, header_hash TEXT NOT NULL, header_len INTEGER NOT NULL,"
+            " payload_hash TEXT NOT NULL, payload_size INTEGER NOT NULL);"
+            "INSERT INTO headers VALUES ('h', x'0102');"
+            "INSERT INTO files VALUES ('a.ab', 'h', 2, 'sha1', 10);"
+        )
+        conn.commit()
+        conn.close()
+
+        with CrosscoreHeaderIndex(index_path) as index:
+            record = index.get("a.ab")
+            columns = {row[1] for row in index.conn.execute("PRAGMA table_info(files)")}
+        assert record == HeaderRecord("a.ab", b"\x01\x02", 10, 0)
+        assert "payload_hash" not in columns
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"{name} 通过")
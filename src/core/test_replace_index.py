@@ -0,0 +1,58 @@
+"""
+替换目录索引测试
+不依赖 Qt 和 UnityPy，可以直接运行本文件或使用 pytest
+"""
+import os
+import sys
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.replace_index import ReplaceIndex
+
+
+def _write(path: str, data: bytes) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def test_find_by_name_and_path_id():
+    """按 名称_Path_ID 查找替换文件，Path_ID 相同但名称不同时不匹配"""
+    with tempfile.TemporaryDirectory() as replace_dir:
+        sub_dir = os.path.join(replace_dir, "char")
+        _write(os.path.join(sub_dir, "char_002_amiya.skel_-123456.skel"), b"skel")
+        _write(os.path.join(sub_dir, "char_002_amiya.atlas_789.atlas"), b"atlas")
+
+        index = ReplaceIndex(replace_dir)
+        assert len(index) == 2
+        entry = index.find("char_002_amiya.skel", -123456)
+        assert entry is not None
+        assert entry.path == os.path.join(sub_dir, "char_002_amiya.skel_-123456.skel")
+        assert index.find("char_002_amiya.atlas", 789).directory == sub_dir
+        assert index.find("other", 789) is None
+        assert index.find("char_002_amiya.skel", 1) is None
+
+
+def test_missing_skel():
+    """子目录中只有 .json 而缺少 .skel 时不应替换"""
+    with tempfile.TemporaryDirectory() as replace_dir:
+        _write(os.path.join(replace_dir, "only_json_42.json"), b"{}")
+        _write(os.path.join(replace_dir, "both_7.json"), b"{}")
+        _write(os.path.join(replace_dir, "both_7.skel"), b"skel")
+
+        index = ReplaceIndex(replace_dir)
+        assert index.has_file(replace_dir, "only_json_42.json")
+        assert not index.has_file(os.path.join(replace_dir, "missing"), "only_json_42.json")
+        assert index.missing_skel(replace_dir, "only_json_42.json", "only_json_42.skel")
+        assert not index.missing_skel(replace_dir, "both_7.json", "both_7.skel")
+        assert not index.missing_skel(replace_dir, "missing.json", "missing.skel")
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"{name} 通过")
@@ -0,0 +1,74 @@
+"""
+替换目录监视器测试
+不依赖 Qt 和 UnityPy，可以直接运行本文件或使用 pytest
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.replace_watcher import ReplaceDirWatcher
+
+
+def _write(path: str, data: bytes) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def test_diff():
+    """新增、删除和修改的文件都视为变化"""
+    old = {"a": (1, 10), "b": (1, 10), "c": (1, 10)}
+    new = {"a": (1, 10), "b": (2, 10), "d": (1, 1)}
+    assert ReplaceDirWatcher.diff(old, new) == {"b", "c", "d"}
+    assert ReplaceDirWatcher.diff(new, new) == set()
+
+
+def test_snapshot():
+    """快照包含子目录中的文件"""
+    with tempfile.TemporaryDirectory() as replace_dir:
+        first = _write(os.path.join(replace_dir, "a_1.png"), b"a")
+        second = _write(os.path.join(replace_dir, "sub", "b_2.png"), b"bb")
+        snapshot = ReplaceDirWatcher(replace_dir).snapshot()
+        assert set(snapshot) == {first, second}
+        assert snapshot[second][1] == 2
+
+
+def test_debounce():
+    """连续保存只在变化平息后触发一次回调，包含这段时间内所有变化的文件"""
+    with tempfile.TemporaryDirectory() as replace_dir:
+        first = _write(os.path.join(replace_dir, "a_1.png"), b"a")
+        watcher = ReplaceDirWatcher(replace_dir, poll_interval=0.05, debounce_delay=0.4)
+        calls = []
+        stop = threading.Event()
+        thread = threading.Thread(target=watcher.watch, args=(calls.append, stop.is_set))
+        thread.start()
+        try:
+            time.sleep(0.2)
+            for i in range(5):
+                _write(first, b"a" * (i + 2))
+                time.sleep(0.06)
+            second = _write(os.path.join(replace_dir, "sub", "b_2.png"), b"b")
+
+            deadline = time.monotonic() + 5
+            while not calls and time.monotonic() < deadline:
+                time.sleep(0.05)
+            time.sleep(0.5)
+        finally:
+            stop.set()
+            thread.join()
+
+        assert len(calls) == 1
+        assert calls[0] == {first, second}
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"{name} 通过")
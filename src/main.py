@@ -4,6 +4,7 @@
 import sys
 import os
 import traceback
+import multiprocessing
 
 # 添加项目根目录到 Python 路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -11,6 +12,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from PyQt6.QtWidgets import QApplication
 from src.ui.main_window import MainWindow
 from src.utils.logger import setup_logger, log_exception
+from src.utils.executor_registry import shutdown_executors
+from src.utils.temp_store import get_temp_store
 
 def main():
     """程序入口函数"""
@@ -27,15 +30,23 @@ def main():
         logger.info(f"操作系统: {sys.platform}")
         logger.info(f"工作目录: {os.getcwd()}")
         
+        # 后台清理上次崩溃或强制退出时遗留的临时目录
+        get_temp_store().start_sweeper()
+
         app = QApplication(sys.argv)
         window = MainWindow()
         window.show()
         logger.info("主窗口显示完成")
-        sys.exit(app.exec())
+        exit_code = app.exec()
+        # 取消尚未开始的后台任务，不等待正在执行的任务
+        shutdown_executors(wait=False, cancel_futures=True)
+        sys.exit(exit_code)
     except Exception as e:
         logger.error(f"程序启动失败: {str(e)}")
         logger.error(traceback.format_exc())
         raise
 
 if __name__ == "__main__":
+    # 打包后的程序启动子进程（批量替换进程池）时需要
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
@@ -0,0 +1,349 @@
+"""
+资源目录搜索窗口
+构建整个游戏目录的资源索引，按名称、容器路径和类型搜索对象所在的资源包，
+或按 TextAsset / MonoBehaviour 的文本内容全文搜索；
+批量导入时只索引选中的资源包并限定搜索范围，双击结果时才打开对应的资源包窗口
+"""
+import os
+import logging
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
+                             QLabel, QFileDialog, QTableWidget, QTableWidgetItem,
+                             QProgressBar, QMessageBox, QHeaderView, QLineEdit, QComboBox)
+
+from src.config.config_manager import ConfigManager
+from src.core.asset_catalog import AssetCatalog
+from src.worker.catalog_build_worker import CatalogBuildWorker
+
+# 输入停止多久后执行搜索（毫秒）
+SEARCH_DEBOUNCE_MS = 250
+
+# 搜索模式
+SEARCH_BY_NAME = "name"
+SEARCH_BY_TEXT = "text"
+
+# 各搜索模式下的结果列标题
+NAME_HEADERS = ["名称", "类型", "Path_ID", "容器路径", "资源包", "大小"]
+TEXT_HEADERS = ["名称", "类型", "Path_ID", "匹配内容", "资源包", ""]
+
+
+class AssetCatalogDialog(QDialog):
+    """资源目录搜索窗口"""
+
+    def __init__(self, parent=None, bundle_paths=None):
+        """
+        初始化资源目录窗口
+
+        Args:
+            parent: 主窗口
+            bundle_paths: 批量导入的资源包列表，指定时只索引和搜索这些资源包
+        """
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self.config = ConfigManager()
+        self.main_window = parent
+        self.root_dir = None
+        self.bundle_paths = bundle_paths
+        self.worker = None
+        # 关闭窗口时正在构建索引，停止后再关闭
+        self.close_after_build = False
+        if bundle_paths is None:
+            self.setWindowTitle("资源目录")
+        else:
+            self.setWindowTitle(f"批量导入 - {len(bundle_paths)} 个资源包")
+        self.setMinimumSize(900, 600)
+
+        # 搜索在GUI线程中执行，只读查询耗时为毫秒级
+        self.catalog = AssetCatalog()
+        if bundle_paths is not None:
+            self.catalog.set_scope(bundle_paths)
+
+        # 设置为非模态对话框
+        self.setModal(False)
+        self.setWindowFlags(
+            Qt.WindowType.Window |
+            Qt.WindowType.WindowMinimizeButtonHint |
+            Qt.WindowType.WindowCloseButtonHint
+        )
+
+        # 搜索防抖定时器
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.run_search)
+
+        self.setup_ui()
+        self.refresh_types()
+        self.update_stats()
+        self.run_search()
+
+        # 批量导入时立即开始索引
+        if bundle_paths is not None:
+            self.start_build()
+
+    def setup_ui(self):
+        """设置用户界面"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setSpacing(10)
+        main_layout.setContentsMargins(20, 20, 20, 20)
+
+        # 目录与构建区域
+        build_layout = QHBoxLayout()
+        self.select_dir_btn = QPushButton("选择游戏目录")
+        self.select_dir_btn.clicked.connect(self.select_root_dir)
+        build_layout.addWidget(self.select_dir_btn)
+
+        self.dir_label = QLabel("未选择文件夹")
+        self.dir_label.setStyleSheet("color: #666666;")
+        build_layout.addWidget(self.dir_label, stretch=1)
+
+        self.build_btn = QPushButton("构建/更新索引")
+        self.build_btn.setEnabled(False)
+        self.build_btn.clicked.connect(self.start_build)
+        build_layout.addWidget(self.build_btn)
+
+        self.stop_btn = QPushButton("停止")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.stop_build)
+        build_layout.addWidget(self.stop_btn)
+        main_layout.addLayout(build_layout)
+
+        if self.bundle_paths is not None:
+            self.select_dir_btn.setVisible(False)
+            self.dir_label.setText(f"批量导入的 {len(self.bundle_paths)} 个资源包，双击搜索结果打开资源包")
+            self.build_btn.setEnabled(True)
+
+        # 搜索区域
+        search_layout = QHBoxLayout()
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem("名称/容器路径", SEARCH_BY_NAME)
+        self.mode_combo.addItem("文本内容", SEARCH_BY_TEXT)
+        self.mode_combo.currentIndexChanged.connect(self.on_mode_changed)
+        search_layout.addWidget(self.mode_combo)
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("搜索对象名称或容器路径...")
+        self.search_input.textChanged.connect(lambda _: self.search_timer.start())
+        search_layout.addWidget(self.search_input, stretch=1)
+
+        self.type_combo = QComboBox()
+        self.type_combo.currentIndexChanged.connect(lambda _: self.search_timer.start())
+        search_layout.addWidget(self.type_combo)
+        main_layout.addLayout(search_layout)
+
+        # 结果列表
+        self.result_table = QTableWidget()
+        self.result_table.setColumnCount(6)
+        self.result_table.setHorizontalHeaderLabels(NAME_HEADERS)
+        header = self.result_table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(4, QHeaderView.ResizeMode.Interactive)
+        self.result_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.result_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.result_table.verticalHeader().setVisible(False)
+        self.result_table.setShowGrid(False)
+        self.result_table.setSortingEnabled(True)
+        self.result_table.itemDoubleClicked.connect(self.on_result_double_clicked)
+        main_layout.addWidget(self.result_table)
+
+        # 状态与进度
+        self.stats_label = QLabel()
+        main_layout.addWidget(self.stats_label)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMinimum(0)
+        self.progress_bar.setMaximum(100)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        main_layout.addWidget(self.progress_bar)
+
+    def select_root_dir(self):
+        """选择游戏资源目录"""
+        dir_path = QFileDialog.getExistingDirectory(
+            self,
+            "选择游戏资源目录",
+            self.config.get('last_input_dir', '') or "",
+            QFileDialog.Option.ShowDirsOnly
+        )
+        if dir_path:
+            self.root_dir = dir_path
+            self.dir_label.setText(dir_path)
+            self.build_btn.setEnabled(True)
+
+    def start_build(self):
+        """开始增量构建索引"""
+        if self.bundle_paths is not None:
+            self.worker = CatalogBuildWorker([], self.bundle_paths)
+        elif self.root_dir:
+            self.worker = CatalogBuildWorker([self.root_dir])
+        else:
+            QMessageBox.warning(self, "警告", "请先选择游戏资源目录！")
+            return
+
+        self.worker.progress.connect(self.on_build_progress)
+        self.worker.finished.connect(self.on_build_finished)
+        self.worker.error.connect(self.on_build_error)
+
+        self.build_btn.setEnabled(False)
+        self.select_dir_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("正在扫描目录...")
+        self.worker.start()
+
+    def stop_build(self):
+        """停止构建"""
+        if self.worker and self.worker.isRunning():
+            self.worker.stop()
+            self.stop_btn.setEnabled(False)
+            self.progress_bar.setFormat("正在停止...")
+
+    def on_build_progress(self, done, total, bundle_path):
+        """更新构建进度"""
+        self.progress_bar.setValue(int(done / total * 100) if total else 100)
+        self.progress_bar.setFormat(f"正在索引 {done}/{total}: {os.path.basename(bundle_path)}")
+
+    def on_build_finished(self, stats):
+        """构建完成"""
+        self.reset_build_state()
+        if self.close_after_build:
+            self.close_pending()
+            return
+        self.progress_bar.setValue(100)
+        self.progress_bar.setFormat(
+            f"索引完成：共 {stats['total']} 个资源包，更新 {stats['updated']} 个，"
+            f"失败 {stats['failed']} 个，移除 {stats['removed']} 个"
+        )
+        self.refresh_types()
+        self.update_stats()
+        self.run_search()
+
+    def on_build_error(self, error_message):
+        """构建出错"""
+        self.reset_build_state()
+        if self.close_after_build:
+            self.close_pending()
+            return
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("%p%")
+        QMessageBox.critical(self, "错误", error_message)
+
+    def close_pending(self):
+        """构建停止后关闭窗口（工作线程发出信号后立即结束，等待时间很短）"""
+        self.close_after_build = False
+        self.worker.wait()
+        self.close()
+
+    def reset_build_state(self):
+        """恢复按钮状态"""
+        self.build_btn.setEnabled(bool(self.root_dir) or self.bundle_paths is not None)
+        self.select_dir_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+
+    def refresh_types(self):
+        """刷新类型筛选下拉框"""
+        current = self.type_combo.currentData()
+        self.type_combo.blockSignals(True)
+        self.type_combo.clear()
+        self.type_combo.addItem("全部类型", None)
+        for type_name in self.catalog.types():
+            self.type_combo.addItem(type_name, type_name)
+        index = self.type_combo.findData(current)
+        self.type_combo.setCurrentIndex(max(0, index))
+        self.type_combo.blockSignals(False)
+
+    def update_stats(self):
+        """更新统计信息"""
+        stats = self.catalog.stats()
+        self.stats_label.setText(f"已索引资源包: {stats['bundles']} 个，对象: {stats['objects']} 个，"
+                                 f"全文索引: {stats['texts']} 个")
+
+    def on_mode_changed(self, _):
+        """切换搜索模式"""
+        by_text = self.mode_combo.currentData() == SEARCH_BY_TEXT
+        self.type_combo.setVisible(not by_text)
+        self.result_table.setHorizontalHeaderLabels(TEXT_HEADERS if by_text else NAME_HEADERS)
+        self.search_input.setPlaceholderText("搜索台词、配置键或骨骼名称..." if by_text
+                                             else "搜索对象名称或容器路径...")
+        self.run_search()
+
+    def run_search(self):
+        """执行搜索并显示结果"""
+        if self.mode_combo.currentData() == SEARCH_BY_TEXT:
+            self.run_text_search()
+            return
+
+        try:
+            entries = self.catalog.search(self.search_input.text().strip(), self.type_combo.currentData())
+        except Exception as e:
+            self.logger.error(f"搜索资源目录时出错: {str(e)}")
+            return
+
+        self.result_table.setSortingEnabled(False)
+        self.result_table.setRowCount(len(entries))
+        for row, entry in enumerate(entries):
+            name_item = QTableWidgetItem(entry.name)
+            name_item.setData(Qt.ItemDataRole.UserRole, (entry.bundle_path, entry.path_id))
+            self.result_table.setItem(row, 0, name_item)
+            self.result_table.setItem(row, 1, QTableWidgetItem(entry.type))
+            path_id_item = QTableWidgetItem()
+            path_id_item.setData(Qt.ItemDataRole.DisplayRole, entry.path_id)
+            self.result_table.setItem(row, 2, path_id_item)
+            self.result_table.setItem(row, 3, QTableWidgetItem(entry.container))
+            bundle_item = QTableWidgetItem(os.path.basename(entry.bundle_path))
+            bundle_item.setToolTip(entry.bundle_path)
+            self.result_table.setItem(row, 4, bundle_item)
+            size_item = QTableWidgetItem()
+            size_item.setData(Qt.ItemDataRole.DisplayRole, entry.byte_size)
+            self.result_table.setItem(row, 5, size_item)
+        self.result_table.setSortingEnabled(True)
+
+    def run_text_search(self):
+        """执行全文搜索并显示匹配片段"""
+        try:
+            matches = self.catalog.search_text(self.search_input.text())
+        except Exception as e:
+            self.logger.error(f"全文搜索时出错: {str(e)}")
+            return
+
+        self.result_table.setSortingEnabled(False)
+        self.result_table.setRowCount(len(matches))
+        for row, match in enumerate(matches):
+            name_item = QTableWidgetItem(match.name)
+            name_item.setData(Qt.ItemDataRole.UserRole, (match.bundle_path, match.path_id))
+            self.result_table.setItem(row, 0, name_item)
+            self.result_table.setItem(row, 1, QTableWidgetItem(match.type))
+            path_id_item = QTableWidgetItem()
+            path_id_item.setData(Qt.ItemDataRole.DisplayRole, match.path_id)
+            self.result_table.setItem(row, 2, path_id_item)
+            snippet = match.snippet.replace("\n", " ")
+            snippet_item = QTableWidgetItem(snippet)
+            snippet_item.setToolTip(snippet)
+            self.result_table.setItem(row, 3, snippet_item)
+            bundle_item = QTableWidgetItem(os.path.basename(match.bundle_path))
+            bundle_item.setToolTip(match.bundle_path)
+            self.result_table.setItem(row, 4, bundle_item)
+            self.result_table.setItem(row, 5, QTableWidgetItem())
+        self.result_table.setSortingEnabled(True)
+
+    def on_result_double_clicked(self, item):
+        """在主窗口中打开对象所在的资源包"""
+        bundle_path, path_id = self.result_table.item(item.row(), 0).data(Qt.ItemDataRole.UserRole)
+        if not os.path.exists(bundle_path):
+            QMessageBox.warning(self, "警告", f"资源包不存在，请重新构建索引：\n{bundle_path}")
+            return
+        if self.main_window is not None and hasattr(self.main_window, "open_bundle"):
+            self.main_window.open_bundle(bundle_path, path_id)
+
+    def closeEvent(self, event):
+        """窗口关闭事件处理"""
+        # 不在界面线程中等待正在解析的资源包，停止后由 on_build_finished / on_build_error 关闭窗口
+        if self.worker and self.worker.isRunning():
+            self.stop_build()
+            self.close_after_build = True
+            self.progress_bar.setFormat("正在停止索引，停止后关闭窗口...")
+            event.ignore()
+            return
+        self.catalog.close()
+        event.accept()
@@ -3,13 +3,14 @@
 """
 import os
 import logging
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QMutex
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QMutex
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QFileDialog, QTableWidget, QTableWidgetItem,
                              QProgressBar, QMessageBox, QHeaderView)
 
 from src.core.asset_extractor import AssetExtractor
 from src.worker.BundleValidateWorker import BundleValidateWorker
+from src.ui.themes.theme_service import get_theme_service
 
 
 class DecryptThread(QThread):
@@ -197,10 +198,8 @@ class BatchDecryptDialog(QDialog):
         self.last_theme_is_dark = self.is_dark_mode()
         self.update_theme()
         
-        # 创建定时器来检查系统主题变化
-        self.theme_check_timer = QTimer(self)
-        self.theme_check_timer.timeout.connect(self.check_theme_change)
-        self.theme_check_timer.start(10)  # 每秒检查一次
+        # 主题变化由主题服务通知
+        get_theme_service().theme_changed.connect(self.on_theme_changed)
 
     def setup_ui(self):
         """设置用户界面"""
@@ -291,17 +290,14 @@ class BatchDecryptDialog(QDialog):
             self.input_dir = dir_path
             self.path_label.setText(dir_path)
             self.ab_files = []
-            self.all_files = []
+            self.all_files = [dir_path]
+            self.file_table.setRowCount(0)
+            self.file_status = {}
 
-            # 查找所有.ab文件
-            for root, _, files in os.walk(dir_path):
-                for file in files:
-                    self.all_files.append(os.path.join(root, file))
-
-            # 创建并启动验证线程
+            # 创建并启动验证线程（目录枚举在工作线程中进行）
             self.validate_worker = BundleValidateWorker(self.all_files)
-            # self.validate_worker.progress.connect(self.progress_bar.)
-
+            self.validate_worker.progress.connect(self.update_progress)
+            self.validate_worker.batch_validated.connect(self.on_batch_validated)
             self.validate_worker.validated.connect(self.on_validate_complete)
             # self.validate_worker.error.connect(self.handle_error)
             self.validate_worker.start()
@@ -315,11 +311,22 @@ class BatchDecryptDialog(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "错误", f"导入文件时出错: {str(e)}")
 
+    def on_batch_validated(self, valid_files):
+        """分批追加已验证的文件"""
+        try:
+            start = len(self.ab_files)
+            self.ab_files.extend(valid_files)
+            self.append_file_rows(start)
+        except Exception as e:
+            logging.error(f"追加验证结果时出错: {str(e)}")
+
     def on_validate_complete(self, valid_files):
         """验证完成处理"""
         try:
-            self.ab_files = valid_files
-            self.update_file_list()
+            # 验证结果已通过 batch_validated 分批追加到列表中
+            if len(self.ab_files) != len(valid_files):
+                self.ab_files = valid_files
+                self.update_file_list()
             self.export_btn.setEnabled(len(self.ab_files) > 0)
         except Exception as e:
             logging.error(f"处理验证完成时出错: {str(e)}")
@@ -329,7 +336,12 @@ class BatchDecryptDialog(QDialog):
         """更新文件列表"""
         self.file_table.setRowCount(0)
         self.file_status = {}  # 重置文件状态
-        for i, file_path in enumerate(self.ab_files):
+        self.append_file_rows(0)
+
+    def append_file_rows(self, start: int):
+        """将 self.ab_files 中从 start 开始的文件追加到表格"""
+        for i in range(start, len(self.ab_files)):
+            file_path = self.ab_files[i]
             row = self.file_table.rowCount()
             self.file_table.insertRow(row)
 
@@ -675,13 +687,15 @@ class BatchDecryptDialog(QDialog):
             QMessageBox.critical(self, "错误", f"应用浅色主题时出错: {str(e)}")
 
     def is_dark_mode(self):
-        """检测系统是否处于深色模式"""
-        palette = self.parent.palette()
-        return palette.window().color().lightness() < 128
+        """检测当前是否使用深色主题（跟随主窗口）"""
+        return get_theme_service().is_dark
 
     def check_theme_change(self):
-        """检查系统主题是否发生变化"""
-        current_is_dark = self.is_dark_mode()
-        if current_is_dark != self.last_theme_is_dark:
-            self.last_theme_is_dark = current_is_dark
+        """检查主题是否发生变化"""
+        self.on_theme_changed(self.is_dark_mode())
+
+    def on_theme_changed(self, is_dark):
+        """主题服务通知主题变化"""
+        if is_dark != self.last_theme_is_dark:
+            self.last_theme_is_dark = is_dark
             self.update_theme()
\ No newline at end of file
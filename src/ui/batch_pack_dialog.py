@@ -3,24 +3,28 @@
 """
 import os
 import logging
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QFileDialog, QListWidget, QListWidgetItem,
-                             QProgressBar, QMessageBox)
+                             QProgressBar, QMessageBox, QCheckBox)
 
 from src.core.asset_batch_replacer import AssetBatchReplacer
+from src.core.replace_watcher import ReplaceDirWatcher
+from src.ui.themes.theme_service import get_theme_service
 
 class BatchPackWorker(QThread):
     """批量打包工作线程"""
     progress = pyqtSignal(str)
+    bundle_progress = pyqtSignal(int, int, str)  # 已完成数、总数、资源包名称
     finished = pyqtSignal()
     error = pyqtSignal(str)
 
-    def __init__(self, source_dir: str, replace_dir: str, target_dir: str):
+    def __init__(self, source_dir: str, replace_dir: str, target_dir: str, incremental: bool = True):
         super().__init__()
         self.source_dir = source_dir
         self.replace_dir = replace_dir
         self.target_dir = target_dir
+        self.incremental = incremental
         self.replacer = AssetBatchReplacer()
 
     def run(self):
@@ -30,7 +34,9 @@ class BatchPackWorker(QThread):
             success = self.replacer.replace_spine_files(
                 self.source_dir,
                 self.replace_dir,
-                self.target_dir
+                self.target_dir,
+                progress_callback=self.on_bundle_done,
+                incremental=self.incremental
             )
             if success:
                 self.progress.emit("批量打包完成！")
@@ -40,6 +46,51 @@ class BatchPackWorker(QThread):
         except Exception as e:
             self.error.emit(f"批量打包出错: {str(e)}")
 
+    def on_bundle_done(self, done: int, total: int, result: dict):
+        """单个资源包处理完成（在工作线程中回调）"""
+        name = os.path.basename(result["path"])
+        if not result["ok"]:
+            self.progress.emit(f"{name} 处理失败: {result['error']}")
+        self.bundle_progress.emit(done, total, name)
+
+class BatchPackWatchWorker(BatchPackWorker):
+    """监视模式工作线程：先完整打包一次，之后替换目录有变化时增量重新打包"""
+    rebuilt = pyqtSignal(int)  # 每轮重新打包完成，参数为变化的文件数
+
+    def __init__(self, source_dir: str, replace_dir: str, target_dir: str):
+        super().__init__(source_dir, replace_dir, target_dir, incremental=True)
+        self.watcher = ReplaceDirWatcher(replace_dir)
+        self.is_running = True
+
+    def rebuild(self, changed_files=None):
+        """增量重新打包，只有输入变化的资源包会被重新构建"""
+        success = self.replacer.replace_spine_files(
+            self.source_dir,
+            self.replace_dir,
+            self.target_dir,
+            progress_callback=self.on_bundle_done,
+            incremental=True
+        )
+        if not success:
+            self.progress.emit("部分资源包打包失败，请查看日志")
+        self.rebuilt.emit(len(changed_files or ()))
+
+    def run(self):
+        """执行监视"""
+        try:
+            self.progress.emit("监视模式：正在打包...")
+            self.rebuild()
+            self.progress.emit("监视模式：等待替换文件变化...")
+            self.watcher.watch(self.rebuild, lambda: not self.is_running)
+            self.finished.emit()
+        except Exception as e:
+            self.error.emit(f"监视模式出错: {str(e)}")
+
+    def stop(self):
+        """停止监视，当前正在进行的打包会先完成"""
+        self.is_running = False
+
+
 class BatchPackDialog(QDialog):
     """批量打包MOD窗口"""
     
@@ -54,6 +105,8 @@ class BatchPackDialog(QDialog):
         # 存储选择的目录
         self.source_mod_dir = None
         self.replace_file_dir = None
+        # 关闭窗口时监视模式正在打包，停止后再关闭
+        self.close_after_watch = False
         
         self.setup_ui()
         # 储存的源文件列表
@@ -72,21 +125,21 @@ class BatchPackDialog(QDialog):
         self.last_theme_is_dark = self.is_dark_mode()
         self.update_theme()
         
-        # 创建定时器来检查系统主题变化
-        self.theme_check_timer = QTimer(self)
-        self.theme_check_timer.timeout.connect(self.check_theme_change)
-        self.theme_check_timer.start(10)  # 每秒检查一次
+        # 主题变化由主题服务通知
+        get_theme_service().theme_changed.connect(self.on_theme_changed)
         
     def is_dark_mode(self):
-        """检测系统是否处于深色模式"""
-        palette = self.parent().palette()
-        return palette.window().color().lightness() < 128
+        """检测当前是否使用深色主题（跟随主窗口）"""
+        return get_theme_service().is_dark
         
     def check_theme_change(self):
-        """检查系统主题是否发生变化"""
-        current_is_dark = self.is_dark_mode()
-        if current_is_dark != self.last_theme_is_dark:
-            self.last_theme_is_dark = current_is_dark
+        """检查主题是否发生变化"""
+        self.on_theme_changed(self.is_dark_mode())
+
+    def on_theme_changed(self, is_dark):
+        """主题服务通知主题变化"""
+        if is_dark != self.last_theme_is_dark:
+            self.last_theme_is_dark = is_dark
             self.update_theme()
             
     def update_theme(self):
@@ -523,6 +576,12 @@ class BatchPackDialog(QDialog):
         # 底部按钮区域
         bottom_layout = QHBoxLayout()
         bottom_layout.setSpacing(10)
+
+        # 增量打包选项
+        self.incremental_check = QCheckBox("仅重新打包有变化的资源包")
+        self.incremental_check.setChecked(True)
+        self.incremental_check.setToolTip("原始资源包和替换文件都未变化且输出文件存在时跳过")
+        bottom_layout.addWidget(self.incremental_check)
         
         # 一键打包按钮
         self.pack_btn = QPushButton("一键打包")
@@ -545,6 +604,29 @@ class BatchPackDialog(QDialog):
         self.pack_btn.clicked.connect(self.start_batch_pack)
         bottom_layout.addWidget(self.pack_btn)
         
+        # 监视模式按钮
+        self.watch_btn = QPushButton("监视模式")
+        self.watch_btn.setCheckable(True)
+        self.watch_btn.setToolTip("替换目录中的文件保存后自动重新打包受影响的资源包")
+        self.watch_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #17a2b8;
+                color: white;
+                border: none;
+                padding: 8px 15px;
+                border-radius: 4px;
+                min-width: 150px;
+            }
+            QPushButton:hover {
+                background-color: #138496;
+            }
+            QPushButton:checked {
+                background-color: #117a8b;
+            }
+        """)
+        self.watch_btn.clicked.connect(self.toggle_watch)
+        bottom_layout.addWidget(self.watch_btn)
+
         # 取消按钮
         self.cancel_btn = QPushButton("取消")
         self.cancel_btn.setStyleSheet("""
@@ -653,28 +735,110 @@ class BatchPackDialog(QDialog):
         self.worker = BatchPackWorker(
             self.source_mod_dir,
             self.replace_file_dir,
-            output_dir
+            output_dir,
+            incremental=self.incremental_check.isChecked()
         )
         self.worker.progress.connect(self.update_progress)
+        self.worker.bundle_progress.connect(self.update_bundle_progress)
         self.worker.finished.connect(self.on_pack_finished)
         self.worker.error.connect(self.on_pack_error)
         
         # 禁用按钮
         self.pack_btn.setEnabled(False)
+        self.watch_btn.setEnabled(False)
         self.cancel_btn.setEnabled(False)
         self.select_source_btn.setEnabled(False)
         self.select_replace_btn.setEnabled(False)
         
-        # 更新进度条
-        self.progress_bar.setValue(50)
+        # 更新进度条，预检完成后按资源包数量更新
+        self.progress_bar.setValue(0)
         
         # 启动线程
         self.worker.start()
         
+    def toggle_watch(self, checked):
+        """开启或关闭监视模式"""
+        if not checked:
+            if hasattr(self, 'watch_worker') and self.watch_worker.isRunning():
+                self.watch_worker.stop()
+                self.watch_btn.setEnabled(False)
+                self.watch_btn.setText("正在停止...")
+            return
+
+        if not self.source_mod_dir or not self.replace_file_dir:
+            QMessageBox.warning(self, "警告", "请先选择源文件目录和替换文件目录！")
+            self.watch_btn.setChecked(False)
+            return
+
+        output_dir = QFileDialog.getExistingDirectory(
+            self,
+            "选择输出目录",
+            "",
+            QFileDialog.Option.ShowDirsOnly
+        )
+        if not output_dir:
+            self.watch_btn.setChecked(False)
+            return
+
+        self.watch_worker = BatchPackWatchWorker(
+            self.source_mod_dir,
+            self.replace_file_dir,
+            output_dir
+        )
+        self.watch_worker.progress.connect(self.update_progress)
+        self.watch_worker.bundle_progress.connect(self.update_bundle_progress)
+        self.watch_worker.rebuilt.connect(self.on_watch_rebuilt)
+        self.watch_worker.finished.connect(self.on_watch_stopped)
+        self.watch_worker.error.connect(self.on_watch_error)
+
+        # 监视期间禁止修改目录和手动打包
+        self.pack_btn.setEnabled(False)
+        self.select_source_btn.setEnabled(False)
+        self.select_replace_btn.setEnabled(False)
+        self.watch_btn.setText("停止监视")
+        self.progress_bar.setValue(0)
+
+        self.watch_worker.start()
+
+    def on_watch_rebuilt(self, changed_count):
+        """监视模式完成一轮打包"""
+        if changed_count:
+            self.progress_bar.setFormat(f"{changed_count} 个文件变化，已重新打包，等待下一次变化 %p%")
+        else:
+            self.progress_bar.setFormat("打包完成，等待替换文件变化 %p%")
+
+    def on_watch_stopped(self):
+        """监视模式已停止"""
+        self.watch_btn.setChecked(False)
+        self.watch_btn.setEnabled(True)
+        self.watch_btn.setText("监视模式")
+        self.pack_btn.setEnabled(True)
+        self.select_source_btn.setEnabled(True)
+        self.select_replace_btn.setEnabled(True)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("%p%")
+        if self.close_after_watch:
+            # 工作线程发出信号后立即结束，等待时间很短
+            self.close_after_watch = False
+            self.watch_worker.wait()
+            self.close()
+
+    def on_watch_error(self, error_message):
+        """监视模式出错"""
+        closing = self.close_after_watch
+        self.on_watch_stopped()
+        if not closing:
+            QMessageBox.critical(self, "错误", error_message)
+
     def update_progress(self, message):
         """更新进度"""
         self.progress_bar.setFormat(f"{message} %p%")
         
+    def update_bundle_progress(self, done, total, name):
+        """按已完成的资源包数量更新进度"""
+        self.progress_bar.setValue(int(done / total * 100) if total else 100)
+        self.progress_bar.setFormat(f"已处理 {done}/{total}: {name} %p%")
+
     def on_pack_finished(self):
         """打包完成"""
         self.progress_bar.setValue(100)
@@ -682,6 +846,7 @@ class BatchPackDialog(QDialog):
         
         # 恢复按钮状态
         self.pack_btn.setEnabled(True)
+        self.watch_btn.setEnabled(True)
         self.cancel_btn.setEnabled(True)
         self.select_source_btn.setEnabled(True)
         self.select_replace_btn.setEnabled(True)
@@ -698,12 +863,23 @@ class BatchPackDialog(QDialog):
         
         # 恢复按钮状态
         self.pack_btn.setEnabled(True)
+        self.watch_btn.setEnabled(True)
         self.cancel_btn.setEnabled(True)
         self.select_source_btn.setEnabled(True)
         self.select_replace_btn.setEnabled(True)
 
     def closeEvent(self, event):
         """窗口关闭事件处理"""
+        # 停止监视模式，不在界面线程中等待当前这一轮打包结束，停止后由 on_watch_stopped 关闭窗口
+        if hasattr(self, 'watch_worker') and self.watch_worker.isRunning():
+            self.watch_worker.stop()
+            self.close_after_watch = True
+            self.watch_btn.setEnabled(False)
+            self.watch_btn.setText("正在停止...")
+            self.progress_bar.setFormat("正在停止监视，当前这一轮打包完成后关闭窗口 %p%")
+            event.ignore()
+            return
+
         if hasattr(self, 'worker') and self.worker.isRunning():
             reply = QMessageBox.question(
                 self,
@@ -3,9 +3,11 @@
 """
 import os
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel)
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap
 
+from .themes.theme_service import get_theme_service
+
 class DonateDialog(QDialog):
     """捐赠窗口类"""
     
@@ -30,21 +32,21 @@ class DonateDialog(QDialog):
         self.last_theme_is_dark = self.is_dark_mode()
         self.update_theme()
         
-        # 创建定时器来检查系统主题变化
-        self.theme_check_timer = QTimer(self)
-        self.theme_check_timer.timeout.connect(self.check_theme_change)
-        self.theme_check_timer.start(100)  # 每秒检查一次
+        # 主题变化由主题服务通知
+        get_theme_service().theme_changed.connect(self.on_theme_changed)
         
     def is_dark_mode(self):
-        """检测系统是否处于深色模式"""
-        palette = self.parent().palette()
-        return palette.window().color().lightness() < 128
+        """检测当前是否使用深色主题（跟随主窗口）"""
+        return get_theme_service().is_dark
         
     def check_theme_change(self):
-        """检查系统主题是否发生变化"""
-        current_is_dark = self.is_dark_mode()
-        if current_is_dark != self.last_theme_is_dark:
-            self.last_theme_is_dark = current_is_dark
+        """检查主题是否发生变化"""
+        self.on_theme_changed(self.is_dark_mode())
+
+    def on_theme_changed(self, is_dark):
+        """主题服务通知主题变化"""
+        if is_dark != self.last_theme_is_dark:
+            self.last_theme_is_dark = is_dark
             self.update_theme()
             
     def update_theme(self):
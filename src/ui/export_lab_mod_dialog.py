@@ -7,11 +7,12 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                              QLineEdit, QPushButton, QTextEdit, QFileDialog,
                              QScrollArea, QWidget, QGridLayout, QMessageBox,
                              QComboBox, QCheckBox, QApplication)
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap, QDragEnterEvent, QDropEvent, QFont, QScreen
 
 from src.worker.export_lab_worker import ExportLabWorker
 from src.config.config_manager import ConfigManager
+from src.ui.themes.theme_service import get_theme_service
 
 
 class ExportLabModDialog(QDialog):
@@ -59,10 +60,8 @@ class ExportLabModDialog(QDialog):
         self.last_theme_is_dark = self.is_dark_mode()
         self.update_theme()
 
-        # 创建定时器来检查系统主题变化
-        self.theme_check_timer = QTimer(self)
-        self.theme_check_timer.timeout.connect(self.check_theme_change)
-        self.theme_check_timer.start(10)  # 每秒检查一次
+        # 主题变化由主题服务通知
+        get_theme_service().theme_changed.connect(self.on_theme_changed)
 
         # 存储预览图路径
         self.preview_images = []
@@ -77,24 +76,18 @@ class ExportLabModDialog(QDialog):
         self.resizeEvent = self.on_resize_event
 
     def is_dark_mode(self):
-        """检测系统是否处于深色模式"""
-        try:
-            # print(self.parent().theme)
-            # return self.parent().theme
-            palette = self.parent().palette()
-            # print("当前调色板:", palette.window().color().lightness())
-            return palette.window().color().lightness() < 128
-        except Exception as e:
-            self.logger.error(f"检测主题模式时出错: {str(e)}")
-            return False
+        """检测当前是否使用深色主题（跟随主窗口）"""
+        return get_theme_service().is_dark
 
     def check_theme_change(self):
-        # print("检查主题变化")
-        """检查系统主题是否发生变化"""
+        """检查主题是否发生变化"""
+        self.on_theme_changed(self.is_dark_mode())
+
+    def on_theme_changed(self, is_dark):
+        """主题服务通知主题变化"""
         try:
-            current_is_dark = self.is_dark_mode()
-            if current_is_dark != self.last_theme_is_dark:
-                self.last_theme_is_dark = current_is_dark
+            if is_dark != self.last_theme_is_dark:
+                self.last_theme_is_dark = is_dark
                 self.update_theme()
         except Exception as e:
             self.logger.error(f"检查主题变化时出错: {str(e)}")
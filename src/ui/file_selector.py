@@ -3,25 +3,33 @@
 """
 import os
 import logging
-import shutil
 import json
 from PyQt6.QtWidgets import ( QVBoxLayout, QHBoxLayout,
                              QLabel, QPushButton, QSplitter,
                              QFileDialog, QMessageBox, QFrame, QMenu, QGroupBox, QButtonGroup, QRadioButton,
-                             QSlider, QScrollArea, QWidget, QTableWidget, QTableWidgetItem, QHeaderView,
-                             QLineEdit, QTextEdit, QApplication)
+                             QSlider, QScrollArea, QWidget, QTableView, QHeaderView,
+                             QLineEdit, QTextEdit, QApplication, QAbstractItemView, QTreeView,
+                             QProgressBar, QCheckBox)
 from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QUrl, QTimer, QMimeData, QByteArray
-from PyQt6.QtGui import QPixmap, QColor, QBrush, QIcon, QDrag, QPainter, QFont
+from PyQt6.QtGui import QPixmap, QIcon, QDrag, QPainter, QFont
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
 from .export_lab_mod_dialog import ExportLabModDialog
 from .widgets.json_highlighter import JsonHighlighter
-from .widgets.file_size_item import FileSizeItem
+from .widgets.file_table_model import (FileTableModel, FileFilterProxyModel, FILE_INFO_ROLE,
+                                       SORT_ROLE, COLUMN_PATH_ID)
 from .themes.file_selector_theme_manager import ThemeManager
+from .themes.theme_service import get_theme_service
 from .preview.preview_manager import PreviewManager
 from ..worker.export_image_worker import ExportImageWorker
+from ..worker.extract_objects_worker import ExtractObjectsWorker
 from ..config.config_manager import ConfigManager
 
-from ..core.asset_extractor import AssetExtractor
+from ..utils import scratch_pack
+from ..utils.archive_writer import is_archive_path
+from ..utils.temp_store import TempQuotaExceeded
+
+# 搜索框停止输入多久后再筛选（毫秒）
+SEARCH_DEBOUNCE_MS = 200
 
 
 class FileSelectorDialog(QWidget):
@@ -61,6 +69,8 @@ class FileSelectorDialog(QWidget):
         self.temp_files = []  # 存储临时文件路径
         self.temp_path = temp_path  # 临时文件路径
         self.selected_files = []
+        self.extract_worker = None  # 提取资源的工作线程
+        self.close_after_extract = False  # 关闭窗口时正在提取，取消完成后再关闭
         self.theme_change = pyqtSignal()
         self.main_window = parent
         self.theme = False
@@ -98,26 +108,25 @@ class FileSelectorDialog(QWidget):
         # 加载文件列表
         self.load_files()
 
-        # 初始化主题
+        # 初始化主题，之后由主题服务通知主题变化
         self.last_theme_is_dark = self.theme_manager.is_dark_mode(self)
         self.update_theme()
-
-        # 创建定时器来检查系统主题变化
-        self.theme_check_timer = QTimer(self)
-        self.theme_check_timer.timeout.connect(self.check_theme_change)
-        self.theme_check_timer.start(10)  # 每秒检查一次
-        self.json_highlighter = JsonHighlighter(self.preview_text.document())
+        get_theme_service().theme_changed.connect(self.on_theme_changed)
+        self.json_highlighter = JsonHighlighter(self.preview_text)
 
     def is_dark_mode(self):
         """检测系统是否处于深色模式"""
         return self.theme_manager.is_dark_mode(self)
 
     def check_theme_change(self):
-        """检查系统主题是否发生变化"""
+        """检查主题是否发生变化"""
+        self.on_theme_changed(self.theme_manager.is_dark_mode(self))
+
+    def on_theme_changed(self, is_dark: bool):
+        """主题服务通知主题变化"""
         try:
-            current_is_dark = self.theme_manager.is_dark_mode(self)
-            if current_is_dark != self.last_theme_is_dark:
-                self.last_theme_is_dark = current_is_dark
+            if is_dark != self.last_theme_is_dark:
+                self.last_theme_is_dark = is_dark
                 self.update_theme()
         except Exception as e:
             self.logger.error(f"检查主题变化时出错: {str(e)}")
@@ -126,11 +135,9 @@ class FileSelectorDialog(QWidget):
         """更新主题样式"""
         try:
             is_dark = self.theme_manager.is_dark_mode(self)
-            if is_dark:
-                self.theme_manager.apply_dark_theme(self)
-            else:
-                self.theme_manager.apply_light_theme(self)
-            
+            if not self.theme_manager.apply_theme(self, is_dark):
+                return
+
             # 重新加载文件列表以更新表格项的颜色
             if hasattr(self, 'file_table') and self.file_table is not None:
                 self.update_file_list()
@@ -201,6 +208,11 @@ class FileSelectorDialog(QWidget):
                 border: 1px solid #4a86e8;
             }
         """)
+        # 搜索防抖，停止输入后再筛选
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.apply_search_filter)
         self.search_input.textChanged.connect(self.on_search_text_changed)
         search_layout.addWidget(search_label)
         search_layout.addWidget(self.search_input)
@@ -227,10 +239,12 @@ class FileSelectorDialog(QWidget):
         # self.title_layout.addWidget(self.tips_label)
         list_layout.addLayout(self.title_layout)
 
-        # 创建表格控件替代列表控件
-        self.file_table = QTableWidget()
-        self.file_table.setColumnCount(4)
-        self.file_table.setHorizontalHeaderLabels(["名称", "类型", "路径ID", "大小"])
+        # 文件列表使用模型/视图结构，筛选和排序由代理模型完成
+        self.file_model = FileTableModel(self.files, self.replace_files, self.format_file_size, self)
+        self.file_proxy = FileFilterProxyModel(self)
+        self.file_proxy.setSourceModel(self.file_model)
+        self.file_table = QTableView()
+        self.file_table.setModel(self.file_proxy)
 
         # 设置表格样式
         # self.file_table.setStyleSheet("""
@@ -304,8 +318,8 @@ class FileSelectorDialog(QWidget):
         # """)
 
         # 设置表格属性
-        self.file_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.file_table.setSelectionMode(QTableWidget.SelectionMode.ExtendedSelection)
+        self.file_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.file_table.setSelectionMode(QTableView.SelectionMode.ExtendedSelection)
         self.file_table.setAlternatingRowColors(True)
         self.file_table.verticalHeader().setVisible(False)
         self.file_table.setShowGrid(False)
@@ -324,14 +338,12 @@ class FileSelectorDialog(QWidget):
         self.file_table.setColumnWidth(2, 80)  # 路径ID列
         self.file_table.setColumnWidth(3, 80)  # 大小列
 
-        # 启用排序
+        # 启用排序，路径ID和大小按数值排序
         self.file_table.setSortingEnabled(True)
-        # 连接排序信号
-        self.file_table.horizontalHeader().sortIndicatorChanged.connect(self.on_sort_changed)
 
         # 连接信号
-        self.file_table.itemSelectionChanged.connect(self.on_selection_changed)
-        self.file_table.itemClicked.connect(self.on_file_clicked)
+        self.file_table.selectionModel().selectionChanged.connect(lambda *_: self.on_selection_changed())
+        self.file_table.clicked.connect(self.on_file_clicked)
         self.file_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.file_table.customContextMenuRequested.connect(self.show_context_menu)
 
@@ -464,6 +476,13 @@ class FileSelectorDialog(QWidget):
 
         preview_container_layout.addWidget(self.preview_text)
 
+        # JSON树形预览，子节点在展开时才加载
+        self.json_tree = QTreeView()
+        self.json_tree.setUniformRowHeights(True)
+        self.json_tree.setAlternatingRowColors(True)
+        self.json_tree.setVisible(False)
+        preview_container_layout.addWidget(self.json_tree)
+
         # 编辑和保存按钮容器
         self.edit_buttons_container = QWidget()
         edit_buttons_layout = QHBoxLayout(self.edit_buttons_container)
@@ -479,6 +498,12 @@ class FileSelectorDialog(QWidget):
         self.save_btn.clicked.connect(self.save_json_content)
         self.save_btn.setVisible(False)
 
+        # 添加树形/文本视图切换按钮
+        self.view_toggle_btn = QPushButton("树形视图")
+        self.view_toggle_btn.clicked.connect(lambda: self.preview_manager.toggle_json_view(self))
+        self.view_toggle_btn.setVisible(False)
+
+        edit_buttons_layout.addWidget(self.view_toggle_btn)
         edit_buttons_layout.addWidget(self.edit_btn)
         edit_buttons_layout.addWidget(self.save_btn)
         edit_buttons_layout.addStretch()
@@ -687,7 +712,20 @@ class FileSelectorDialog(QWidget):
             }
         """)
 
+        # 提取进度（提取时显示）
+        self.extract_progress = QProgressBar()
+        self.extract_progress.setRange(0, 100)
+        self.extract_progress.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.extract_progress.setVisible(False)
+
+        # 提取为压缩包选项
+        self.archive_check = QCheckBox("提取为压缩包")
+        self.archive_check.setChecked(bool(self.config.get('extract_to_archive', False)))
+        self.archive_check.setToolTip("把选中的资源直接写入一个 ZIP / TAR 文件，已压缩的图片和音频不再重复压缩")
+
+        button_layout.addWidget(self.extract_progress, 1)
         button_layout.addStretch()
+        button_layout.addWidget(self.archive_check)
         button_layout.addWidget(self.export_ab_btn)
         button_layout.addWidget(self.export_lab_btn)
         button_layout.addWidget(self.confirm_btn)
@@ -725,23 +763,21 @@ class FileSelectorDialog(QWidget):
             json.loads(content)
 
             # 获取当前选中的文件
-            selected_items = self.file_table.selectedItems()
-            if not selected_items:
+            selected_files = self.selected_file_infos()
+            if not selected_files:
                 return
 
-            item = selected_items[0]
-            file_info = item.data(Qt.ItemDataRole.UserRole + 1)
+            file_info = selected_files[0]
             file_path = file_info[2]
-            # 写入文件
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # 写入临时目录，计入临时目录占用
+            scratch_pack.write_bytes(file_path, content.encode('utf-8'))
             # file_info = self.get_file_info(item)
             if not file_info:
                 return
 
             # 保存到替换文件列表
             self.replace_files[file_info] = file_path
-            self.update_file_list()
+            self.file_model.refresh_file(file_info)
             # 更新预览
             self.update_preview(file_info[0], file_info[1], file_path)
 
@@ -758,12 +794,21 @@ class FileSelectorDialog(QWidget):
 
         except json.JSONDecodeError:
             QMessageBox.warning(self, "错误", "无效的JSON格式")
+        except TempQuotaExceeded as e:
+            self.logger.warning(f"保存JSON内容失败: {str(e)}")
+            QMessageBox.warning(self, "警告", str(e))
         except Exception as e:
             self.logger.error(f"保存JSON内容时出错: {str(e)}")
             QMessageBox.critical(self, "错误", f"保存失败: {str(e)}")
 
     def update_preview(self, name, file_type, path):
-        """更新预览内容"""
+        """更新预览内容（扫描结果在打包文件中时先写出真实文件）"""
+        try:
+            path = scratch_pack.local_path(path)
+        except TempQuotaExceeded as e:
+            self.logger.warning(f"写出预览文件失败: {str(e)}")
+            QMessageBox.warning(self, "警告", str(e))
+            return
         self.preview_manager.update_preview(name, file_type, path, self)
 
     def load_files(self):
@@ -782,91 +827,30 @@ class FileSelectorDialog(QWidget):
             QMessageBox.critical(self, "错误", f"加载文件列表失败: {str(e)}")
 
     def update_file_list(self):
-        """更新文件列表"""
-        # 保存当前排序状态
-        header = self.file_table.horizontalHeader()
-        sort_column = header.sortIndicatorSection()
-        sort_order = header.sortIndicatorOrder()
-
-        self.file_table.setSortingEnabled(False)  # 暂时禁用排序
-        self.file_table.setRowCount(0)  # 清空表格
-        search_text = self.search_input.text().lower()  # 获取搜索文本并转换为小写
-
-        for file in self.files:
-            # 检查文件类型和搜索文本
-            if (self.current_type == "All" or file["type"] == self.current_type) and \
-                    (not search_text or search_text in file["name"].lower()):
-                row = self.file_table.rowCount()
-                self.file_table.insertRow(row)
-
-                # 设置各列的数据
-                name_item = QTableWidgetItem(file["name"].replace(f"_{file["path_id"]}", ""))
-                type_item = QTableWidgetItem(file["type"])
-                path_id_item = QTableWidgetItem(str(file["path_id"]))
-
-                # 大小列：使用自定义排序项
-                size_item = FileSizeItem(self.format_file_size(file["size"]), file["size"])
-
-                # 存储完整文件信息
-                file_info = (file["name"], file["type"], file["path"])
-                for item in [name_item, type_item, path_id_item, size_item]:
-                    item.setData(Qt.ItemDataRole.UserRole + 1, file_info)  # 存储文件信息
-
-                # 设置工具提示
-                tooltip = f"完整文件名: {file['name']}\n"
-                tooltip += f"类型: {file['type']}\n"
-                tooltip += f"路径ID: {file['path_id']}\n"
-                tooltip += f"大小: {self.format_file_size(file['size'])}\n"
-                tooltip += f"路径: {file['path']}"
-
-                name_item.setToolTip(tooltip)
-                type_item.setToolTip(tooltip)
-                type_item.setToolTip(tooltip)
-                size_item.setToolTip(tooltip)
-
-                # 添加到表格
-                self.file_table.setItem(row, 0, name_item)
-                self.file_table.setItem(row, 1, type_item)
-                self.file_table.setItem(row, 2, path_id_item)
-                self.file_table.setItem(row, 3, size_item)
-
-                # 检查文件是否被替换，如果是则设置颜色
-                if file_info in self.replace_files:
-                    for col in range(self.file_table.columnCount()):
-                        item = self.file_table.item(row, col)
-                        if item:
-                            if self.is_dark_mode():
-                                item.setBackground(QBrush(QColor("#1a3a1a")))  # 深色主题下的深绿色背景
-                                item.setForeground(QBrush(QColor("#4caf50")))  # 深色主题下的亮绿色文本
-                            else:
-                                item.setBackground(QBrush(QColor("#e8f5e9")))  # 浅色主题下的浅绿色背景
-                                item.setForeground(QBrush(QColor("#2e7d32")))
-                else:
-                    # 为普通文件设置默认颜色，避免在某些系统上出现白色背景
-                    for col in range(self.file_table.columnCount()):
-                        item = self.file_table.item(row, col)
-                        if item:
-                            if self.is_dark_mode():
-                                item.setBackground(QBrush(QColor("#1e1e1e")))  # 深色主题下的深色背景
-                                item.setForeground(QBrush(QColor("#ffffff")))  # 深色主题下的白色文本
-                            else:
-                                item.setBackground(QBrush(QColor("#ffffff")))  # 浅色主题下的白色背景
-                                item.setForeground(QBrush(QColor("#000000")))  # 浅色主题下的黑色文本
-
-        # 恢复排序状态
-        self.file_table.setSortingEnabled(True)
-        if sort_column >= 0:
-            header.setSortIndicator(sort_column, sort_order)
+        """刷新文件列表的筛选条件和配色，只重绘可见行"""
+        self.file_proxy.set_type_filter(self.current_type)
+        self.file_proxy.set_search_text(self.search_input.text())
+        self.file_model.set_dark_mode(self.is_dark_mode())
+
+    def selected_file_infos(self):
+        """
+        获取选中行的文件信息
+
+        Returns:
+            list: [(名称, 类型, 路径)]，按显示顺序排列
+        """
+        indexes = sorted(self.file_table.selectionModel().selectedRows(), key=lambda index: index.row())
+        return [index.data(FILE_INFO_ROLE) for index in indexes]
 
     def on_type_changed(self, button):
         """处理文件类型切换"""
         self.current_type = button.text()
         self.update_file_list()
 
-    def on_file_clicked(self, item):
+    def on_file_clicked(self, index):
         """处理文件点击事件"""
         try:
-            file_info = item.data(Qt.ItemDataRole.UserRole + 1)  # 从 UserRole + 1 获取文件信息
+            file_info = index.data(FILE_INFO_ROLE)
             if isinstance(file_info, tuple) and len(file_info) == 3:
                 name, file_type, path = file_info
                 # 检查是否有替换文件
@@ -887,19 +871,20 @@ class FileSelectorDialog(QWidget):
 
     def show_context_menu(self, position):
         """显示文件列表的右键菜单"""
-        item = self.file_table.itemAt(position)
-        if item:
+        index = self.file_table.indexAt(position)
+        if index.isValid():
+            # 获取文件信息
+            file_info = index.data(FILE_INFO_ROLE)
+
             menu = QMenu()
             # 添加替换文件选项
             replace_action = menu.addAction("替换此文件")
-            replace_action.triggered.connect(lambda: self.replace_file(item.data(Qt.ItemDataRole.UserRole + 1)))
+            replace_action.triggered.connect(lambda: self.replace_file(file_info))
 
             # 添加打开文件所在位置选项
             open_location_action = menu.addAction("打开文件所在位置")
-            open_location_action.triggered.connect(lambda: self.open_file_location(item.data(Qt.ItemDataRole.UserRole + 1)))
+            open_location_action.triggered.connect(lambda: self.open_file_location(file_info))
 
-            # 获取文件信息
-            file_info = item.data(Qt.ItemDataRole.UserRole + 1)
             if isinstance(file_info, tuple) and len(file_info) == 3:
                 name, file_type, path = file_info
                 # 如果是图片类型，添加导出直通图片选项
@@ -919,6 +904,7 @@ class FileSelectorDialog(QWidget):
             # 检查是否有替换文件
             if file_info in self.replace_files:
                 path = self.replace_files[file_info]
+            path = scratch_pack.local_path(path)
 
             if os.path.exists(path):
                 # 获取文件所在目录
@@ -931,12 +917,11 @@ class FileSelectorDialog(QWidget):
 
     def show_preview_context_menu(self, position):
         """显示预览区域的右键菜单"""
-        selected_items = self.file_table.selectedItems()
-        if selected_items:
+        selected_files = self.selected_file_infos()
+        if selected_files:
             menu = QMenu()
             replace_action = menu.addAction("替换此文件")
-            replace_action.triggered.connect(
-                lambda: self.replace_file(selected_items[0].data(Qt.ItemDataRole.UserRole + 1)))
+            replace_action.triggered.connect(lambda: self.replace_file(selected_files[0]))
             menu.exec(self.image_preview.mapToGlobal(position))
 
     def replace_file(self, file_info):
@@ -981,20 +966,7 @@ class FileSelectorDialog(QWidget):
 
 
             # 更新文件项的颜色
-            for row in range(self.file_table.rowCount()):
-                first_item = self.file_table.item(row, 0)
-                if first_item and first_item.data(Qt.ItemDataRole.UserRole + 1) == file_info:
-                    # 更新整行的颜色
-                    for col in range(self.file_table.columnCount()):
-                        item = self.file_table.item(row, col)
-                        if item:
-                            if self.is_dark_mode():
-                                item.setBackground(QBrush(QColor("#1a3a1a")))  # 深色主题下的深绿色背景
-                                item.setForeground(QBrush(QColor("#4caf50")))  # 深色主题下的亮绿色文本
-                            else:
-                                item.setBackground(QBrush(QColor("#e8f5e9")))  # 浅色主题下的浅绿色背景
-                                item.setForeground(QBrush(QColor("#2e7d32")))  # 浅色主题下的深绿色文本
-                    break
+            self.file_model.refresh_file(file_info)
 
             QMessageBox.information(self, "成功", f"文件 {name} 已标记为替换")
         except Exception as e:
@@ -1065,11 +1037,10 @@ class FileSelectorDialog(QWidget):
     def on_selection_changed(self):
         """当选择改变时"""
         try:
-            selected_items = self.file_table.selectedItems()
-            if selected_items:
-                # 获取选中行的第一个单元格
-                item = selected_items[0]
-                self.on_file_clicked(item)
+            indexes = self.file_table.selectionModel().selectedRows()
+            if indexes:
+                # 预览选中的第一行
+                self.on_file_clicked(indexes[0])
             # else:
             #     # 未选择时显示提示
             #     self.image_preview.setText("请选择要处理的文件\n\n"
@@ -1081,106 +1052,123 @@ class FileSelectorDialog(QWidget):
             self.image_preview.setText(f"选择出错: {str(e)}")
 
     def on_confirm(self):
-        """确认选择"""
+        """确认选择，在后台直接从资源包导出选中的对象"""
         try:
-            selected_items = self.file_table.selectedItems()
-            if not selected_items:
-                QMessageBox.warning(self, "警告", "请选择一个文件！")
+            if self.extract_worker is not None and self.extract_worker.isRunning():
                 return
 
-            # 获取选中的文件信息
-            self.selected_files = []
-            # 获取选中行的第一个单元格
-            for item in selected_items:
-                if item.column() == 0:  # 只处理第一列
-                    try:
-                        file_info = item.data(Qt.ItemDataRole.UserRole + 1)
-                        if isinstance(file_info, tuple) and len(file_info) == 3:
-                            name, file_type, path = file_info
-                            # 检查文件是否存在
-                            if os.path.exists(path):
-                                self.selected_files.append((name, file_type, path))
-                            else:
-                                self.logger.warning(f"文件不存在: {path}")
-                    except Exception as e:
-                        self.logger.error(f"获取文件信息时出错: {str(e)}")
-                        continue
-
-            if not self.selected_files:
-                QMessageBox.warning(self, "警告", "没有有效的文件被选中！")
+            path_ids = self.selected_path_ids()
+            if not path_ids:
+                QMessageBox.warning(self, "警告", "请选择一个文件！")
                 return
+            self.selected_files = self.selected_file_infos()
+            # 编辑或替换过的对象写入修改后的文件，不从资源包重新导出
+            replaced_files = {}
+            for path_id, file_info in zip(path_ids, self.selected_files):
+                if file_info in self.replace_files:
+                    name, file_type, path = file_info
+                    replaced_files[path_id] = (f"{file_type}/{os.path.basename(path)}", self.replace_files[file_info])
 
             # 选择保存目录（使用配置的默认目录）
             default_dir = self.config.get('ab_export_default_dir', '')
             if not default_dir:
                 default_dir = self.config.get('last_output_dir', '') or os.path.expanduser("~")
             
-            save_dir = QFileDialog.getExistingDirectory(
-                self,
-                "选择保存目录",
-                default_dir,
-                QFileDialog.Option.ShowDirsOnly
-            )
-            
-            if save_dir:
-                self.config.set('last_output_dir', save_dir)
-
-            if not save_dir:
-                return
-
-            # 创建保存目录
-            try:
-                # 获取AB文件名（不包含扩展名）
+            archive_path = None
+            save_dir = None
+            if self.archive_check.isChecked():
+                # 直接写入单个压缩包，不在磁盘上生成大量小文件
                 ab_name = os.path.splitext(os.path.basename(self.asset_path))[0]
+                archive_path, _ = QFileDialog.getSaveFileName(
+                    self,
+                    "选择压缩包保存位置",
+                    os.path.join(default_dir, f"{ab_name}.zip"),
+                    "ZIP压缩包 (*.zip);;TAR归档 (*.tar);;TAR.GZ归档 (*.tar.gz)"
+                )
+                if not archive_path:
+                    return
+                if not is_archive_path(archive_path):
+                    archive_path += ".zip"
+                self.config.set('last_output_dir', os.path.dirname(archive_path))
+            else:
+                save_dir = QFileDialog.getExistingDirectory(
+                    self,
+                    "选择保存目录",
+                    default_dir,
+                    QFileDialog.Option.ShowDirsOnly
+                )
 
-                # 创建AB文件目录
-                ab_dir = os.path.join(save_dir, ab_name)
-                os.makedirs(ab_dir, exist_ok=True)
-
-                # 按文件类型分组
-                type_groups = {}
-                for name, file_type, path in self.selected_files:
-                    if file_type not in type_groups:
-                        type_groups[file_type] = []
-                    type_groups[file_type].append((name, path))
-
-                # 为每种类型创建子目录并保存文件
-                for file_type, files in type_groups.items():
-                    # 创建类型子目录
-                    type_dir = os.path.join(ab_dir, file_type)
-                    os.makedirs(type_dir, exist_ok=True)
-
-                    # 保存文件
-                    for name, path in files:
-                        try:
-                            # 构建目标路径
-                            target_path = os.path.join(type_dir, f"{name}")
-                            # 截取path地文件名
-                            file_name = os.path.basename(path)
-                            # 截取文件后缀
-                            file_ext = os.path.splitext(file_name)[1]
-                            # 替换文件后缀
-                            target_path = os.path.join(type_dir, file_name)
-
-                            # 复制文件
-                            shutil.copy2(path, target_path)
-                            self.logger.info(f"已保存文件: {target_path}")
-                        except Exception as e:
-                            self.logger.error(f"保存文件失败 {name}: {str(e)}")
-                            continue
+                if save_dir:
+                    self.config.set('last_output_dir', save_dir)
 
-                # 显示成功消息
-                QMessageBox.information(self, "成功", "资源提取完成！")
+                if not save_dir:
+                    return
+            self.config.set('extract_to_archive', self.archive_check.isChecked())
 
-            except Exception as e:
-                self.logger.error(f"保存文件时出错: {str(e)}")
-                QMessageBox.critical(self, "错误", f"保存文件失败: {str(e)}")
+            # 按 资源包名/类型/文件名 写入保存目录或压缩包，不依赖扫描时的临时文件
+            self.extract_worker = ExtractObjectsWorker(self.asset_path, path_ids, save_dir, archive_path,
+                                                       replaced_files)
+            self.extract_worker.progress.connect(self.on_extract_progress)
+            self.extract_worker.finished.connect(self.on_extract_finished)
+            self.extract_worker.error.connect(self.on_extract_error)
+
+            self.confirm_btn.setEnabled(False)
+            self.extract_progress.setValue(0)
+            self.extract_progress.setFormat(f"正在提取 0/{len(path_ids)}")
+            self.extract_progress.setVisible(True)
+            self.extract_worker.start()
 
         except Exception as e:
             self.logger.error(f"确认选择时出错: {str(e)}")
             QMessageBox.critical(self, "错误", f"资源提取失败: {str(e)}")
             # 不关闭对话框，让用户可以看到错误信息
 
+    def selected_path_ids(self):
+        """
+        获取选中行的对象 path_id
+
+        Returns:
+            list: path_id 列表，按显示顺序排列
+        """
+        indexes = sorted(self.file_table.selectionModel().selectedRows(), key=lambda index: index.row())
+        return [index.siblingAtColumn(COLUMN_PATH_ID).data(SORT_ROLE) for index in indexes]
+
+    def on_extract_progress(self, done, total):
+        """更新提取进度"""
+        self.extract_progress.setValue(int(done / total * 100) if total else 100)
+        self.extract_progress.setFormat(f"正在提取 {done}/{total}")
+
+    def on_extract_finished(self, stats):
+        """提取完成"""
+        self.confirm_btn.setEnabled(True)
+        self.extract_progress.setVisible(False)
+        if self.close_after_extract:
+            # 工作线程发出信号后立即结束，等待时间很短
+            self.close_after_extract = False
+            self.extract_worker.wait()
+            self.close()
+            return
+        if stats.get("cancelled"):
+            return
+        if stats["failed"]:
+            QMessageBox.warning(self, "提取完成",
+                                f"资源提取完成，成功 {stats['extracted']} 个，失败 {stats['failed']} 个，详情请查看日志")
+        else:
+            QMessageBox.information(self, "成功", "资源提取完成！")
+
+    def on_extract_error(self, message):
+        """提取出错"""
+        self.confirm_btn.setEnabled(True)
+        self.extract_progress.setVisible(False)
+        self.logger.error(message)
+        if self.close_after_extract:
+            # 工作线程发出信号后立即结束，等待时间很短
+            self.close_after_extract = False
+            self.extract_worker.wait()
+            self.close()
+            return
+        QMessageBox.critical(self, "错误", f"资源提取失败: {message}")
+
     def toggle_audio_playback(self):
         """切换音频播放状态"""
         self.preview_manager.toggle_audio_playback()
@@ -1235,6 +1223,14 @@ class FileSelectorDialog(QWidget):
 
     def closeEvent(self, event):
         """关闭事件"""
+        if self.extract_worker is not None and self.extract_worker.isRunning():
+            # 不在界面线程中等待提取结束，取消完成后由 on_extract_finished / on_extract_error 关闭窗口
+            self.extract_worker.stop()
+            self.close_after_extract = True
+            self.confirm_btn.setEnabled(False)
+            self.extract_progress.setFormat("正在取消提取...")
+            event.ignore()
+            return
         try:
             self.preview_manager.cleanup()
         finally:
@@ -1271,42 +1267,32 @@ class FileSelectorDialog(QWidget):
 
     def startDrag(self, supportedActions):
         """开始拖拽"""
-        # 获取选中的行
-        selected_rows = set(item.row() for item in self.file_table.selectedItems())
-        if not selected_rows:
+        # 获取选中的文件
+        selected_files = self.selected_file_infos()
+        if not selected_files:
             return
 
         # 创建拖拽数据
         mime_data = QMimeData()
 
-        # 创建用于文件替换的数据
-        items_data = []
-        for row in selected_rows:
-            items = []
-            for col in range(self.file_table.columnCount()):
-                item = self.file_table.item(row, col)
-                if item:
-                    items.append(item)
-            if items:
-                items_data.append(items)
-
         # 设置用于文件替换的数据
-        if items_data:
-            mime_data.setData("application/x-qabstractitemmodeldatalist", QByteArray())
+        mime_data.setData("application/x-qabstractitemmodeldatalist", QByteArray())
 
         # 创建用于文件导出的URL列表
         urls = []
-        for row in selected_rows:
-            item = self.file_table.item(row, 0)  # 获取第一列的项目
-            if item:
-                file_info = item.data(Qt.ItemDataRole.UserRole + 1)  # 获取文件信息
-                if isinstance(file_info, tuple) and len(file_info) == 3:
-                    name, file_type, path = file_info
-                    # 检查是否有替换文件
-                    if file_info in self.replace_files:
-                        path = self.replace_files[file_info]
-                    # 添加文件URL
-                    urls.append(QUrl.fromLocalFile(path))
+        for file_info in selected_files:
+            if isinstance(file_info, tuple) and len(file_info) == 3:
+                name, file_type, path = file_info
+                # 检查是否有替换文件
+                if file_info in self.replace_files:
+                    path = self.replace_files[file_info]
+                # 添加文件URL，拖出到外部时需要真实文件
+                try:
+                    urls.append(QUrl.fromLocalFile(scratch_pack.local_path(path)))
+                except TempQuotaExceeded as e:
+                    self.logger.warning(f"写出拖拽文件失败: {str(e)}")
+                    QMessageBox.warning(self, "警告", str(e))
+                    return
 
         if urls:
             mime_data.setUrls(urls)
@@ -1316,7 +1302,7 @@ class FileSelectorDialog(QWidget):
         pixmap.fill(Qt.GlobalColor.transparent)
         painter = QPainter(pixmap)
         painter.setPen(Qt.GlobalColor.black)
-        painter.drawText(10, 20, f"拖拽 {len(selected_rows)} 个文件")
+        painter.drawText(10, 20, f"拖拽 {len(selected_files)} 个文件")
         painter.end()
 
         # 创建拖拽对象
@@ -1331,12 +1317,12 @@ class FileSelectorDialog(QWidget):
     def dropEvent(self, event):
         """处理放置事件"""
         # 获取放置位置
-        item = self.file_table.itemAt(event.position().toPoint())
-        if not item:
+        index = self.file_table.indexAt(event.position().toPoint())
+        if not index.isValid():
             return
 
         # 获取目标文件信息
-        target_info = item.data(Qt.ItemDataRole.UserRole + 1)  # 从 UserRole + 1 获取文件信息
+        target_info = index.data(FILE_INFO_ROLE)
         if not isinstance(target_info, tuple) or len(target_info) != 3:
             return
 
@@ -1365,18 +1351,9 @@ class FileSelectorDialog(QWidget):
                         self.update_preview(target_info[0], target_info[1], file_path)
 
                         # 更新文件项的颜色
-                        row = item.row()
-                        for col in range(self.file_table.columnCount()):
-                            table_item = self.file_table.item(row, col)
-                            if table_item:
-                                if self.is_dark_mode():
-                                    table_item.setBackground(QBrush(QColor("#1a3a1a")))  # 深色主题下的深绿色背景
-                                    table_item.setForeground(QBrush(QColor("#4caf50")))  # 深色主题下的亮绿色文本
-                                else:
-                                    table_item.setBackground(QBrush(QColor("#e8f5e9")))  # 浅色主题下的浅绿色背景
-                                    table_item.setForeground(QBrush(QColor("#2e7d32")))
-
-                            # 更新导出AB按钮状态
+                        self.file_model.refresh_file(target_info)
+
+                        # 更新导出AB按钮状态
                         self.export_ab_btn.setEnabled(True)
                         self.export_lab_btn.setEnabled(True)
 
@@ -1392,16 +1369,16 @@ class FileSelectorDialog(QWidget):
         if event.mimeData().hasFormat("application/x-qabstractitemmodeldatalist"):
             # 获取拖拽的文件信息
             source_widget = event.source()
-            if not isinstance(source_widget, QTableWidget):
+            if not isinstance(source_widget, QTableView):
                 return
 
-            # 获取源文件信息（只取第一列的数据）
-            source_items = [item for item in source_widget.selectedItems() if item.column() == 0]
-            if not source_items:
+            # 获取源文件信息（每个选中行取第一列）
+            source_indexes = source_widget.selectionModel().selectedRows()
+            if not source_indexes:
                 return
 
             # 获取源文件信息
-            source_info = source_items[0].data(Qt.ItemDataRole.UserRole + 1)  # 从 UserRole + 1 获取文件信息
+            source_info = source_indexes[0].data(FILE_INFO_ROLE)
             if not isinstance(source_info, tuple) or len(source_info) != 3:
                 return
 
@@ -1416,23 +1393,20 @@ class FileSelectorDialog(QWidget):
 
             if reply == QMessageBox.StandardButton.Yes:
                 # 执行替换
-                self.replace_files[target_info] = source_info[2]  # 使用源文件的路径
+                try:
+                    self.replace_files[target_info] = scratch_pack.local_path(source_info[2])  # 使用源文件的路径
+                except TempQuotaExceeded as e:
+                    self.logger.warning(f"写出替换文件失败: {str(e)}")
+                    QMessageBox.warning(self, "警告", str(e))
+                    event.ignore()
+                    return
                 self.logger.info(f"通过拖拽替换文件: {target_info[0]} -> {source_info[0]}")
 
                 # 更新预览
                 self.update_preview(target_info[0], target_info[1], source_info[2])
 
                 # 更新文件项的颜色
-                row = item.row()
-                for col in range(self.file_table.columnCount()):
-                    table_item = self.file_table.item(row, col)
-                    if table_item:
-                        if self.is_dark_mode():
-                            table_item.setBackground(QBrush(QColor("#1a3a1a")))  # 深色主题下的深绿色背景
-                            table_item.setForeground(QBrush(QColor("#4caf50")))  # 深色主题下的亮绿色文本
-                        else:
-                            table_item.setBackground(QBrush(QColor("#e8f5e9")))  # 浅色主题下的浅绿色背景
-                            table_item.setForeground(QBrush(QColor("#2e7d32")))
+                self.file_model.refresh_file(target_info)
 
                 # 更新导出AB按钮状态
                 self.export_ab_btn.setEnabled(True)
@@ -1450,13 +1424,28 @@ class FileSelectorDialog(QWidget):
         self.findChild(QSplitter).setSizes([total_width // 2, total_width // 2])
 
     def on_search_text_changed(self, text):
-        """处理搜索文本变化"""
-        self.update_file_list()
+        """处理搜索文本变化，停止输入后再筛选"""
+        self.search_timer.start()
+
+    def apply_search_filter(self):
+        """按搜索文本筛选文件列表"""
+        self.file_proxy.set_search_text(self.search_input.text())
+
+    def focus_path_id(self, path_id):
+        """
+        选中并滚动到指定对象，用于从资源目录搜索结果跳转
 
-    def on_sort_changed(self, logical_index, order):
-        """处理排序变化"""
-        # 使用默认排序，自定义排序项会自动处理大小比较
-        self.file_table.sortItems(logical_index, order)
+        Args:
+            path_id: 对象的路径ID
+        """
+        row = self.file_model.row_of_path_id(path_id)
+        if row is not None:
+            index = self.file_proxy.mapFromSource(self.file_model.index(row, 0))
+            if index.isValid():
+                self.file_table.selectRow(index.row())
+                self.file_table.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
+                return
+        self.logger.warning(f"当前列表中未找到路径ID为 {path_id} 的对象")
 
     def export_image(self, file_info):
         """导出直通图片"""
@@ -1481,6 +1470,7 @@ class FileSelectorDialog(QWidget):
                 return
 
             # 创建并启动worker线程
+            # 打包文件中的贴图在工作线程中读取，不在界面线程写出真实文件
             self.export_worker = ExportImageWorker(path, file_path)
             self.export_worker.finished.connect(self.on_export_finished)
             self.export_worker.error.connect(self.on_export_error)
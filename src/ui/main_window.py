@@ -2,11 +2,9 @@
 主窗口界面
 """
 import os
-import shutil
 import threading
-from concurrent.futures import ThreadPoolExecutor
 from typing import List
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QSize, QUrl
+from PyQt6.QtCore import Qt, pyqtSignal, QEvent, QSize, QUrl
 from PyQt6.QtGui import QFont, QIcon, QDesktopServices
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QLabel, QFileDialog, QTextEdit,
@@ -18,15 +16,17 @@ from src.ui.batch_pack_dialog import BatchPackDialog
 from src.ui.donate_dialog import DonateDialog
 from src.ui.settings_dialog import SettingsDialog
 import logging
-from queue import Queue,Empty
 
 from src.worker.BundleValidateWorker import BundleValidateWorker
 from src.worker.asset_worker import AssetWorker
 from src.worker.export_ab_worker import ExportABWorker
 from src.ui.batch_decrypt_dialog import BatchDecryptDialog
+from src.ui.asset_catalog_dialog import AssetCatalogDialog
 from src.utils.BundleValidator import BundleValidator
 from src.ui.themes.main_window_theme_manager import ThemeManager
 from src.config.config_manager import ConfigManager
+from src.utils.temp_store import get_temp_store
+from src.core.bundle_session import BundleSessionManager, DEFAULT_MEMORY_BUDGET_MB, DEFAULT_TEMP_BUDGET_MB
 
 
 class MainWindow(QMainWindow):
@@ -42,7 +42,7 @@ class MainWindow(QMainWindow):
         self.bundle_validator = BundleValidator()
         self.is_shutting_down = False  # 添加关闭标志
         self.workers = []  # 存储所有工作线程
-        self.thread_pool = None  # 线程池引用
+        self.pending_focus = {}  # 扫描完成后需要选中的对象路径ID（从资源目录打开）
         self.progress_signal.connect(self.update_progress)
 
         # 初始化配置管理器
@@ -105,7 +105,11 @@ class MainWindow(QMainWindow):
         # 添加已打开的资源窗口列表
         self.path_to_windows = {}  # 存储已打开的FileSelectorDialog实例
         self.windows_to_files = {}  # 存储窗口与文件的映射关系
-        self.path_to_files = {}  # 存储资源路径与文件列表的映射关系（持久化，即使窗口关闭也保留）
+        # 资源路径对应的文件列表和临时目录（窗口关闭后保留，超出预算时释放最久未使用的资源包）
+        self.sessions = BundleSessionManager(
+            self.config.get('session_temp_budget_mb', DEFAULT_TEMP_BUDGET_MB),
+            self.config.get('session_memory_budget_mb', DEFAULT_MEMORY_BUDGET_MB)
+        )
         self.window_list = QTableWidget()  # 用于显示已打开的窗口列表
         self.window_list.setColumnCount(3)  # 设置3列
         self.window_list.setHorizontalHeaderLabels(["名称", "路径", "大小"])  # 设置列标题
@@ -130,9 +134,6 @@ class MainWindow(QMainWindow):
         # 启用右键菜单
         self.window_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.window_list.customContextMenuRequested.connect(self.show_context_menu)
-        
-        # 记录所有临时目录
-        self.temp_paths = []
 
         # 设置应用图标
         icon_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "resource", "icon.webp")
@@ -141,11 +142,6 @@ class MainWindow(QMainWindow):
 
         self.setup_ui()
         self.theme_manager.update_theme()  # 初始化主题
-
-        # 创建定时器来检查系统主题变化
-        self.theme_check_timer = QTimer(self)
-        self.theme_check_timer.timeout.connect(self.theme_manager.check_theme_change)
-        self.theme_check_timer.start(1000)  # 每秒检查一次
         
         # 添加窗口大小变化事件处理
         self.resizeEvent = self.on_resize
@@ -220,6 +216,11 @@ class MainWindow(QMainWindow):
         self.batch_decrypt_btn = QPushButton("批量解密")
         self.batch_decrypt_btn.clicked.connect(self.show_batch_decrypt_dialog)
         batch_buttons_layout.addWidget(self.batch_decrypt_btn)
+
+        # 资源目录按钮
+        self.asset_catalog_btn = QPushButton("资源目录")
+        self.asset_catalog_btn.clicked.connect(self.show_asset_catalog_dialog)
+        batch_buttons_layout.addWidget(self.asset_catalog_btn)
         package_layout.addLayout(batch_buttons_layout)
         
         package_group.setLayout(package_layout)
@@ -493,23 +494,13 @@ class MainWindow(QMainWindow):
             # 保存当前目录
             self.config.set('last_input_dir', dir_path)
 
-            # 收集所有文件
-            all_files = []
-            for root, _, files in os.walk(dir_path):
-                for file in files:
-                    all_files.append(os.path.join(root, file))
-
-            if not all_files:
-                QMessageBox.warning(self, "警告", "选择的文件夹为空！")
-                return
-
             # 更新状态
             self.status_label.setText("正在验证文件...")
             self.status_label.setStyleSheet("color: #4a86e8;")
             self.update_log("开始验证文件...")
 
-            # 创建并启动验证线程
-            self.validate_worker = BundleValidateWorker(all_files)
+            # 创建并启动验证线程（目录枚举在工作线程中进行）
+            self.validate_worker = BundleValidateWorker([dir_path])
             # self.validate_worker.progress.connect(self.progress_bar.)
 
             self.validate_worker.validated.connect(self.on_validate_complete)
@@ -565,81 +556,10 @@ class MainWindow(QMainWindow):
         self.status_label.setStyleSheet("color: #4a86e8;")
         self.update_log(f"开始批量处理 {len(valid_files)} 个资源包文件")
 
-        # 创建任务队列和处理进度计数器
-        self.task_queue = Queue()
-        self.completed_tasks = 0
-        self.total_tasks = len(valid_files)
-        self.task_lock = threading.Lock()
-
-        # 将所有文件添加到任务队列
-        for file_path in valid_files:
-            if not self.check_file_exists(file_path):
-                self.task_queue.put(file_path)
-
-        # 创建线程池（设置合适的线程数，比如CPU核心数的2倍）
-        max_workers = os.cpu_count() * 2 or 4
-        self.thread_pool = ThreadPoolExecutor(max_workers=max_workers)
-
-        # 启动处理线程
-        for _ in range(max_workers):
-            self.thread_pool.submit(self.process_file_task)
-
-    def process_file_task(self):
-        """处理单个文件的任务"""
-        while not self.is_shutting_down:
-            try:
-                # 从队列获取任务，设置较短的超时时间以便及时响应终止信号
-                try:
-                    file_path = self.task_queue.get(timeout=0.5)
-                except Empty:
-                    continue
-
-                # 检查是否正在关闭
-                if self.is_shutting_down:
-                    break
-
-                try:
-                    self.update_log(f"正在处理文件: {os.path.basename(file_path)}")
-                    self.asset_path = file_path
-
-                    worker = AssetWorker(file_path)
-                    worker.progress.connect(self.update_log)
-                    worker.finished.connect(self.scan_finished)
-                    worker.error.connect(self.handle_error)
-                    worker.scan_complete.connect(self.on_scan_complete)
-
-                    # 添加到工作线程列表
-                    with self.task_lock:
-                        self.workers.append(worker)
-
-                    worker.start()
-                    worker.wait()
-
-                    # 从列表中移除完成的线程
-                    with self.task_lock:
-                        if worker in self.workers:
-                            self.workers.remove(worker)
-
-                    # 更新进度
-                    with self.task_lock:
-                        if not self.is_shutting_down:
-                            self.completed_tasks += 1
-                            progress = (self.completed_tasks / self.total_tasks) * 100
-                            # 使用 QMetaObject.invokeMethod 在主线程中更新进度
-                            self.progress_signal.emit(int(progress), f"正在处理: {self.completed_tasks}/{self.total_tasks} ({progress:.1f}%)")
-                            if self.completed_tasks == self.total_tasks:
-                                self.progress_signal.emit(0, "处理完成！")
-
-                except Exception as e:
-                    self.logger.error(f"处理文件失败 {file_path}: {str(e)}")
-                    self.update_log(f"处理文件失败 {os.path.basename(file_path)}: {str(e)}")
-
-                finally:
-                    self.task_queue.task_done()
-
-            except Exception as e:
-                if not self.is_shutting_down:
-                    self.logger.error(f"处理任务时出错: {str(e)}")
+        # 只扫描对象列表并汇总到一个可搜索的资源目录窗口，双击结果时才打开对应的资源包窗口，
+        # 避免为每个资源包各自解包并创建窗口
+        dialog = AssetCatalogDialog(self, bundle_paths=valid_files)
+        dialog.show()
 
     def update_progress(self, value,message):
         """更新进度条的槽函数"""
@@ -667,10 +587,10 @@ class MainWindow(QMainWindow):
         self.update_log(f"扫描到 {len(files)} 个文件")
         self.status_label.setText(f"扫描完成，找到 {len(files)} 个文件")
         self.status_label.setStyleSheet("color: #28a745;")
-        self.temp_paths.append(temp_path)  # 记录临时目录
 
         # 显示文件选择对话框
         if files:
+            self.sessions.add(asset_path, files, temp_path)
             dialog = FileSelectorDialog(asset_path, files, temp_path, self)
             dialog.files_selected.connect(self.on_files_selected)
             dialog.file_replaced.connect(self.on_file_replaced)
@@ -682,14 +602,15 @@ class MainWindow(QMainWindow):
 
             self.path_to_windows[asset_path] = dialog
             self.windows_to_files[dialog] = files
-            self.path_to_files[asset_path] = files  # 持久化保存文件列表
 
             # 临时禁用排序
             self.window_list.setSortingEnabled(False)
 
-            # 创建表格项
-            row = self.window_list.rowCount()
-            self.window_list.insertRow(row)
+            # 创建表格项，已释放后重新扫描的资源包复用原来的行
+            row = self.find_window_row(asset_path)
+            if row < 0:
+                row = self.window_list.rowCount()
+                self.window_list.insertRow(row)
 
             # 设置名称列
             name_item = QTableWidgetItem(os.path.basename(asset_path))
@@ -723,7 +644,19 @@ class MainWindow(QMainWindow):
 
             # 连接窗口关闭信号，当窗口关闭时自动清理引用
             dialog.destroyed.connect(lambda: self.on_window_closed(asset_path))
+
+            # 从资源目录打开或重新扫描的资源包直接显示并选中目标对象
+            if asset_path in self.pending_focus:
+                path_id = self.pending_focus.pop(asset_path)
+                dialog.check_theme_change()
+                dialog.show()
+                if path_id is not None:
+                    dialog.focus_path_id(path_id)
+
+            self.release_inactive_sessions()
         else:
+            self.pending_focus.pop(asset_path, None)
+            get_temp_store().remove_dir(temp_path)
             QMessageBox.warning(self, "警告", "未找到可提取的文件！")
             self.status_label.setText("未找到可提取的文件")
             self.status_label.setStyleSheet("color: #dc3545;")
@@ -893,9 +826,8 @@ class MainWindow(QMainWindow):
                         if window in self.windows_to_files:
                             del self.windows_to_files[window]
                     
-                    # 清理文件列表映射（移除资源时才清理，关闭窗口时不清理）
-                    if asset_path in self.path_to_files:
-                        del self.path_to_files[asset_path]
+                    # 清理文件列表和临时目录（移除资源时才清理，关闭窗口时不清理）
+                    self.sessions.remove(asset_path)
                     
                     # 无论窗口是否存在，都要从列表中移除行
                     self.window_list.removeRow(row)
@@ -939,8 +871,8 @@ class MainWindow(QMainWindow):
                     if window in self.windows_to_files:
                         del self.windows_to_files[window]
                 
-                # 清理所有文件列表映射（移除所有资源时才清理）
-                self.path_to_files.clear()
+                # 清理所有文件列表和临时目录（移除所有资源时才清理）
+                self.sessions.clear()
                 
                 # 清空列表
                 self.window_list.setRowCount(0)
@@ -960,9 +892,10 @@ class MainWindow(QMainWindow):
                 del self.path_to_windows[asset_path]
                 if window in self.windows_to_files:
                     del self.windows_to_files[window]
-                # 注意：不删除 self.path_to_files[asset_path]，保留文件列表
+                # 注意：不删除会话中的文件列表，超出预算时才释放
                 
                 self.logger.info(f"已清理窗口引用（保留列表显示和文件列表）: {asset_path}")
+                self.release_inactive_sessions()
         except Exception as e:
             self.logger.error(f"处理窗口关闭事件时出错: {str(e)}")
 
@@ -973,6 +906,12 @@ class MainWindow(QMainWindow):
             row = item.row()
             asset_path = self.window_list.item(row, 0).data(Qt.ItemDataRole.UserRole)
             
+            # 会话已释放时重新扫描，完成后自动显示窗口
+            session = self.sessions.get(asset_path)
+            if session is None:
+                self.rescan_bundle(asset_path)
+                return
+
             # 检查窗口是否已经存在
             if asset_path in self.path_to_windows:
                 window = self.path_to_windows[asset_path]
@@ -981,9 +920,8 @@ class MainWindow(QMainWindow):
                     window.isVisible()
                 except RuntimeError:
                     # 窗口对象已被删除，重新创建
-                    # 从持久化字典中获取文件列表
-                    files = self.path_to_files.get(asset_path, [])
-                    window = FileSelectorDialog(asset_path, files, self.temp_paths[row], self)
+                    files = session.files
+                    window = FileSelectorDialog(asset_path, files, session.temp_path, self)
                     window.files_selected.connect(self.on_files_selected)
                     window.file_replaced.connect(self.on_file_replaced)
                     window.export_ab.connect(self.on_export_ab)
@@ -1006,9 +944,8 @@ class MainWindow(QMainWindow):
                         window.activateWindow()
             else:
                 # 如果窗口不存在，创建新窗口
-                # 从持久化字典中获取文件列表
-                files = self.path_to_files.get(asset_path, [])
-                window = FileSelectorDialog(asset_path, files, self.temp_paths[row], self)
+                files = session.files
+                window = FileSelectorDialog(asset_path, files, session.temp_path, self)
                 window.files_selected.connect(self.on_files_selected)
                 window.file_replaced.connect(self.on_file_replaced)
                 window.export_ab.connect(self.on_export_ab)
@@ -1043,6 +980,80 @@ class MainWindow(QMainWindow):
         dialog = BatchDecryptDialog(self)
         dialog.show()
 
+    def show_asset_catalog_dialog(self):
+        """显示资源目录窗口"""
+        dialog = AssetCatalogDialog(self)
+        dialog.show()
+
+    def open_bundle(self, asset_path, path_id=None):
+        """
+        打开资源包窗口，已扫描过的资源包直接显示，否则先扫描
+
+        Args:
+            asset_path: 资源包路径
+            path_id: 打开后需要选中的对象路径ID
+        """
+        target = os.path.normcase(os.path.abspath(asset_path))
+        for row in range(self.window_list.rowCount()):
+            item = self.window_list.item(row, 0)
+            opened_path = item.data(Qt.ItemDataRole.UserRole)
+            if os.path.normcase(os.path.abspath(opened_path)) == target:
+                if opened_path not in self.sessions:
+                    self.pending_focus[opened_path] = path_id
+                    self.rescan_bundle(opened_path)
+                    return
+                self.on_window_double_clicked(item)
+                window = self.path_to_windows.get(opened_path)
+                if window is not None and path_id is not None:
+                    window.focus_path_id(path_id)
+                return
+
+        self.pending_focus[asset_path] = path_id
+        self.asset_path = asset_path
+        self.start_scan()
+
+    def find_window_row(self, asset_path):
+        """
+        查找资源包在列表中的行号
+
+        Args:
+            asset_path: 资源包路径
+
+        Returns:
+            int: 行号，不存在时返回-1
+        """
+        for row in range(self.window_list.rowCount()):
+            if self.window_list.item(row, 0).data(Qt.ItemDataRole.UserRole) == asset_path:
+                return row
+        return -1
+
+    def rescan_bundle(self, asset_path):
+        """
+        重新扫描已释放的资源包，完成后显示窗口
+
+        Args:
+            asset_path: 资源包路径
+        """
+        self.update_log(f"资源包已释放，正在重新扫描: {os.path.basename(asset_path)}")
+        self.pending_focus.setdefault(asset_path, None)
+        self.asset_path = asset_path
+        self.start_scan()
+
+    def release_inactive_sessions(self):
+        """超出预算时释放最久未使用且没有打开窗口的资源包，列表中保留并标记为已释放"""
+        for asset_path in self.sessions.evict(self.path_to_windows.keys()):
+            row = self.find_window_row(asset_path)
+            if row >= 0:
+                self.window_list.item(row, 0).setToolTip(f"{os.path.basename(asset_path)}（已释放，双击重新扫描）")
+        self.logger.debug(f"资源包会话: {len(self.sessions)} 个，临时文件 {self.sessions.temp_bytes / 1024 / 1024:.1f} MB，"
+                          f"文件列表约 {self.sessions.memory_bytes / 1024 / 1024:.1f} MB")
+
+    def changeEvent(self, event):
+        """系统调色板变化时通知主题服务重新检测系统主题"""
+        if event.type() == QEvent.Type.ApplicationPaletteChange:
+            self.theme_manager.theme_service.refresh_system_theme()
+        super().changeEvent(event)
+
     def closeEvent(self, event):
         """关闭事件处理"""
         try:
@@ -1062,20 +1073,6 @@ class MainWindow(QMainWindow):
                     pass
                     # self.logger.error(f"关闭窗口时出错: {str(e)}")
 
-            # 等待所有任务完成
-            if hasattr(self, 'task_queue'):
-                while not self.task_queue.empty():
-                    try:
-                        self.task_queue.get_nowait()
-                        self.task_queue.task_done()
-                    except Empty:
-                        break
-
-            # 关闭线程池
-            if self.thread_pool:
-                self.thread_pool.shutdown(wait=False)
-                self.thread_pool = None
-
             # 终止所有工作线程
             for worker in self.workers:
                 if worker.isRunning():
@@ -1083,15 +1080,7 @@ class MainWindow(QMainWindow):
                     worker.wait(1000)  # 等待最多1秒
 
             # 清理临时目录
-            count = 0
-            for temp_path in self.temp_paths:
-                try:
-                    if os.path.exists(temp_path):
-                        count += 1
-                        shutil.rmtree(temp_path)
-
-                except Exception as e:
-                    self.logger.error(f"清理临时目录失败: {str(e)}")
+            count = self.sessions.clear()
             self.logger.info(f"临时目录已删除: {count} 个")
         except Exception as e:
             self.logger.error(f"关闭应用时出错: {str(e)}")
@@ -1110,14 +1099,9 @@ class MainWindow(QMainWindow):
                     has_valid_files = True
                     break
                 if os.path.isdir(file_path):
-                    # 如果是目录，则检查目录下是否有AB文件
-                    for root, _, files in os.walk(file_path):
-                        for file in files:
-                            if self.bundle_validator.is_valid_bundle(file_path)[0]:
-                                has_valid_files = True
-                                break
-                        if has_valid_files:
-                            break
+                    # 目录在放置后由验证线程枚举，这里不遍历
+                    has_valid_files = True
+                    break
             if has_valid_files:
                 event.acceptProposedAction()
 
@@ -1129,20 +1113,12 @@ class MainWindow(QMainWindow):
     def dropEvent(self, event):
         """处理放置事件"""
         if event.mimeData().hasUrls():
-            valid_files = []
-            skipped_files = []
             all_files = []
-            # 收集有效的AB文件
+            # 收集拖入的文件和目录，目录由验证线程递归枚举
             for url in event.mimeData().urls():
                 file_path = url.toLocalFile()
-                if os.path.isfile(file_path):
+                if os.path.isfile(file_path) or os.path.isdir(file_path):
                     all_files.append(file_path)
-                elif os.path.isdir(file_path):
-                    # 如果是目录，则检查目录下是否有AB文件
-                    for root, _, files in os.walk(file_path):
-                        for file in files:
-                            all_files.append(os.path.join(root, file))
-
 
             # 创建并启动验证线程
             self.validate_worker = BundleValidateWorker(all_files)
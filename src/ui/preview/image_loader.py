@@ -0,0 +1,225 @@
+"""
+图片预览异步加载
+在线程池中用 QImageReader 按预览尺寸直接解码，只从文件头读取原始分辨率，
+扫描生成的贴图 PNG 优先使用贴图缓存中的解码结果，
+解码结果转换为 QPixmap 后放入按 路径+修改时间 区分的 LRU 缓存
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader, QPixmap
+
+from src.utils.executor_registry import CPU_POOL, get_executor
+from src.utils.texture_cache import get_texture_cache
+
+# 预览缓存占用的最大内存（字节）
+PIXMAP_CACHE_BYTES = 128 * 1024 * 1024
+
+# (路径, 修改时间, 预览宽度, 预览高度)
+CacheKey = Tuple[str, int, int, int]
+
+
+def cache_key(path: str, target_size: QSize) -> Optional[CacheKey]:
+    """
+    生成缓存键，文件不存在时返回None
+
+    Args:
+        path: 图片路径
+        target_size: 预览区域尺寸
+
+    Returns:
+        Optional[CacheKey]: 缓存键
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return os.path.abspath(path), mtime_ns, target_size.width(), target_size.height()
+
+
+def decode_image(path: str, target_size: QSize) -> Tuple[QImage, Dict]:
+    """
+    按预览尺寸解码图片（在工作线程中执行，只能使用 QImage，不能使用 QPixmap）
+
+    Args:
+        path: 图片路径
+        target_size: 预览区域尺寸
+
+    Returns:
+        Tuple[QImage, Dict]: (缩小后的图片, 原图信息 {"width", "height", "format", "depth", "has_alpha"})
+
+    Raises:
+        IOError: 图片无法读取
+    """
+    cached = get_texture_cache().get_path(path)
+    if cached is not None:
+        # 扫描时已经解码过，不再解码 PNG
+        image = QImage(cached.tobytes(), cached.width, cached.height, cached.width * 4,
+                       QImage.Format.Format_RGBA8888).copy()
+        if image.width() > target_size.width() or image.height() > target_size.height():
+            image = image.scaled(target_size, Qt.AspectRatioMode.KeepAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+        info = {
+            "width": cached.width,
+            "height": cached.height,
+            "format": "PNG",
+            "depth": image.depth(),
+            "has_alpha": image.hasAlphaChannel(),
+        }
+        return image, info
+
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    original_size = reader.size()
+    if not original_size.isValid():
+        raise IOError(reader.errorString())
+
+    # 只缩小不放大，大图直接以预览分辨率解码，避免先解码整张图再缩放
+    if original_size.width() > target_size.width() or original_size.height() > target_size.height():
+        reader.setScaledSize(original_size.scaled(target_size, Qt.AspectRatioMode.KeepAspectRatio))
+
+    image = reader.read()
+    if image.isNull():
+        raise IOError(reader.errorString())
+
+    info = {
+        "width": original_size.width(),
+        "height": original_size.height(),
+        "format": bytes(reader.format()).decode("ascii", errors="replace").upper(),
+        "depth": image.depth(),
+        "has_alpha": image.hasAlphaChannel(),
+    }
+    return image, info
+
+
+class PixmapCache:
+    """按内存占用淘汰的 QPixmap LRU 缓存（只在GUI线程中使用）"""
+
+    def __init__(self, max_bytes: int = PIXMAP_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries: "OrderedDict[CacheKey, Tuple[QPixmap, Dict]]" = OrderedDict()
+
+    @staticmethod
+    def _cost(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * max(1, pixmap.depth() // 8)
+
+    def get(self, key: CacheKey) -> Optional[Tuple[QPixmap, Dict]]:
+        """
+        读取缓存并标记为最近使用
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            Optional[Tuple[QPixmap, Dict]]: (预览图, 原图信息)
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: CacheKey, pixmap: QPixmap, info: Dict):
+        """
+        写入缓存，超过容量时淘汰最久未使用的预览图
+
+        Args:
+            key: 缓存键
+            pixmap: 预览图
+            info: 原图信息
+        """
+        if key in self.entries:
+            self.total_bytes -= self._cost(self.entries.pop(key)[0])
+        self.entries[key] = (pixmap, info)
+        self.total_bytes += self._cost(pixmap)
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (old_pixmap, _) = self.entries.popitem(last=False)
+            self.total_bytes -= self._cost(old_pixmap)
+
+
+# 所有文件选择窗口共用同一个预览缓存
+pixmap_cache = PixmapCache()
+
+
+class ImagePreviewLoader(QObject):
+    """图片预览加载器，新的请求会取消尚未完成的旧请求"""
+    loaded = pyqtSignal(int, str, QPixmap, dict)  # 请求编号、路径、预览图、原图信息
+    failed = pyqtSignal(int, str, str)  # 请求编号、路径、错误信息
+    _decoded = pyqtSignal(int, str, object, QImage, dict)  # 工作线程解码完成（内部使用）
+    _decode_failed = pyqtSignal(int, str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self.request_id = 0
+        self.future: Optional[Future] = None
+        self.lock = threading.Lock()
+        # 工作线程发出的信号会排队到GUI线程中处理
+        self._decoded.connect(self._on_decoded)
+        self._decode_failed.connect(self._on_decode_failed)
+
+    def request(self, path: str, target_size: QSize) -> int:
+        """
+        请求加载预览图，命中缓存时立即发出 loaded 信号
+
+        Args:
+            path: 图片路径
+            target_size: 预览区域尺寸
+
+        Returns:
+            int: 请求编号
+        """
+        self.cancel()
+        request_id = self.request_id
+        key = cache_key(path, target_size)
+        if key is None:
+            self.failed.emit(request_id, path, "文件不存在")
+            return request_id
+
+        cached = pixmap_cache.get(key)
+        if cached is not None:
+            self.loaded.emit(request_id, path, cached[0], cached[1])
+            return request_id
+
+        self.future = get_executor(CPU_POOL).submit(self._decode, request_id, path, key, QSize(target_size))
+        return request_id
+
+    def cancel(self):
+        """取消当前请求，已经开始解码的结果会被丢弃"""
+        with self.lock:
+            self.request_id += 1
+        if self.future is not None:
+            self.future.cancel()
+            self.future = None
+
+    def _is_current(self, request_id: int) -> bool:
+        with self.lock:
+            return request_id == self.request_id
+
+    def _decode(self, request_id: int, path: str, key: CacheKey, target_size: QSize):
+        """在工作线程中解码图片"""
+        if not self._is_current(request_id):
+            return
+        try:
+            image, info = decode_image(path, target_size)
+        except Exception as e:
+            self._decode_failed.emit(request_id, path, str(e))
+            return
+        self._decoded.emit(request_id, path, key, image, info)
+
+    def _on_decoded(self, request_id: int, path: str, key: CacheKey, image: QImage, info: dict):
+        """在GUI线程中转换为 QPixmap 并写入缓存"""
+        pixmap = QPixmap.fromImage(image)
+        pixmap_cache.put(key, pixmap, info)
+        if self._is_current(request_id):
+            self.loaded.emit(request_id, path, pixmap, info)
+
+    def _on_decode_failed(self, request_id: int, path: str, error: str):
+        if self._is_current(request_id):
+            self.logger.error(f"加载图片预览失败 {path}: {error}")
+            self.failed.emit(request_id, path, error)
@@ -3,13 +3,16 @@
 """
 import os
 import logging
-import json
 from PyQt6.QtWidgets import (QLabel, QTextEdit, QPushButton, QFrame, QHBoxLayout, 
                             QVBoxLayout, QSlider, QApplication)
-from PyQt6.QtCore import Qt, QTimer, QUrl
-from PyQt6.QtGui import QPixmap, QImage, QIcon, QFont
+from PyQt6.QtCore import QTimer, QUrl
+from PyQt6.QtGui import QIcon, QFont
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
 
+from .image_loader import ImagePreviewLoader
+from ..widgets.json_tree_model import JsonTreeModel
+from ...worker.json_preview_worker import JsonPreviewWorker, RAW_TEXT_LIMIT
+
 class PreviewManager:
     """预览管理器"""
     def __init__(self):
@@ -19,6 +22,21 @@ class PreviewManager:
         self.last_position = 0
         self.is_dragging = False
 
+        # 图片在线程池中解码，切换文件时丢弃旧的请求（过期结果由加载器过滤）
+        self.image_widget = None
+        self.image_name = ""
+        self.image_size_str = ""
+        self.image_loader = ImagePreviewLoader()
+        self.image_loader.loaded.connect(self.on_image_loaded)
+        self.image_loader.failed.connect(self.on_image_failed)
+
+        # JSON在后台线程中解析，切换文件后旧的结果会被丢弃
+        self.json_request_id = 0
+        self.json_workers = set()
+        self.json_widget = None
+        self.json_info = None
+        self.json_truncated = False
+
         # 初始化音频播放器
         self.media_player = QMediaPlayer()
         self.audio_output = QAudioOutput()
@@ -60,9 +78,14 @@ class PreviewManager:
             # 设置当前预览文件路径
             self.current_preview_path = path
 
+            # 取消尚未完成的图片加载和JSON解析
+            self.image_loader.cancel()
+            self.json_request_id += 1
+
             # 默认隐藏所有预览组件
             widget.image_preview.setVisible(False)
             widget.preview_text.setVisible(False)
+            widget.json_tree.setVisible(False)
             widget.audio_preview.setVisible(False)
             widget.edit_buttons_container.setVisible(False)
             widget.image_info_label.setVisible(False)
@@ -92,44 +115,41 @@ class PreviewManager:
             self.is_loading = False
 
     def _preview_image(self, name, path, size_str, widget):
-        """预览图片"""
+        """预览图片（异步解码，完成后由 on_image_loaded 显示）"""
         widget.image_preview.setVisible(True)
         widget.image_info_label.setVisible(True)
+        widget.image_preview.setText("正在加载图片...")
+        widget.image_info_label.setText(f"文件名: {name}\n文件大小: {size_str}")
+
+        self.image_widget = widget
+        self.image_name = name
+        self.image_size_str = size_str
+        self.image_loader.request(path, widget.image_preview.size())
+
+    def on_image_loaded(self, request_id, path, pixmap, info):
+        """图片解码完成"""
+        if self.image_widget is None:
+            return
+        widget = self.image_widget
+
+        # 设置图片信息文本
+        info_text = f"文件名: {self.image_name}\n"
+        info_text += f"分辨率: {info['width']}x{info['height']}\n"
+        info_text += f"文件大小: {self.image_size_str}\n"
+        info_text += f"色彩深度: {info['depth']}位\n"
+        info_text += f"色彩空间: {'RGBA' if info['has_alpha'] else 'RGB'}\n"
+        info_text += f"格式: {info['format']}"
 
-        # 加载图片
-        pixmap = QPixmap(path)
-        if not pixmap.isNull():
-            # 获取图片信息
-            image = QImage(path)
-            width = image.width()
-            height = image.height()
-            format = image.format()
-            depth = image.depth()
-
-            # 获取色彩空间信息
-            color_space = "RGB" if format in [QImage.Format.Format_RGB32, QImage.Format.Format_ARGB32] else "RGBA"
-
-            # 设置图片信息文本
-            info_text = f"文件名: {name}\n"
-            info_text += f"分辨率: {width}x{height}\n"
-            info_text += f"文件大小: {size_str}\n"
-            info_text += f"色彩深度: {depth}位\n"
-            info_text += f"色彩空间: {color_space}\n"
-            info_text += f"格式: {format}"
-
-            widget.image_info_label.setText(info_text)
-            widget.image_info_label.setFixedHeight(125)
-
-            # 缩放图片以适应预览区域
-            scaled_pixmap = pixmap.scaled(
-                widget.image_preview.size(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            widget.image_preview.setPixmap(scaled_pixmap)
-        else:
-            widget.image_preview.setText("无法加载图片")
-            widget.image_info_label.setVisible(False)
+        widget.image_info_label.setText(info_text)
+        widget.image_info_label.setFixedHeight(125)
+        widget.image_preview.setPixmap(pixmap)
+
+    def on_image_failed(self, request_id, path, error):
+        """图片解码失败"""
+        if self.image_widget is None:
+            return
+        self.image_widget.image_preview.setText("无法加载图片")
+        self.image_widget.image_info_label.setVisible(False)
 
     def _preview_text(self, name, path, size_str, widget):
         """预览文本"""
@@ -140,58 +160,7 @@ class PreviewManager:
 
     def _preview_json(self, name, path, size_str, widget):
         """预览JSON文件"""
-        widget.preview_text.setVisible(True)
-        widget.preview_text.clear()
-        widget.edit_buttons_container.setVisible(True)
-        widget.image_info_label.setVisible(True)
-
-        try:
-            # 使用分块读取方式处理大文件
-            content = ""
-            chunk_size = 1024 * 10  # 1MB的块大小
-            self.is_loading = True
-            with open(path, 'r', encoding='utf-8', errors='replace') as f:
-                while self.is_loading:  # 检查是否应该继续加载
-                    chunk = f.read(chunk_size)
-                    if not chunk:
-                        break
-                    content += chunk
-                    QApplication.processEvents()  # 允许UI更新
-
-            # 对于大JSON文件，使用流式处理
-            try:
-                # 尝试格式化JSON
-                json_obj = json.loads(content)
-                formatted_json = json.dumps(json_obj, indent=2, ensure_ascii=False)
-
-                # 分块设置文本内容
-                widget.preview_text.clear()
-                chunk_size = 1024 * 10  # 1MB的块大小
-                for i in range(0, len(formatted_json), chunk_size):
-                    if not self.is_loading:  # 检查是否应该继续加载
-                        break
-                    chunk = formatted_json[i:i + chunk_size]
-                    widget.preview_text.append(chunk)
-                    QApplication.processEvents()  # 允许UI更新
-
-                widget.preview_text.setReadOnly(True)
-            except json.JSONDecodeError:
-                # 如果JSON解析失败，直接显示原始内容
-                widget.preview_text.setText(content)
-
-            # 设置文件信息
-            info_text = f"文件名: {name}\n"
-            info_text += f"类型: TextAsset (JSON)\n"
-            info_text += f"文件大小: {size_str}\n"
-            info_text += f"编码: UTF-8"
-
-            widget.image_info_label.setText(info_text)
-            widget.image_info_label.setFixedHeight(90)
-
-        except Exception as e:
-            widget.preview_text.setText(f"读取JSON文件失败: {str(e)}")
-        finally:
-            self.is_loading = False
+        self._load_json(name, path, size_str, "TextAsset (JSON)", widget)
 
     def _preview_plain_text(self, name, path, size_str, widget):
         """预览普通文本文件"""
@@ -255,56 +224,80 @@ class PreviewManager:
     def _preview_mono_behaviour(self, name, path, size_str, widget):
         """预览MonoBehaviour文件"""
         if path.lower().endswith('.json'):
-            widget.preview_text.setVisible(True)
-            widget.edit_buttons_container.setVisible(True)
-            widget.image_info_label.setVisible(True)
-            widget.edit_btn.setVisible(True)
-
-            try:
-                # 使用分块读取方式处理大文件
-                content = ""
-                chunk_size = 1024 * 10  # 1MB的块大小
-                self.is_loading = True
-                with open(path, 'r', encoding='utf-8', errors='replace') as f:
-                    while self.is_loading:  # 检查是否应该继续加载
-                        chunk = f.read(chunk_size)
-                        if not chunk:
-                            break
-                        content += chunk
-                        QApplication.processEvents()  # 允许UI更新
-
-                # 对于大JSON文件，使用流式处理
-                try:
-                    # 尝试格式化JSON
-                    json_obj = json.loads(content)
-                    formatted_json = json.dumps(json_obj, indent=2, ensure_ascii=False)
-
-                    # 分块设置文本内容
-                    widget.preview_text.clear()
-                    chunk_size = 1024 * 10  # 1MB的块大小
-                    for i in range(0, len(formatted_json), chunk_size):
-                        if not self.is_loading:  # 检查是否应该继续加载
-                            break
-                        chunk = formatted_json[i:i + chunk_size]
-                        widget.preview_text.append(chunk)
-                        QApplication.processEvents()  # 允许UI更新
-                except json.JSONDecodeError:
-                    # 如果JSON解析失败，直接显示原始内容
-                    widget.preview_text.setText(content)
-
-                # 设置文件信息
-                info_text = f"文件名: {name}\n"
-                info_text += f"类型: TextAsset (JSON)\n"
-                info_text += f"文件大小: {size_str}\n"
-                info_text += f"编码: UTF-8"
-
-                widget.image_info_label.setText(info_text)
-                widget.image_info_label.setFixedHeight(90)
-
-            except Exception as e:
-                widget.preview_text.setText(f"读取JSON文件失败: {str(e)}")
-            finally:
-                self.is_loading = False
+            self._load_json(name, path, size_str, "MonoBehaviour (JSON)", widget)
+
+    def _load_json(self, name, path, size_str, type_label, widget):
+        """在后台线程中读取并解析JSON，完成后由 on_json_loaded 显示"""
+        widget.preview_text.setVisible(True)
+        widget.preview_text.setPlainText("正在解析...")
+        widget.edit_buttons_container.setVisible(True)
+        widget.edit_btn.setVisible(True)
+        widget.edit_btn.setEnabled(False)
+        widget.view_toggle_btn.setVisible(False)
+        widget.image_info_label.setVisible(True)
+
+        self.json_widget = widget
+        self.json_info = (name, size_str, type_label)
+        self._set_json_info("解析中")
+
+        worker = JsonPreviewWorker(self.json_request_id, path)
+        worker.loaded.connect(self.on_json_loaded)
+        worker.error.connect(self.on_json_error)
+        worker.finished.connect(lambda: self.json_workers.discard(worker))
+        self.json_workers.add(worker)
+        worker.start()
+
+    def _set_json_info(self, status):
+        """设置JSON文件信息"""
+        name, size_str, type_label = self.json_info
+        info_text = f"文件名: {name}\n"
+        info_text += f"类型: {type_label}\n"
+        info_text += f"文件大小: {size_str}\n"
+        info_text += f"状态: {status}"
+
+        self.json_widget.image_info_label.setText(info_text)
+        self.json_widget.image_info_label.setFixedHeight(90)
+
+    def on_json_loaded(self, request_id, data, text, truncated):
+        """JSON解析完成"""
+        if request_id != self.json_request_id or self.json_widget is None:
+            return
+        widget = self.json_widget
+        self.json_truncated = truncated
+
+        if truncated:
+            text += f"\n\n…… 文件过大，仅显示前 {RAW_TEXT_LIMIT} 个字符，请使用树形视图浏览或替换文件"
+        widget.preview_text.setPlainText(text)
+        widget.preview_text.setReadOnly(True)
+        # 截断的文本保存后会破坏文件，只允许编辑完整文本
+        widget.edit_btn.setEnabled(not truncated)
+
+        if isinstance(data, (dict, list)):
+            old_model = widget.json_tree.model()
+            widget.json_tree.setModel(JsonTreeModel(data, widget.json_tree))
+            if old_model is not None:
+                old_model.deleteLater()
+            widget.view_toggle_btn.setVisible(True)
+            # 大文件默认显示树形视图
+            self._show_json_tree(widget, truncated)
+
+        self._set_json_info("解析失败，显示原始文本" if data is None else ("已截断" if truncated else "完整"))
+
+    def on_json_error(self, request_id, error):
+        """JSON读取失败"""
+        if request_id != self.json_request_id or self.json_widget is None:
+            return
+        self.json_widget.preview_text.setPlainText(f"读取JSON文件失败: {error}")
+
+    def _show_json_tree(self, widget, show_tree):
+        """切换树形视图和文本视图"""
+        widget.json_tree.setVisible(show_tree)
+        widget.preview_text.setVisible(not show_tree)
+        widget.view_toggle_btn.setText("文本视图" if show_tree else "树形视图")
+
+    def toggle_json_view(self, widget):
+        """切换JSON的树形视图和文本视图"""
+        self._show_json_tree(widget, not widget.json_tree.isVisible())
 
     def _preview_other(self, name, file_type, size_str, widget):
         """预览其他类型文件"""
@@ -323,6 +316,10 @@ class PreviewManager:
     def toggle_edit_mode(self, widget):
         """切换编辑模式"""
         is_readonly = widget.preview_text.isReadOnly()
+        if is_readonly and widget.json_tree.isVisible():
+            # 编辑只能在文本视图中进行
+            self._show_json_tree(widget, False)
+        widget.view_toggle_btn.setEnabled(not is_readonly)
         widget.preview_text.setReadOnly(not is_readonly)
         widget.edit_btn.setText("退出编辑" if is_readonly else "编辑")
         widget.save_btn.setVisible(is_readonly)
@@ -406,6 +403,16 @@ class PreviewManager:
     def cleanup(self):
         """清理资源"""
         try:
+            # 丢弃尚未完成的图片加载
+            self.image_loader.cancel()
+            self.image_widget = None
+
+            # 等待后台JSON解析结束，避免线程对象在运行中被销毁
+            self.json_request_id += 1
+            self.json_widget = None
+            for worker in list(self.json_workers):
+                worker.wait()
+
             # 停止音频播放并释放资源
             self.position_update_timer.stop()  # 停止定时器
             if self.media_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
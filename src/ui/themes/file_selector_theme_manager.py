@@ -2,24 +2,44 @@
 主题管理器
 """
 import logging
+import weakref
 
 from PyQt6.QtGui import QColor, QBrush
 from PyQt6.QtWidgets import QWidget
 
+from .theme_service import get_theme_service
+
 class ThemeManager:
     """主题管理器"""
     def __init__(self):
         self.last_theme_is_dark = False
         self.logger = logging.getLogger(__name__)
+        # 每个窗口已应用的主题，主题不变时不重复设置样式表
+        self.applied_themes = weakref.WeakKeyDictionary()
 
     def is_dark_mode(self, widget: QWidget) -> bool:
-        """检测系统是否处于深色模式"""
-        try:
-            palette = widget.main_window.palette()
-            return palette.window().color().lightness() < 128
-        except Exception as e:
-            self.logger.error(f"检测主题模式时出错: {str(e)}")
+        """检测当前是否使用深色主题（跟随主窗口）"""
+        return get_theme_service().is_dark
+
+    def apply_theme(self, widget: QWidget, is_dark: bool) -> bool:
+        """
+        应用主题，与窗口当前主题相同时跳过
+
+        Args:
+            widget: 目标窗口
+            is_dark: 是否使用深色主题
+
+        Returns:
+            bool: 是否重新设置了样式表
+        """
+        if self.applied_themes.get(widget) == is_dark:
             return False
+        if is_dark:
+            self.apply_dark_theme(widget)
+        else:
+            self.apply_light_theme(widget)
+        self.applied_themes[widget] = is_dark
+        return True
 
     def apply_dark_theme(self, widget: QWidget):
         """应用深色主题"""
@@ -156,22 +176,22 @@ class ThemeManager:
             # 更新表格样式
             if hasattr(widget, 'file_table'):
                 widget.file_table.setStyleSheet("""
-                    QTableWidget {
+                    QTableView {
                         background-color: #1e1e1e;
                         border: 1px solid #3c3c3c;
                         border-radius: 4px;
                         gridline-color: #3c3c3c;
                         color: #ffffff;
                     }
-                    QTableWidget::item {
+                    QTableView::item {
                         padding: 5px;
                         border-bottom: 1px solid #3c3c3c;
                     }
-                    QTableWidget::item:selected {
+                    QTableView::item:selected {
                         background-color: #3d3d3d;
                         color: #ffffff;
                     }
-                    QTableWidget::item:hover {
+                    QTableView::item:hover {
                         background-color: #3d3d3d;
                         color: #ffffff;
                     }
@@ -557,21 +577,21 @@ class ThemeManager:
             # 更新表格样式
             if hasattr(widget, 'file_table'):
                 widget.file_table.setStyleSheet("""
-                    QTableWidget {
+                    QTableView {
                         border: 1px solid #cccccc;
                         border-radius: 4px;
                         background-color: white;
                         color: #000000;
                     }
-                    QTableWidget::item {
+                    QTableView::item {
                         padding: 5px;
                         border-bottom: 1px solid #eeeeee;
                     }
-                    QTableWidget::item:selected {
+                    QTableView::item:selected {
                         background-color: #e6f3ff;
                         color: #0066cc;
                     }
-                    QTableWidget::item:hover {
+                    QTableView::item:hover {
                         background-color: #f5f5f5;
                         color: #000000;
                     }
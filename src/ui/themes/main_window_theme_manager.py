@@ -4,6 +4,7 @@
 import os
 from PyQt6.QtWidgets import QMessageBox
 from src.config.config_manager import ConfigManager
+from src.ui.themes.theme_service import get_theme_service
 
 class ThemeManager:
     """主题管理类"""
@@ -13,7 +14,13 @@ class ThemeManager:
         
         # 从配置加载主题模式
         self.theme_mode = self.config.get('theme_mode', 'auto')
+        self.theme_service = get_theme_service()
         self.last_theme_is_dark = self._get_current_theme_state()
+        # 已应用到窗口的主题，主题不变时不重复设置样式表
+        self.applied_theme_is_dark = None
+
+        # 系统配色变化时由主题服务通知，无需定时轮询
+        self.theme_service.system_theme_changed.connect(lambda _: self.check_theme_change())
 
     def _get_current_theme_state(self):
         """获取当前主题状态"""
@@ -26,8 +33,7 @@ class ThemeManager:
 
     def _is_system_dark_mode(self):
         """检测系统是否处于深色模式"""
-        palette = self.main_window.palette()
-        return palette.window().color().lightness() < 128
+        return self.theme_service.system_is_dark
 
     def check_theme_change(self):
         """检查系统主题是否发生变化（仅在auto模式下生效）"""
@@ -65,16 +71,9 @@ class ThemeManager:
         # 保存配置
         self.config.set('theme_mode', self.theme_mode)
         
-        # 更新主题状态
+        # 更新主题状态并应用
         self.last_theme_is_dark = self._get_current_theme_state()
-        
-        # 应用主题
-        if self.last_theme_is_dark:
-            self.apply_dark_theme()
-        else:
-            self.apply_light_theme()
-        
-        self.update_theme_icon()
+        self.update_theme()
 
     def update_theme_icon(self):
         """更新主题切换按钮图标和标签（使用emoji）"""
@@ -100,11 +99,15 @@ class ThemeManager:
     def update_theme(self):
         """更新主题样式"""
         is_dark = self.is_dark_mode()
-        if is_dark:
-            self.apply_dark_theme()
-        else:
-            self.apply_light_theme()
+        if is_dark != self.applied_theme_is_dark:
+            if is_dark:
+                self.apply_dark_theme()
+            else:
+                self.apply_light_theme()
+            self.applied_theme_is_dark = is_dark
         self.update_theme_icon()
+        # 通知其他窗口跟随主窗口切换主题
+        self.theme_service.set_dark(is_dark)
 
     def apply_dark_theme(self):
         """应用深色主题"""
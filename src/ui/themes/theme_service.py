@@ -0,0 +1,87 @@
+"""
+全局主题服务
+由主窗口决定当前使用深色还是浅色主题，各窗口订阅 theme_changed 信号更新样式，
+系统配色变化通过 Qt 事件通知，不再由每个窗口各自用定时器轮询调色板
+"""
+import logging
+from typing import Optional
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from PyQt6.QtGui import QGuiApplication
+
+logger = logging.getLogger(__name__)
+
+
+def detect_system_dark_mode() -> bool:
+    """
+    检测系统是否处于深色模式
+
+    Returns:
+        bool: 是否为深色模式
+    """
+    app = QGuiApplication.instance()
+    if app is None:
+        return False
+    # Qt 6.5 以上可以直接读取系统配色方案
+    style_hints = QGuiApplication.styleHints()
+    if hasattr(style_hints, "colorScheme"):
+        scheme = style_hints.colorScheme()
+        if scheme != Qt.ColorScheme.Unknown:
+            return scheme == Qt.ColorScheme.Dark
+    # 使用应用程序调色板判断，不受窗口自身样式表的影响
+    return QGuiApplication.palette().window().color().lightness() < 128
+
+
+class ThemeService(QObject):
+    """全局主题服务"""
+    theme_changed = pyqtSignal(bool)  # 当前主题变化，参数为是否深色
+    system_theme_changed = pyqtSignal(bool)  # 系统配色变化，参数为系统是否深色
+
+    def __init__(self):
+        super().__init__()
+        self.is_dark = False
+        self.system_is_dark = detect_system_dark_mode()
+
+        style_hints = QGuiApplication.styleHints()
+        if hasattr(style_hints, "colorSchemeChanged"):
+            style_hints.colorSchemeChanged.connect(self.refresh_system_theme)
+
+    def refresh_system_theme(self, *args):
+        """重新检测系统配色，发生变化时发出 system_theme_changed 信号"""
+        try:
+            current_is_dark = detect_system_dark_mode()
+        except Exception as e:
+            logger.error(f"检测系统主题时出错: {str(e)}")
+            return
+        if current_is_dark != self.system_is_dark:
+            self.system_is_dark = current_is_dark
+            logger.info(f"系统主题已切换为{'深色' if current_is_dark else '浅色'}")
+            self.system_theme_changed.emit(current_is_dark)
+
+    def set_dark(self, is_dark: bool):
+        """
+        设置当前主题，只有真正变化时才通知各窗口
+
+        Args:
+            is_dark: 是否使用深色主题
+        """
+        if is_dark == self.is_dark:
+            return
+        self.is_dark = is_dark
+        self.theme_changed.emit(is_dark)
+
+
+_service: Optional[ThemeService] = None
+
+
+def get_theme_service() -> ThemeService:
+    """
+    获取全局主题服务，首次调用时创建（必须在 QApplication 创建之后、GUI线程中调用）
+
+    Returns:
+        ThemeService: 主题服务
+    """
+    global _service
+    if _service is None:
+        _service = ThemeService()
+    return _service
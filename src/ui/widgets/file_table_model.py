@@ -0,0 +1,204 @@
+"""
+资源文件列表模型
+文件列表使用 模型/视图 结构，搜索、类型筛选和排序由代理模型完成，
+替换状态的颜色通过 data() 角色提供，不再在每次刷新时重建所有表格项
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PyQt6.QtGui import QBrush, QColor
+
+# 文件信息 (名称, 类型, 路径)，与替换文件字典的键一致
+FileInfo = Tuple[str, str, str]
+
+# 存放文件信息的数据角色
+FILE_INFO_ROLE = Qt.ItemDataRole.UserRole + 1
+
+# 排序使用的原始值角色（路径ID、大小按数值排序）
+SORT_ROLE = Qt.ItemDataRole.UserRole + 2
+
+COLUMN_NAME = 0
+COLUMN_TYPE = 1
+COLUMN_PATH_ID = 2
+COLUMN_SIZE = 3
+
+HEADERS = ["名称", "类型", "路径ID", "大小"]
+
+# (背景色, 文本色)
+_REPLACED_COLORS = {True: ("#1a3a1a", "#4caf50"), False: ("#e8f5e9", "#2e7d32")}
+_NORMAL_COLORS = {True: ("#1e1e1e", "#ffffff"), False: ("#ffffff", "#000000")}
+
+
+class FileTableModel(QAbstractTableModel):
+    """资源文件列表模型"""
+
+    def __init__(self, files: List[Dict], replace_files: Dict[FileInfo, str],
+                 size_formatter: Callable[[int], str], parent=None):
+        """
+        初始化模型
+
+        Args:
+            files: 扫描得到的文件列表
+            replace_files: 替换文件字典（与对话框共用同一个对象）
+            size_formatter: 文件大小格式化函数
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.replace_files = replace_files
+        self.size_formatter = size_formatter
+        self.dark_mode = False
+        self.files: List[Dict] = []
+        self.file_infos: List[FileInfo] = []
+        self.search_keys: List[str] = []
+        self.set_files(files)
+
+    def set_files(self, files: List[Dict]):
+        """
+        替换全部文件
+
+        Args:
+            files: 文件列表
+        """
+        self.beginResetModel()
+        self.files = list(files)
+        self.file_infos = [(file["name"], file["type"], file["path"]) for file in self.files]
+        # 预先转为小写，筛选时不再重复计算
+        self.search_keys = [file["name"].lower() for file in self.files]
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.files)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsDragEnabled
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        file = self.files[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == COLUMN_NAME:
+                return file["name"].replace(f"_{file['path_id']}", "")
+            if column == COLUMN_TYPE:
+                return file["type"]
+            if column == COLUMN_PATH_ID:
+                return str(file["path_id"])
+            return self.size_formatter(file["size"])
+
+        if role == SORT_ROLE:
+            if column == COLUMN_PATH_ID:
+                return file["path_id"]
+            if column == COLUMN_SIZE:
+                return file["size"]
+            return self.data(index, Qt.ItemDataRole.DisplayRole)
+
+        if role == FILE_INFO_ROLE:
+            return self.file_infos[index.row()]
+
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return (f"完整文件名: {file['name']}\n"
+                    f"类型: {file['type']}\n"
+                    f"路径ID: {file['path_id']}\n"
+                    f"大小: {self.size_formatter(file['size'])}\n"
+                    f"路径: {file['path']}")
+
+        if role in (Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ForegroundRole):
+            colors = _REPLACED_COLORS if self.file_infos[index.row()] in self.replace_files else _NORMAL_COLORS
+            background, foreground = colors[self.dark_mode]
+            return QBrush(QColor(background if role == Qt.ItemDataRole.BackgroundRole else foreground))
+
+        return None
+
+    def set_dark_mode(self, dark_mode: bool):
+        """
+        切换深色/浅色配色
+
+        Args:
+            dark_mode: 是否为深色模式
+        """
+        self.dark_mode = dark_mode
+        self.refresh()
+
+    def refresh(self):
+        """通知视图重新读取所有行的显示数据（只重绘可见行）"""
+        if self.files:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.files) - 1, len(HEADERS) - 1))
+
+    def refresh_file(self, file_info: FileInfo):
+        """
+        刷新单个文件所在行，用于标记替换后更新颜色
+
+        Args:
+            file_info: 文件信息
+        """
+        try:
+            row = self.file_infos.index(file_info)
+        except ValueError:
+            return
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1))
+
+    def row_of_path_id(self, path_id) -> Optional[int]:
+        """
+        查找路径ID所在的行
+
+        Args:
+            path_id: 对象的路径ID
+
+        Returns:
+            Optional[int]: 行号，不存在时返回None
+        """
+        for row, file in enumerate(self.files):
+            if str(file["path_id"]) == str(path_id):
+                return row
+        return None
+
+
+class FileFilterProxyModel(QSortFilterProxyModel):
+    """按文件类型和搜索文本筛选的代理模型"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.type_filter = "All"
+        self.search_text = ""
+        self.setSortRole(SORT_ROLE)
+
+    def set_type_filter(self, type_name: str):
+        """
+        设置文件类型筛选
+
+        Args:
+            type_name: 文件类型，All 表示全部
+        """
+        if type_name != self.type_filter:
+            self.type_filter = type_name
+            self.invalidateFilter()
+
+    def set_search_text(self, text: str):
+        """
+        设置搜索文本（不区分大小写）
+
+        Args:
+            text: 搜索文本
+        """
+        text = text.lower()
+        if text != self.search_text:
+            self.search_text = text
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        model = self.sourceModel()
+        if self.type_filter != "All" and model.files[source_row]["type"] != self.type_filter:
+            return False
+        return not self.search_text or self.search_text in model.search_keys[source_row]
@@ -1,45 +1,115 @@
 """
 JSON语法高亮器
+只为可见区域附近的文本块着色，滚动时再补充着色；每个文本块只用一个组合正则扫描一遍，
+文档超过大小阈值时自动退化为纯文本
 """
-from PyQt6.QtCore import QRegularExpression
+from PyQt6.QtCore import QPoint, QRegularExpression, QTimer
 from PyQt6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont
 
+# 超过该字符数时停止高亮
+HIGHLIGHT_CHAR_LIMIT = 5 * 1024 * 1024
+
+# 可见区域上下额外着色的文本块数，减少滚动时的闪烁
+VIEWPORT_MARGIN_BLOCKS = 50
+
+# 滚动停止多久后为新进入可见区域的文本块着色（毫秒）
+UPDATE_DELAY_MS = 30
+
+# 已着色文本块的状态值
+HIGHLIGHTED_STATE = 1
+
+# 一次扫描识别字符串、数字和关键字
+_TOKEN_PATTERN = QRegularExpression(
+    r'(?<string>"[^"\\]*(?:\\.[^"\\]*)*")'
+    r'|(?<number>-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b)'
+    r'|(?<keyword>\b(?:true|false|null)\b)'
+)
+
+
 class JsonHighlighter(QSyntaxHighlighter):
-    """JSON语法高亮器"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.highlighting_rules = []
+    """JSON语法高亮器（仅可见区域）"""
+    def __init__(self, editor):
+        """
+        初始化高亮器
+
+        Args:
+            editor: 需要高亮的 QTextEdit
+        """
+        super().__init__(editor.document())
+        self.editor = editor
+        self.text_document = editor.document()
+        self.first_block = 0
+        self.last_block = VIEWPORT_MARGIN_BLOCKS * 2
 
         # 字符串格式
         string_format = QTextCharFormat()
         string_format.setForeground(QColor("#008000"))  # 绿色
-        self.highlighting_rules.append((
-            QRegularExpression(r'"[^"\\]*(\\.[^"\\]*)*"'), string_format
-        ))
 
         # 数字格式
         number_format = QTextCharFormat()
         number_format.setForeground(QColor("#0000FF"))  # 蓝色
-        self.highlighting_rules.append((
-            QRegularExpression(r'\b[0-9]+\b'), number_format
-        ))
 
         # 关键字格式
         keyword_format = QTextCharFormat()
         keyword_format.setForeground(QColor("#FF0000"))  # 红色
         keyword_format.setFontWeight(QFont.Weight.Bold)
-        keywords = ["true", "false", "null"]
-        for word in keywords:
-            pattern = QRegularExpression(f"\\b{word}\\b")
-            self.highlighting_rules.append((pattern, keyword_format))
+
+        self.token_formats = [("string", string_format), ("number", number_format), ("keyword", keyword_format)]
+
+        # 滚动、改变大小或内容变化后更新可见区域
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.setInterval(UPDATE_DELAY_MS)
+        self.update_timer.timeout.connect(self.update_visible_blocks)
+        editor.verticalScrollBar().valueChanged.connect(self.update_timer.start)
+        editor.verticalScrollBar().rangeChanged.connect(self.update_timer.start)
+        self.text_document.contentsChanged.connect(self.on_contents_changed)
+
+    def is_too_large(self) -> bool:
+        """文档是否超过高亮的大小阈值"""
+        return self.text_document.characterCount() > HIGHLIGHT_CHAR_LIMIT
+
+    def on_contents_changed(self):
+        """内容变化时按大小切换高亮或纯文本"""
+        if self.is_too_large():
+            if self.document() is not None:
+                self.setDocument(None)
+            return
+        if self.document() is None:
+            # 重新挂载时只有可见区域会被着色
+            self.setDocument(self.text_document)
+        self.update_timer.start()
+
+    def update_visible_blocks(self):
+        """为可见区域附近尚未着色的文本块着色"""
+        if self.document() is None:
+            return
+        viewport = self.editor.viewport()
+        top = self.editor.cursorForPosition(QPoint(0, 0)).block().blockNumber()
+        bottom = self.editor.cursorForPosition(QPoint(0, viewport.height() - 1)).block().blockNumber()
+        self.first_block = max(0, top - VIEWPORT_MARGIN_BLOCKS)
+        self.last_block = bottom + VIEWPORT_MARGIN_BLOCKS
+
+        block = self.text_document.findBlockByNumber(self.first_block)
+        while block.isValid() and block.blockNumber() <= self.last_block:
+            if block.userState() != HIGHLIGHTED_STATE:
+                self.rehighlightBlock(block)
+            block = block.next()
 
     def highlightBlock(self, text):
-        """应用高亮规则"""
-        for pattern, format in self.highlighting_rules:
-            expression = pattern
-            match = expression.match(text)
-            while match.hasMatch():
-                start = match.capturedStart()
-                length = match.capturedLength()
-                self.setFormat(start, length, format)
-                match = expression.match(text, start + length) 
\ No newline at end of file
+        """为可见区域内的文本块应用高亮"""
+        block_number = self.currentBlock().blockNumber()
+        if self.is_too_large() or not self.first_block <= block_number <= self.last_block:
+            # 不在可见区域的文本块保持未着色，滚动到时再处理
+            self.setCurrentBlockState(-1)
+            return
+
+        matches = _TOKEN_PATTERN.globalMatch(text)
+        while matches.hasNext():
+            match = matches.next()
+            for name, token_format in self.token_formats:
+                start = match.capturedStart(name)
+                if start >= 0:
+                    self.setFormat(start, match.capturedLength(name), token_format)
+                    break
+        self.setCurrentBlockState(HIGHLIGHTED_STATE)
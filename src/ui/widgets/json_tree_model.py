@@ -0,0 +1,138 @@
+"""
+JSON树形模型
+子节点在展开时才创建，大数组和大对象按批次加载，超大的 MonoBehaviour 类型树也能即时显示
+"""
+from typing import Any, List, Optional
+
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex
+
+# 每次展开最多创建的子节点数，滚动到末尾时继续加载
+FETCH_BATCH_SIZE = 500
+
+# 值列中字符串的最大显示长度
+MAX_VALUE_TEXT = 200
+
+HEADERS = ["键", "值"]
+
+
+class _JsonNode:
+    """JSON树节点，子节点按需创建"""
+    __slots__ = ("key", "value", "parent", "row", "children", "items")
+
+    def __init__(self, key: str, value: Any, parent: Optional["_JsonNode"], row: int):
+        self.key = key
+        self.value = value
+        self.parent = parent
+        self.row = row
+        self.children: List["_JsonNode"] = []
+        # 容器的 (键, 值) 序列，第一次展开时才生成
+        self.items: Optional[list] = None
+
+    @property
+    def is_container(self) -> bool:
+        return isinstance(self.value, (dict, list)) and len(self.value) > 0
+
+    @property
+    def total(self) -> int:
+        return len(self.value) if self.is_container else 0
+
+    def fetch(self, count: int) -> List["_JsonNode"]:
+        """创建接下来的 count 个子节点"""
+        if self.items is None:
+            if isinstance(self.value, dict):
+                self.items = list(self.value.items())
+            else:
+                self.items = [(f"[{i}]", item) for i, item in enumerate(self.value)]
+        start = len(self.children)
+        new_nodes = [_JsonNode(str(key), value, self, start + offset)
+                     for offset, (key, value) in enumerate(self.items[start:start + count])]
+        self.children.extend(new_nodes)
+        return new_nodes
+
+
+def _describe(value: Any) -> str:
+    """生成值列的显示文本"""
+    if isinstance(value, dict):
+        return f"{{{len(value)}}}"
+    if isinstance(value, list):
+        return f"[{len(value)}]"
+    if isinstance(value, str):
+        text = value if len(value) <= MAX_VALUE_TEXT else value[:MAX_VALUE_TEXT] + "…"
+        return f'"{text}"'
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+class JsonTreeModel(QAbstractItemModel):
+    """JSON树形模型"""
+
+    def __init__(self, data: Any, parent=None):
+        """
+        初始化模型
+
+        Args:
+            data: json.loads 得到的数据
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.root = _JsonNode("", data, None, 0)
+
+    def _node(self, index: QModelIndex) -> _JsonNode:
+        return index.internalPointer() if index.isValid() else self.root
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self._node(parent)
+        if row < 0 or row >= len(node.children) or column < 0 or column >= len(HEADERS):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent_node = index.internalPointer().parent
+        if parent_node is None or parent_node is self.root:
+            return QModelIndex()
+        return self.createIndex(parent_node.row, 0, parent_node)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self._node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(HEADERS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        return self._node(parent).is_container
+
+    def canFetchMore(self, parent):
+        node = self._node(parent)
+        return len(node.children) < node.total
+
+    def fetchMore(self, parent):
+        node = self._node(parent)
+        start = len(node.children)
+        count = min(FETCH_BATCH_SIZE, node.total - start)
+        if count <= 0:
+            return
+        self.beginInsertRows(parent, start, start + count - 1)
+        node.fetch(count)
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return node.key if index.column() == 0 else _describe(node.value)
+        if role == Qt.ItemDataRole.ToolTipRole and index.column() == 1 and isinstance(node.value, str):
+            return node.value[:4096]
+        return None
@@ -2,20 +2,87 @@
 AB文件有效性检验工具类
 用于验证文件是否为有效的Unity资源包
 """
+import os
 from pathlib import Path
-from typing import Union, Tuple
+from typing import Union, Tuple, Iterable, Iterator
 import logging
-from binascii import hexlify
+
+from src.utils.signature_scanner import find_signature, find_signature_offsets
 
 
 class BundleValidator:
     """AB文件有效性检验工具"""
 
+    # 签名检查读取的头部大小（加密文件的Unity标识可能不在开头）
+    HEADER_READ_SIZE = 1024
+    # 小于该大小的文件不可能是资源包（UnityFS文件头本身就超过该长度）
+    MIN_BUNDLE_SIZE = 32
+    # 已知不是资源包的扩展名，枚举时直接跳过
+    NON_BUNDLE_EXTENSIONS = frozenset({
+        ".meta", ".manifest", ".json", ".txt", ".xml", ".log", ".ini", ".md",
+        ".dll", ".exe", ".so", ".pdb", ".py", ".pyc",
+        ".png", ".jpg", ".jpeg", ".webp", ".mp4", ".usm", ".acb", ".awb", ".wem", ".bnk",
+        ".zip", ".7z", ".rar",
+    })
+
     def __init__(self):
         """初始化验证器"""
         self.logger = logging.getLogger(__name__)
-        # Unity资源包的标识字符串的十六进制表示
-        self.unity_signature = b"556e6974794653"  # "UnityFS" in hex
+        # Unity资源包的标识字符串
+        self.unity_signature = b"UnityFS"
+
+    def iter_candidates(self, paths: Iterable[Union[str, Path]]) -> Iterator[str]:
+        """
+        使用os.scandir枚举可能是资源包的文件
+        按大小和扩展名预先过滤，不读取文件内容
+
+        Args:
+            paths: 文件或目录路径列表，目录会递归枚举
+
+        Yields:
+            str: 候选文件路径
+        """
+        for path in paths:
+            path = os.fspath(path)
+            if os.path.isfile(path):
+                yield path
+                continue
+
+            stack = [path]
+            while stack:
+                current = stack.pop()
+                try:
+                    with os.scandir(current) as entries:
+                        for entry in entries:
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    stack.append(entry.path)
+                                elif entry.is_file():
+                                    if os.path.splitext(entry.name)[1].lower() in self.NON_BUNDLE_EXTENSIONS:
+                                        continue
+                                    if entry.stat().st_size < self.MIN_BUNDLE_SIZE:
+                                        continue
+                                    yield entry.path
+                            except OSError:
+                                continue
+                except OSError as e:
+                    self.logger.warning(f"无法读取目录 {current}: {str(e)}")
+
+    def has_unity_signature(self, file_path: Union[str, Path]) -> bool:
+        """
+        快速检查文件头部是否包含Unity标识，不记录错误日志
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            bool: 是否包含Unity标识
+        """
+        try:
+            with open(file_path, "rb") as f:
+                return f.read(self.HEADER_READ_SIZE).find(self.unity_signature) != -1
+        except OSError:
+            return False
 
     def is_valid_bundle(self, file_path: Union[str, Path]) -> Tuple[bool, str]:
         """
@@ -36,16 +103,13 @@ class BundleValidator:
 
             with open(file_path, "rb") as f:
                 # 读取文件头部数据
-                header_data = f.read(1024)  # 读取前1KB数据进行检查
+                header_data = f.read(self.HEADER_READ_SIZE)  # 读取前1KB数据进行检查
                 if not header_data:
                     return False, "文件为空"
 
-                # 转换为十六进制字符串
-                hex_data = hexlify(header_data)
-
                 # 查找Unity标识
                 # 如果文件经过加密，可能不在文件开头
-                if self.unity_signature not in hex_data:
+                if header_data.find(self.unity_signature) == -1:
                     return False, "未找到Unity资源包标识"
 
                 return True, ""
@@ -66,17 +130,7 @@ class BundleValidator:
             如果未找到返回-1
         """
         try:
-            with open(file_path, "rb") as f:
-                file_data = f.read()
-                hex_data = hexlify(file_data)
-
-                # 查找Unity标识位置
-                position = hex_data.find(self.unity_signature)
-                if position != -1:
-                    # 因为是十六进制字符串，所以实际位置需要除以2
-                    return position // 2
-                return -1
-
+            return find_signature(file_path)
         except Exception as e:
             self.logger.error(f"获取Unity标识位置时出错: {str(e)}")
             return -1
@@ -93,28 +147,37 @@ class BundleValidator:
             包含以下字段:
             - valid: 是否有效
             - header_position: Unity标识位置
+            - embedded_header_position: 第二个Unity标识位置（交错加密），没有时为-1
             - encrypted: 是否加密
             - error: 错误信息
         """
         result = {
             "valid": False,
             "header_position": -1,
+            "embedded_header_position": -1,
             "encrypted": False,
             "error": ""
         }
 
         try:
-            is_valid, error = self.is_valid_bundle(file_path)
-            if not is_valid:
-                result["error"] = error
+            if not Path(file_path).is_file():
+                result["error"] = "文件不存在"
+                return result
+
+            # 一次扫描同时获取两个文件头位置
+            offsets = find_signature_offsets(file_path, max_count=2)
+            if not offsets or offsets[0] >= self.HEADER_READ_SIZE:
+                result["error"] = "未找到Unity资源包标识"
                 return result
 
-            header_pos = self.get_unity_header_position(file_path)
-            result["header_position"] = header_pos
+            result["header_position"] = offsets[0]
+            if len(offsets) >= 2:
+                result["embedded_header_position"] = offsets[1]
             result["valid"] = True
-            result["encrypted"] = header_pos > 0  # 如果标识不在开头，则认为是加密的
+            # 如果标识不在开头或存在第二个文件头，则认为是加密的
+            result["encrypted"] = offsets[0] > 0 or len(offsets) >= 2
 
         except Exception as e:
             result["error"] = str(e)
 
-        return result
\ No newline at end of file
+        return result
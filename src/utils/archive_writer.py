@@ -0,0 +1,165 @@
+"""
+流式压缩包输出
+提取大量对象时直接把内容写入单个 ZIP 或 tar 文件，不在磁盘上生成中间文件:
+    .zip            每个条目单独选择压缩方式，PNG、音频等已压缩格式直接存储，其余使用 Deflate
+    .tar            不压缩，顺序写入
+    .tar.gz / .tgz  整体 gzip 压缩
+
+较大的条目分块写入，不会在内存中额外生成一份完整的压缩结果；
+写入过程中输出到 .partial 文件，关闭时才改名为目标文件
+"""
+import io
+import os
+import tarfile
+import threading
+import time
+import zipfile
+from typing import Optional
+
+# 已压缩的格式，再次 Deflate 几乎不会变小，直接存储
+STORED_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".webp", ".gif",
+    ".ogg", ".mp3", ".m4a", ".aac", ".fsb",
+    ".zip", ".7z", ".gz", ".rar",
+    ".ab", ".bundle",
+}
+
+# 分块写入的大小
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz")
+
+
+def is_archive_path(path: str) -> bool:
+    """
+    路径是否为支持的压缩包格式
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        bool: 是否支持
+    """
+    return path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+class ArchiveWriter:
+    """流式压缩包写入器（线程安全，条目按调用顺序写入）"""
+
+    def __init__(self, output_path: str):
+        """
+        创建压缩包，格式由扩展名决定
+
+        Args:
+            output_path: 输出文件路径（.zip / .tar / .tar.gz / .tgz）
+
+        Raises:
+            ValueError: 不支持的格式
+        """
+        lower_path = output_path.lower()
+        if lower_path.endswith(".zip"):
+            self.format = "zip"
+        elif lower_path.endswith((".tar.gz", ".tgz")):
+            self.format = "tar.gz"
+        elif lower_path.endswith(".tar"):
+            self.format = "tar"
+        else:
+            raise ValueError(f"不支持的压缩包格式: {output_path}")
+
+        self.output_path = output_path
+        self.partial_path = f"{output_path}.partial"
+        self.lock = threading.Lock()
+        self.entry_count = 0
+        self.closed = False
+
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        if self.format == "zip":
+            self.archive = zipfile.ZipFile(self.partial_path, "w", allowZip64=True)
+        else:
+            self.archive = tarfile.open(self.partial_path, "w:gz" if self.format == "tar.gz" else "w")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @staticmethod
+    def compress_type(arcname: str) -> int:
+        """
+        ZIP 条目的压缩方式
+
+        Args:
+            arcname: 条目名称
+
+        Returns:
+            int: zipfile.ZIP_STORED 或 zipfile.ZIP_DEFLATED
+        """
+        if os.path.splitext(arcname)[1].lower() in STORED_EXTENSIONS:
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+
+    def add_bytes(self, arcname: str, data: bytes):
+        """
+        写入一个条目
+
+        Args:
+            arcname: 条目名称，使用 / 分隔目录
+            data: 条目内容
+        """
+        arcname = arcname.replace("\\", "/")
+        with self.lock:
+            if self.format == "zip":
+                info = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+                info.compress_type = self.compress_type(arcname)
+                info.external_attr = 0o644 << 16
+                # 预先设置大小，超过 4GB 时自动使用 ZIP64
+                info.file_size = len(data)
+                view = memoryview(data)
+                with self.archive.open(info, "w") as entry:
+                    for offset in range(0, len(view), STREAM_CHUNK_SIZE):
+                        entry.write(view[offset:offset + STREAM_CHUNK_SIZE])
+            else:
+                info = tarfile.TarInfo(arcname)
+                info.size = len(data)
+                info.mtime = int(time.time())
+                info.mode = 0o644
+                self.archive.addfile(info, io.BytesIO(data))
+            self.entry_count += 1
+
+    def close(self):
+        """完成写入并改名为目标文件"""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.archive.close()
+            os.replace(self.partial_path, self.output_path)
+
+    def abort(self):
+        """放弃写入并删除未完成的文件"""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            try:
+                self.archive.close()
+            finally:
+                if os.path.exists(self.partial_path):
+                    os.remove(self.partial_path)
+
+
+def open_archive(output_path: str) -> Optional[ArchiveWriter]:
+    """
+    输出路径为压缩包时创建写入器
+
+    Args:
+        output_path: 输出路径
+
+    Returns:
+        Optional[ArchiveWriter]: 写入器，输出路径不是压缩包时返回None
+    """
+    return ArchiveWriter(output_path) if is_archive_path(output_path) else None
@@ -0,0 +1,115 @@
+"""
+全局线程池注册表
+按任务类型提供进程内共享的线程池，首次使用时才创建，避免导入模块时就启动线程，
+也避免多个批量功能同时运行时各自创建线程池导致线程过多
+
+    IO_POOL: 以磁盘读写为主的任务（文件移动、签名检查等）
+    CPU_POOL: 以计算为主的任务（资源包解析、图片解码等）
+"""
+import atexit
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+IO_POOL = "io"
+CPU_POOL = "cpu"
+
+logger = logging.getLogger(__name__)
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_overrides: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def default_pool_size(kind: str) -> int:
+    """
+    获取线程池的默认大小
+
+    Args:
+        kind: 线程池类型
+
+    Returns:
+        int: 线程数
+    """
+    cpu_count = os.cpu_count() or 4
+    if kind == IO_POOL:
+        # 磁盘带宽有限，线程过多只会增加寻道和竞争
+        return min(8, cpu_count)
+    return cpu_count
+
+
+def pool_size(kind: str) -> int:
+    """
+    按 覆盖值 > 配置文件 > 默认值 的顺序确定线程池大小，进程池也使用同样的大小
+
+    Args:
+        kind: 线程池类型
+
+    Returns:
+        int: 线程数
+    """
+    if kind in _overrides:
+        return _overrides[kind]
+    try:
+        from src.config.config_manager import ConfigManager
+        size = ConfigManager().get(f"{kind}_workers", 0)
+        if size and size > 0:
+            return int(size)
+    except Exception as e:
+        logger.debug(f"读取线程池配置失败，使用默认值: {str(e)}")
+    return default_pool_size(kind)
+
+
+def configure(kind: str, max_workers: int):
+    """
+    指定线程池大小，需要在线程池创建前调用，例如命令行参数
+
+    Args:
+        kind: 线程池类型
+        max_workers: 线程数
+    """
+    with _lock:
+        if kind in _executors:
+            logger.warning(f"线程池 {kind} 已创建，新的大小将在下次创建时生效")
+        _overrides[kind] = max(1, max_workers)
+
+
+def get_executor(kind: str = IO_POOL) -> ThreadPoolExecutor:
+    """
+    获取共享线程池，不存在时创建
+
+    Args:
+        kind: 线程池类型，IO_POOL 或 CPU_POOL
+
+    Returns:
+        ThreadPoolExecutor: 共享线程池，调用方不能关闭
+    """
+    with _lock:
+        executor = _executors.get(kind)
+        if executor is None:
+            max_workers = pool_size(kind)
+            executor = ThreadPoolExecutor(max_workers=max_workers,
+                                          thread_name_prefix=f"{kind.capitalize()}Pool")
+            _executors[kind] = executor
+            logger.debug(f"创建线程池 {kind}，线程数: {max_workers}")
+        return executor
+
+
+def shutdown_executors(wait: bool = True, cancel_futures: bool = False):
+    """
+    关闭所有共享线程池，之后再次获取会重新创建
+
+    Args:
+        wait: 是否等待正在执行的任务完成
+        cancel_futures: 是否取消尚未开始的任务
+    """
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+atexit.register(shutdown_executors, wait=False, cancel_futures=True)
@@ -0,0 +1,28 @@
+"""
+文件哈希工具
+"""
+import hashlib
+from pathlib import Path
+from typing import Union
+
+# 计算数据哈希时每次读取的大小
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: Union[str, Path], start: int = 0) -> str:
+    """
+    分块计算文件从 start 开始的数据哈希
+
+    Args:
+        file_path: 文件路径
+        start: 起始偏移
+
+    Returns:
+        str: sha1 十六进制字符串
+    """
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
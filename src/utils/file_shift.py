@@ -0,0 +1,116 @@
+"""
+文件原地移位工具
+在文件开头原地去除或插入文件头，数据按固定窗口分块移动，
+内存占用只与窗口大小有关，与文件大小无关
+"""
+import os
+from pathlib import Path
+from typing import Union
+
+# 每次移动的数据块大小
+SHIFT_WINDOW = 1024 * 1024
+
+# 使用 copy_file_range 的最小偏移，偏移过小时单次拷贝量太小，不如分块读写
+COPY_FILE_RANGE_MIN_OFFSET = 64 * 1024
+
+
+def _shift_with_copy_file_range(fd: int, src: int, dst: int, size: int, window: int) -> int:
+    """
+    使用 copy_file_range 在内核中移动数据
+
+    同一文件内源区间与目标区间不能重叠，因此每次拷贝量不超过 src - dst
+
+    Returns:
+        int: 已移动到的源偏移，文件系统不支持时可从该位置继续分块读写
+    """
+    step = min(window, src - dst)
+    while src < size:
+        try:
+            copied = os.copy_file_range(fd, fd, min(step, size - src), src, dst)
+        except OSError:
+            return src
+        if copied == 0:
+            return src
+        src += copied
+        dst += copied
+    return src
+
+
+def _shift_with_buffer(f, src: int, dst: int, size: int, window: int):
+    """分块读写移动数据，读取位置始终在写入位置之后，不会覆盖未读数据"""
+    while src < size:
+        f.seek(src)
+        chunk = f.read(min(window, size - src))
+        if not chunk:
+            raise IOError(f"读取数据意外结束: {src}/{size}")
+        f.seek(dst)
+        f.write(chunk)
+        src += len(chunk)
+        dst += len(chunk)
+
+
+def strip_prefix_in_place(file_path: Union[str, Path], offset: int, window: int = SHIFT_WINDOW) -> int:
+    """
+    原地去除文件开头的 offset 个字节
+
+    注意: 移动过程中断会导致文件损坏，调用方需要保证可以重新获取原始文件
+
+    Args:
+        file_path: 文件路径
+        offset: 要去除的字节数
+        window: 每次移动的数据块大小
+
+    Returns:
+        int: 处理后的文件大小
+    """
+    with open(file_path, "r+b") as f:
+        size = os.fstat(f.fileno()).st_size
+        if offset <= 0:
+            return size
+        if offset >= size:
+            f.truncate(0)
+            return 0
+
+        src = offset
+        if hasattr(os, "copy_file_range") and offset >= COPY_FILE_RANGE_MIN_OFFSET:
+            src = _shift_with_copy_file_range(f.fileno(), src, 0, size, window)
+        # 不支持 copy_file_range 或中途失败时，从当前位置继续分块读写
+        _shift_with_buffer(f, src, src - offset, size, window)
+
+        new_size = size - offset
+        f.truncate(new_size)
+        return new_size
+
+
+def insert_prefix_in_place(file_path: Union[str, Path], prefix: bytes, window: int = SHIFT_WINDOW) -> int:
+    """
+    原地在文件开头插入 prefix，原有数据整体后移
+
+    从文件末尾开始向前分块移动，写入位置始终在读取位置之后，不会覆盖未读数据
+
+    Args:
+        file_path: 文件路径
+        prefix: 要插入的数据
+        window: 每次移动的数据块大小
+
+    Returns:
+        int: 处理后的文件大小
+    """
+    offset = len(prefix)
+    with open(file_path, "r+b") as f:
+        size = os.fstat(f.fileno()).st_size
+        if offset == 0:
+            return size
+
+        end = size
+        while end > 0:
+            start = max(0, end - window)
+            f.seek(start)
+            chunk = f.read(end - start)
+            f.seek(start + offset)
+            f.write(chunk)
+            end = start
+
+        f.seek(0)
+        f.write(prefix)
+        return size + offset
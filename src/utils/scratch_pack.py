@@ -0,0 +1,226 @@
+"""
+扫描输出的打包存储
+扫描资源包时把所有对象的导出内容追加写入临时目录中的单个 scan.pack 文件，并在内存中记录偏移索引，
+避免为每个对象创建一个小文件（在有实时杀毒扫描或 overlay 文件系统的磁盘上创建文件的开销远大于写入）
+
+文件信息中的路径保持为 临时目录/文件名 的形式，读取时通过本模块的函数访问:
+    exists(path)      文件是否存在（真实文件或包内记录）
+    read_bytes(path)  读取内容
+    local_path(path)  需要真实文件时（预览、拖拽、打开所在位置）在原路径写出文件，计入临时目录占用
+    write_bytes(path, data)  编辑保存时在原路径写入文件，计入临时目录占用
+
+真实文件优先于包内记录，编辑保存后的内容通过 write_bytes 写到原路径即可
+"""
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+PACK_FILE_NAME = "scan.pack"
+
+
+class ScratchPack:
+    """单个临时目录的打包存储（只追加）"""
+
+    def __init__(self, directory: str):
+        """
+        创建打包存储
+
+        Args:
+            directory: 临时目录
+        """
+        self.directory = os.path.abspath(directory)
+        self.pack_path = os.path.join(self.directory, PACK_FILE_NAME)
+        self.lock = threading.Lock()
+        # 相对路径 -> (偏移, 长度)
+        self.index: Dict[str, Tuple[int, int]] = {}
+        self.file = open(self.pack_path, "w+b")
+
+    def add(self, path: str, data: bytes) -> str:
+        """
+        追加一个文件
+
+        Args:
+            path: 文件路径（位于临时目录下）
+            data: 文件内容
+
+        Returns:
+            str: 文件路径（不会创建真实文件）
+        """
+        name = os.path.relpath(os.path.abspath(path), self.directory)
+        with self.lock:
+            self.file.seek(0, os.SEEK_END)
+            offset = self.file.tell()
+            self.file.write(data)
+            self.index[name] = (offset, len(data))
+        return path
+
+    def contains(self, name: str) -> bool:
+        return name in self.index
+
+    def read(self, name: str) -> bytes:
+        """
+        读取包内文件
+
+        Args:
+            name: 相对临时目录的路径
+
+        Returns:
+            bytes: 文件内容
+        """
+        with self.lock:
+            offset, length = self.index[name]
+            self.file.flush()
+            self.file.seek(offset)
+            return self.file.read(length)
+
+    def close(self):
+        """关闭打包文件"""
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+
+_packs: Dict[str, ScratchPack] = {}
+_lock = threading.Lock()
+
+
+def open_pack(directory: str) -> ScratchPack:
+    """
+    为临时目录创建打包存储并注册
+
+    Args:
+        directory: 临时目录
+
+    Returns:
+        ScratchPack: 打包存储
+    """
+    pack = ScratchPack(directory)
+    with _lock:
+        old = _packs.pop(pack.directory, None)
+        _packs[pack.directory] = pack
+    if old is not None:
+        old.close()
+    return pack
+
+
+def close_pack(directory: Optional[str]):
+    """
+    关闭并注销临时目录的打包存储（删除临时目录前调用）
+
+    Args:
+        directory: 临时目录
+    """
+    if not directory:
+        return
+    with _lock:
+        pack = _packs.pop(os.path.abspath(directory), None)
+    if pack is not None:
+        pack.close()
+
+
+def _lookup(path: str) -> Optional[Tuple[ScratchPack, str]]:
+    """查找路径所在的打包存储，返回 (打包存储, 相对路径)"""
+    path = os.path.abspath(path)
+    with _lock:
+        if not _packs:
+            return None
+        directory = os.path.dirname(path)
+        while True:
+            pack = _packs.get(directory)
+            if pack is not None:
+                name = os.path.relpath(path, directory)
+                return (pack, name) if pack.contains(name) else None
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return None
+            directory = parent
+
+
+def exists(path: str) -> bool:
+    """
+    文件是否存在（真实文件或包内记录）
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        bool: 是否存在
+    """
+    return os.path.exists(path) or _lookup(path) is not None
+
+
+def read_bytes(path: str) -> bytes:
+    """
+    读取文件内容，真实文件优先
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        bytes: 文件内容
+    """
+    if not os.path.exists(path):
+        found = _lookup(path)
+        if found is not None:
+            pack, name = found
+            return pack.read(name)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def local_path(path: str) -> str:
+    """
+    确保路径上存在真实文件，包内文件在原路径写出
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        str: 可以直接打开的文件路径
+
+    Raises:
+        TempQuotaExceeded: 临时目录占用超过上限
+    """
+    if os.path.exists(path):
+        return path
+    found = _lookup(path)
+    if found is None:
+        return path
+    pack, name = found
+    return write_bytes(path, pack.read(name))
+
+
+def write_bytes(path: str, data: bytes) -> str:
+    """
+    在原路径写入真实文件，覆盖已有的真实文件时只计入大小的变化
+
+    Args:
+        path: 文件路径（位于临时目录下）
+        data: 文件内容
+
+    Returns:
+        str: 文件路径
+
+    Raises:
+        TempQuotaExceeded: 临时目录占用超过上限，此时不写入文件
+    """
+    # 写出的文件计入临时目录占用，删除临时目录时一并扣除（temp_store 依赖本模块，只能在这里导入）
+    from src.utils.temp_store import get_temp_store
+    temp_store = get_temp_store()
+    growth = len(data) - (os.path.getsize(path) if os.path.isfile(path) else 0)
+    charged = max(0, growth)
+    try:
+        temp_store.charge(charged)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 先写临时文件再改名，避免其他线程读到不完整的文件
+        partial_path = f"{path}.partial"
+        with open(partial_path, "wb") as f:
+            f.write(data)
+        os.replace(partial_path, path)
+    except Exception:
+        temp_store.release(charged)
+        raise
+    if growth < 0:
+        temp_store.release(-growth)
+    return path
+
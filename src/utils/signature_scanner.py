@@ -0,0 +1,89 @@
+"""
+文件签名扫描工具
+使用 mmap 在文件原始字节中查找签名，不读取整个文件，也不做十六进制转换
+"""
+import mmap
+import os
+from pathlib import Path
+from typing import List, Optional, Union
+
+# UnityFS 文件头标识（"UnityFS" + 结束符 + 版本号高位字节）
+UNITYFS_SIGNATURE = b"UnityFS\x00\x00\x00\x00"
+
+# 默认搜索窗口，加密文件中的 UnityFS 文件头都位于文件开头附近
+HEADER_SEARCH_WINDOW = 64 * 1024
+
+
+def find_signature_offsets(file_path: Union[str, Path],
+                           signature: bytes = UNITYFS_SIGNATURE,
+                           start: int = 0,
+                           window: Optional[int] = HEADER_SEARCH_WINDOW,
+                           max_count: Optional[int] = None) -> List[int]:
+    """
+    查找签名在文件中出现的字节偏移
+
+    Args:
+        file_path: 文件路径
+        signature: 要查找的签名
+        start: 起始偏移
+        window: 搜索窗口大小（从文件开头算起），None 表示搜索整个文件
+        max_count: 最多返回的结果数量，None 表示不限制
+
+    Returns:
+        List[int]: 按顺序排列的偏移列表，文件为空或未找到时返回空列表
+    """
+    offsets = []
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return offsets
+        end = size if window is None else min(size, window)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            position = mm.find(signature, start, end)
+            while position != -1:
+                offsets.append(position)
+                if max_count is not None and len(offsets) >= max_count:
+                    break
+                position = mm.find(signature, position + 1, end)
+    return offsets
+
+
+def find_signature(file_path: Union[str, Path],
+                   signature: bytes = UNITYFS_SIGNATURE,
+                   start: int = 0,
+                   window: Optional[int] = HEADER_SEARCH_WINDOW) -> int:
+    """
+    查找签名在文件中第一次出现的字节偏移
+
+    Args:
+        file_path: 文件路径
+        signature: 要查找的签名
+        start: 起始偏移
+        window: 搜索窗口大小（从文件开头算起），None 表示搜索整个文件
+
+    Returns:
+        int: 偏移，未找到返回 -1
+    """
+    offsets = find_signature_offsets(file_path, signature, start, window, max_count=1)
+    return offsets[0] if offsets else -1
+
+
+def find_embedded_unityfs(file_path: Union[str, Path],
+                          window: Optional[int] = HEADER_SEARCH_WINDOW) -> int:
+    """
+    查找交错加密文件中第二个 UnityFS 文件头的偏移
+
+    交错加密文件开头是一个伪造的 UnityFS 文件头，真实数据从第二个文件头开始
+
+    Args:
+        file_path: 文件路径
+        window: 搜索窗口大小，None 表示搜索整个文件
+
+    Returns:
+        int: 第二个文件头的偏移，文件中不足两个文件头时返回 -1
+    """
+    offsets = find_signature_offsets(file_path, window=window, max_count=2)
+    if len(offsets) < 2:
+        return -1
+    # 跳过位于文件开头的伪造文件头
+    return offsets[0] if offsets[0] > 0 else offsets[1]
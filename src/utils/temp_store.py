@@ -0,0 +1,263 @@
+"""
+临时目录管理
+所有扫描和导出使用的临时目录都创建在 get_temp_dir() 下，目录名包含创建者进程号:
+    arknight_ab_<pid>_xxxx            资源包扫描
+    arknight_export_lab_<pid>_xxxx    实验室MOD导出
+    arknight_texture_<pid>_xxxx       贴图缓存写入磁盘的部分
+
+启动时在后台清理创建者进程已退出的目录（程序崩溃或线程被强制终止时遗留），
+以及旧版本遗留在系统临时目录中超过一定时间的同名目录；
+写入临时文件时累计占用空间，超过上限时中止当前操作
+"""
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from src.utils import scratch_pack
+from src.utils.executor_registry import IO_POOL, get_executor
+from src.utils.path_helper import get_temp_dir
+
+# 受管理的临时目录前缀
+SCAN_PREFIX = "arknight_ab_"
+EXPORT_LAB_PREFIX = "arknight_export_lab_"
+TEXTURE_PREFIX = "arknight_texture_"
+TEMP_PREFIXES = (EXPORT_LAB_PREFIX, TEXTURE_PREFIX, SCAN_PREFIX)
+
+# 默认占用上限（MB），0 表示不限制
+DEFAULT_TEMP_MAX_MB = 10240
+
+# 无法判断创建者的目录（旧版本遗留在系统临时目录中）超过该时间后清理（秒）
+ORPHAN_MAX_AGE = 24 * 60 * 60
+
+logger = logging.getLogger(__name__)
+
+
+class TempQuotaExceeded(OSError):
+    """临时目录占用超过上限"""
+
+
+def dir_size(path: Union[str, Path]) -> int:
+    """
+    统计目录下所有文件的大小
+
+    Args:
+        path: 目录路径
+
+    Returns:
+        int: 字节数
+    """
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def _pid_alive(pid: int) -> bool:
+    """检查进程是否仍在运行"""
+    if pid <= 0:
+        return False
+    if os.name == 'nt':
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+            return exit_code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _owner_pid(name: str) -> Optional[int]:
+    """从目录名中解析创建者进程号，不是受管理的目录时返回None"""
+    for prefix in TEMP_PREFIXES:
+        if name.startswith(prefix):
+            pid = name[len(prefix):].split("_", 1)[0]
+            return int(pid) if pid.isdigit() else None
+    return None
+
+
+class TempStore:
+    """受管理的临时目录（进程内共享）"""
+
+    def __init__(self, root: Union[str, Path, None] = None, max_mb: Optional[int] = None):
+        """
+        初始化临时目录管理
+
+        Args:
+            root: 临时目录根路径，默认使用 get_temp_dir()
+            max_mb: 占用上限（MB），None 时读取配置 temp_max_mb，0 表示不限制
+        """
+        self.root = Path(root) if root else get_temp_dir()
+        self.root.mkdir(parents=True, exist_ok=True)
+        if max_mb is None:
+            try:
+                from src.config.config_manager import ConfigManager
+                max_mb = ConfigManager().get('temp_max_mb', DEFAULT_TEMP_MAX_MB)
+            except Exception as e:
+                logger.debug(f"读取临时目录上限失败，使用默认值: {str(e)}")
+                max_mb = DEFAULT_TEMP_MAX_MB
+        self.max_bytes = max(0, int(max_mb or 0)) * 1024 * 1024
+        self.lock = threading.Lock()
+        # 根目录当前占用，第一次需要时才统计
+        self.used_bytes: Optional[int] = None
+
+    def _ensure_usage(self):
+        """统计根目录当前占用（调用方持有锁）"""
+        if self.used_bytes is None:
+            self.used_bytes = dir_size(self.root)
+
+    def create_dir(self, prefix: str) -> str:
+        """
+        创建临时目录
+
+        Args:
+            prefix: 目录前缀，SCAN_PREFIX 或 EXPORT_LAB_PREFIX
+
+        Returns:
+            str: 临时目录路径
+        """
+        return tempfile.mkdtemp(prefix=f"{prefix}{os.getpid()}_", dir=str(self.root))
+
+    def charge(self, nbytes: int):
+        """
+        记录新写入的临时文件大小，超过上限时抛出异常
+
+        Args:
+            nbytes: 写入的字节数
+
+        Raises:
+            TempQuotaExceeded: 临时目录占用超过上限
+        """
+        with self.lock:
+            self._ensure_usage()
+            self.used_bytes += nbytes
+            if self.max_bytes and self.used_bytes > self.max_bytes:
+                raise TempQuotaExceeded(
+                    f"临时文件占用已超过上限 {self.max_bytes // 1024 // 1024} MB，"
+                    f"请关闭不再使用的资源包，或在配置中调大 temp_max_mb"
+                )
+
+    def release(self, nbytes: int):
+        """
+        扣除已删除的临时文件大小
+
+        Args:
+            nbytes: 删除的字节数
+        """
+        with self.lock:
+            if self.used_bytes is not None:
+                self.used_bytes = max(0, self.used_bytes - nbytes)
+
+    def remove_dir(self, path: Optional[str]) -> bool:
+        """
+        删除临时目录并扣除占用
+
+        Args:
+            path: 临时目录路径
+
+        Returns:
+            bool: 是否删除了目录
+        """
+        if not path or not os.path.exists(path):
+            return False
+        # 打开的打包文件在 Windows 上无法删除
+        scratch_pack.close_pack(path)
+        # 贴图缓存中指向该目录的 PNG 路径不再有效（贴图缓存依赖本模块，只能在这里导入）
+        from src.utils import texture_cache
+        texture_cache.forget_dir(path)
+        size = dir_size(path)
+        shutil.rmtree(path, ignore_errors=True)
+        self.release(size)
+        return True
+
+    def sweep(self) -> Tuple[int, int]:
+        """
+        清理遗留的临时目录:
+        - 根目录下创建者进程已退出的目录
+        - 系统临时目录中超过 ORPHAN_MAX_AGE 的旧版本目录
+
+        Returns:
+            Tuple[int, int]: (删除的目录数, 释放的字节数)
+        """
+        count = 0
+        freed = 0
+        now = time.time()
+        candidates = []
+        for entry in os.scandir(self.root):
+            pid = _owner_pid(entry.name)
+            if entry.is_dir(follow_symlinks=False) and pid is not None and pid != os.getpid() and not _pid_alive(pid):
+                candidates.append(entry.path)
+
+        legacy_root = Path(tempfile.gettempdir())
+        if legacy_root.resolve() != self.root.resolve():
+            for entry in os.scandir(legacy_root):
+                if not entry.name.startswith(TEMP_PREFIXES) or not entry.is_dir(follow_symlinks=False):
+                    continue
+                try:
+                    if now - entry.stat(follow_symlinks=False).st_mtime > ORPHAN_MAX_AGE:
+                        candidates.append(entry.path)
+                except OSError:
+                    continue
+
+        for path in candidates:
+            try:
+                size = dir_size(path)
+                shutil.rmtree(path)
+                count += 1
+                freed += size
+            except Exception as e:
+                logger.warning(f"清理遗留临时目录失败 {path}: {str(e)}")
+
+        with self.lock:
+            # 清理后重新统计，同时包含其他运行中实例的占用
+            self.used_bytes = dir_size(self.root)
+        return count, freed
+
+    def start_sweeper(self):
+        """在后台线程中清理遗留的临时目录"""
+        def run():
+            try:
+                count, freed = self.sweep()
+                if count:
+                    logger.info(f"已清理遗留临时目录 {count} 个，释放 {freed / 1024 / 1024:.1f} MB")
+            except Exception as e:
+                logger.error(f"清理遗留临时目录时出错: {str(e)}")
+
+        get_executor(IO_POOL).submit(run)
+
+
+_store: Optional[TempStore] = None
+_store_lock = threading.Lock()
+
+
+def get_temp_store() -> TempStore:
+    """
+    获取共享的临时目录管理，首次调用时创建
+
+    Returns:
+        TempStore: 临时目录管理
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TempStore()
+        return _store
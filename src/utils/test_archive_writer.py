@@ -0,0 +1,72 @@
+"""
+流式压缩包输出测试
+不依赖 Qt 和 UnityPy，可以直接运行本文件或使用 pytest
+"""
+import os
+import sys
+import tarfile
+import tempfile
+import zipfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.utils.archive_writer import ArchiveWriter, is_archive_path, open_archive
+
+
+def test_zip_round_trip():
+    """ZIP 条目内容不变，已压缩的格式直接存储"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = os.path.join(temp_dir, "out.zip")
+        big = os.urandom(3 * 1024 * 1024 + 5)
+        with ArchiveWriter(output_path) as archive:
+            archive.add_bytes("ab\\Texture2D\\big.png", big)
+            archive.add_bytes("ab/MonoBehaviour/data.json", b"{}" * 1000)
+
+        assert not os.path.exists(f"{output_path}.partial")
+        with zipfile.ZipFile(output_path) as z:
+            assert z.testzip() is None
+            assert z.read("ab/Texture2D/big.png") == big
+            assert z.getinfo("ab/Texture2D/big.png").compress_type == zipfile.ZIP_STORED
+            assert z.getinfo("ab/MonoBehaviour/data.json").compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_tar_round_trip():
+    """tar 和 tar.gz 条目内容不变"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name in ("out.tar", "out.tar.gz", "out.tgz"):
+            output_path = os.path.join(temp_dir, name)
+            archive = open_archive(output_path)
+            archive.add_bytes("ab/Mesh/a.mesh", b"mesh")
+            archive.close()
+            assert archive.entry_count == 1
+            with tarfile.open(output_path) as tar:
+                assert tar.extractfile("ab/Mesh/a.mesh").read() == b"mesh"
+
+
+def test_archive_abort():
+    """放弃写入时删除未完成的文件，不生成目标文件"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = os.path.join(temp_dir, "out.zip")
+        try:
+            with ArchiveWriter(output_path) as archive:
+                archive.add_bytes("a.txt", b"a")
+                raise RuntimeError("中止")
+        except RuntimeError:
+            pass
+        assert not os.path.exists(output_path)
+        assert not os.path.exists(f"{output_path}.partial")
+
+
+def test_archive_path():
+    """按扩展名识别压缩包格式"""
+    assert is_archive_path("a.ZIP") and is_archive_path("a.tar.gz") and is_archive_path("a.tgz")
+    assert not is_archive_path("a.ab")
+    assert open_archive(os.path.join(tempfile.gettempdir(), "not_archive")) is None
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"{name} 通过")
@@ -0,0 +1,66 @@
+"""
+文件原地移位测试
+不依赖 Qt 和 UnityPy，可以直接运行本文件或使用 pytest
+"""
+import os
+import sys
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.utils.file_shift import COPY_FILE_RANGE_MIN_OFFSET, insert_prefix_in_place, strip_prefix_in_place
+
+
+def _write(path: str, data: bytes) -> str:
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_strip_and_insert_round_trip():
+    """去除文件头后再插入，文件内容与原来完全相同（窗口小于文件，覆盖分块移动）"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        header = os.urandom(336)
+        payload = os.urandom(10000)
+        path = _write(os.path.join(temp_dir, "a.ab"), header + payload)
+
+        assert strip_prefix_in_place(path, len(header), window=1000) == len(payload)
+        assert _read(path) == payload
+
+        assert insert_prefix_in_place(path, header, window=1000) == len(header) + len(payload)
+        assert _read(path) == header + payload
+
+
+def test_strip_large_offset():
+    """偏移超过 copy_file_range 阈值时（不支持时回退为分块读写）结果相同"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        header = os.urandom(COPY_FILE_RANGE_MIN_OFFSET + 17)
+        payload = os.urandom(3 * COPY_FILE_RANGE_MIN_OFFSET + 5)
+        path = _write(os.path.join(temp_dir, "a.ab"), header + payload)
+
+        assert strip_prefix_in_place(path, len(header), window=4096) == len(payload)
+        assert _read(path) == payload
+
+
+def test_strip_edge_cases():
+    """偏移为0时不修改文件，偏移不小于文件大小时清空文件"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = _write(os.path.join(temp_dir, "a.ab"), b"abcdef")
+        assert strip_prefix_in_place(path, 0) == 6
+        assert _read(path) == b"abcdef"
+        assert strip_prefix_in_place(path, 10) == 0
+        assert _read(path) == b""
+        assert insert_prefix_in_place(path, b"") == 0
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"{name} 通过")
@@ -0,0 +1,110 @@
+"""
+扫描输出打包存储测试
+覆盖包内文件的读取、写出真实文件和编辑保存时计入临时目录占用，
+不依赖 Qt 和 UnityPy，可以直接运行本文件或使用 pytest
+"""
+import os
+import sys
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.utils import scratch_pack, temp_store
+from src.utils.temp_store import SCAN_PREFIX, TempQuotaExceeded, TempStore
+
+
+def _use_store(store: TempStore):
+    """替换进程内共享的临时目录管理，返回原来的实例"""
+    old = temp_store._store
+    temp_store._store = store
+    return old
+
+
+def test_read_and_exists():
+    """包内文件不创建真实文件，真实文件优先于包内记录"""
+    with tempfile.TemporaryDirectory() as root:
+        store = TempStore(root, max_mb=0)
+        directory = store.create_dir(SCAN_PREFIX)
+        pack = scratch_pack.open_pack(directory)
+        try:
+            path = pack.add(os.path.join(directory, "Texture2D", "a.png"), b"packed")
+            assert not os.path.exists(path)
+            assert scratch_pack.exists(path)
+            assert scratch_pack.read_bytes(path) == b"packed"
+            assert not scratch_pack.exists(os.path.join(directory, "missing.png"))
+
+            # 编辑保存后直接写到原路径
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(b"edited")
+            assert scratch_pack.read_bytes(path) == b"edited"
+        finally:
+            store.remove_dir(directory)
+        assert not scratch_pack.exists(path)
+
+
+def test_local_path_charges_quota():
+    """写出真实文件时计入占用，超过上限时不写出文件并撤销计入"""
+    with tempfile.TemporaryDirectory() as root:
+        store = TempStore(root, max_mb=2)
+        old = _use_store(store)
+        directory = store.create_dir(SCAN_PREFIX)
+        try:
+            pack = scratch_pack.open_pack(directory)
+            small = pack.add(os.path.join(directory, "small.json"), b"x" * 1000)
+            large = pack.add(os.path.join(directory, "large.png"), b"y" * (1536 * 1024))
+
+            assert scratch_pack.local_path(small) == small
+            with open(small, "rb") as f:
+                assert f.read() == b"x" * 1000
+            used = store.used_bytes
+
+            try:
+                scratch_pack.local_path(large)
+                assert False, "应当超过占用上限"
+            except TempQuotaExceeded:
+                pass
+            assert not os.path.exists(large)
+            assert store.used_bytes == used
+        finally:
+            store.remove_dir(directory)
+            _use_store(old)
+        assert store.used_bytes == 0
+
+
+def test_write_bytes_charges_quota():
+    """编辑保存时计入占用，覆盖时只计入大小的变化，超过上限时不修改原文件并撤销计入"""
+    with tempfile.TemporaryDirectory() as root:
+        store = TempStore(root, max_mb=1)
+        old = _use_store(store)
+        directory = store.create_dir(SCAN_PREFIX)
+        try:
+            path = os.path.join(directory, "MonoBehaviour", "a.json")
+            store.charge(0)
+            assert scratch_pack.write_bytes(path, b"{}" * 1000) == path
+            assert store.used_bytes == 2000
+            scratch_pack.write_bytes(path, b"{}")
+            assert store.used_bytes == 2
+            with open(path, "rb") as f:
+                assert f.read() == b"{}"
+
+            try:
+                scratch_pack.write_bytes(path, b"x" * (2 * 1024 * 1024))
+                assert False, "应当超过占用上限"
+            except TempQuotaExceeded:
+                pass
+            assert store.used_bytes == 2
+            assert scratch_pack.read_bytes(path) == b"{}"
+            assert not os.path.exists(f"{path}.partial")
+        finally:
+            store.remove_dir(directory)
+            _use_store(old)
+        assert store.used_bytes == 0
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"{name} 通过")
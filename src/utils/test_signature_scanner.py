@@ -0,0 +1,51 @@
+"""
+签名扫描测试
+不依赖 Qt 和 UnityPy，可以直接运行本文件或使用 pytest
+"""
+import os
+import sys
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.utils.signature_scanner import (UNITYFS_SIGNATURE, find_embedded_unityfs, find_signature,
+                                         find_signature_offsets)
+
+
+def _write(path: str, data: bytes) -> str:
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def test_find_embedded_unityfs():
+    """跳过开头的伪造文件头，返回第二个 UnityFS 文件头的偏移"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        encrypted = _write(os.path.join(temp_dir, "encrypted.ab"),
+                           UNITYFS_SIGNATURE + b"\x00" * 300 + UNITYFS_SIGNATURE + b"payload")
+        assert find_embedded_unityfs(encrypted) == len(UNITYFS_SIGNATURE) + 300
+
+        plain = _write(os.path.join(temp_dir, "plain.ab"), UNITYFS_SIGNATURE + b"payload")
+        assert find_embedded_unityfs(plain) == -1
+
+        empty = _write(os.path.join(temp_dir, "empty.ab"), b"")
+        assert find_embedded_unityfs(empty) == -1
+
+
+def test_find_signature_window():
+    """只在搜索窗口内查找签名"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = _write(os.path.join(temp_dir, "a.ab"), b"\x00" * 100 + b"SIG" + b"\x00" * 100 + b"SIG")
+        assert find_signature_offsets(path, b"SIG", window=None) == [100, 203]
+        assert find_signature_offsets(path, b"SIG", window=150) == [100]
+        assert find_signature_offsets(path, b"SIG", window=None, max_count=1) == [100]
+        assert find_signature(path, b"SIG", start=101, window=None) == 203
+        assert find_signature(path, b"NONE", window=None) == -1
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"{name} 通过")
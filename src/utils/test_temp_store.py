@@ -0,0 +1,88 @@
+"""
+临时目录测试
+覆盖临时目录的占用上限和遗留目录清理，
+不依赖 Qt 和 UnityPy，可以直接运行本文件或使用 pytest
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.utils import temp_store
+from src.utils.temp_store import SCAN_PREFIX, TempQuotaExceeded, TempStore
+
+
+def _dead_pid() -> int:
+    """获取一个已退出进程的进程号"""
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_charge_and_release():
+    """累计占用超过上限时抛出异常，删除目录后扣除占用"""
+    with tempfile.TemporaryDirectory() as root:
+        store = TempStore(root, max_mb=1)
+        store.charge(512 * 1024)
+        try:
+            store.charge(1024 * 1024)
+            assert False, "应当超过占用上限"
+        except TempQuotaExceeded:
+            pass
+        store.release(2 * 1024 * 1024)
+        assert store.used_bytes == 0
+
+        unlimited = TempStore(root, max_mb=0)
+        unlimited.charge(1024 * 1024 * 1024)
+
+        directory = store.create_dir(SCAN_PREFIX)
+        with open(os.path.join(directory, "a.bin"), "wb") as f:
+            f.write(b"\x00" * 4096)
+        store.used_bytes = None
+        store.charge(0)
+        assert store.used_bytes == 4096
+        assert store.remove_dir(directory)
+        assert store.used_bytes == 0
+        assert not store.remove_dir(directory)
+
+
+def test_sweep_removes_dead_owner_dirs():
+    """只清理创建者进程已退出的目录，当前进程和无关目录保留"""
+    with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as legacy_root:
+        old_tempdir = tempfile.tempdir
+        # 旧版本遗留目录位于系统临时目录，测试时指向单独的目录
+        tempfile.tempdir = legacy_root
+        try:
+            store = TempStore(root, max_mb=0)
+            dead = os.path.join(root, f"{SCAN_PREFIX}{_dead_pid()}_abc")
+            os.makedirs(dead)
+            with open(os.path.join(dead, "scan.pack"), "wb") as f:
+                f.write(b"\x00" * 100)
+            alive = store.create_dir(SCAN_PREFIX)
+            other = os.path.join(root, "user_dir")
+            os.makedirs(other)
+
+            legacy_old = os.path.join(legacy_root, f"{SCAN_PREFIX}old")
+            legacy_new = os.path.join(legacy_root, f"{SCAN_PREFIX}new")
+            os.makedirs(legacy_old)
+            os.makedirs(legacy_new)
+            expired = os.stat(legacy_old).st_mtime - temp_store.ORPHAN_MAX_AGE - 60
+            os.utime(legacy_old, (expired, expired))
+
+            count, freed = store.sweep()
+            assert count == 2
+            assert freed == 100
+            assert not os.path.exists(dead) and not os.path.exists(legacy_old)
+            assert os.path.exists(alive) and os.path.exists(other) and os.path.exists(legacy_new)
+        finally:
+            tempfile.tempdir = old_tempdir
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"{name} 通过")
@@ -0,0 +1,148 @@
+"""
+贴图缓存测试
+覆盖按内存预算淘汰、淘汰后写入磁盘再读回，以及按扫描生成的 PNG 路径查找，
+不依赖 Qt 和 UnityPy，可以直接运行本文件或使用 pytest
+"""
+import os
+import sys
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from PIL import Image
+
+from src.utils import temp_store
+from src.utils.temp_store import TempStore
+from src.utils.texture_cache import TextureCache, bundle_fingerprint
+
+# 64x64 RGBA 贴图解码后占用 16KB
+TEXTURE_SIZE = (64, 64)
+TEXTURE_BYTES = 64 * 64 * 4
+
+
+def _texture(value: int) -> Image.Image:
+    return Image.new("RGBA", TEXTURE_SIZE, (value, value, value, 255))
+
+
+def _with_store(test):
+    """使用单独的临时目录运行测试，磁盘缓存写入该目录"""
+    def run():
+        with tempfile.TemporaryDirectory() as root:
+            old = temp_store._store
+            temp_store._store = TempStore(root, max_mb=0)
+            try:
+                test()
+            finally:
+                temp_store._store = old
+    run.__name__ = test.__name__
+    run.__doc__ = test.__doc__
+    return run
+
+
+@_with_store
+def test_lru_eviction():
+    """超过内存预算时淘汰最久未使用的贴图，读取会刷新使用顺序"""
+    cache = TextureCache(memory_mb=0, disk_mb=0)
+    cache.memory_budget = TEXTURE_BYTES * 2
+    cache.put(("bundle", 1), _texture(1))
+    cache.put(("bundle", 2), _texture(2))
+    assert cache.get(("bundle", 1)) is not None
+    cache.put(("bundle", 3), _texture(3))
+
+    assert cache.get(("bundle", 2)) is None
+    assert cache.get(("bundle", 1)) is not None
+    assert cache.get(("bundle", 3)) is not None
+    assert cache.memory_bytes == TEXTURE_BYTES * 2
+
+
+@_with_store
+def test_spill_to_disk():
+    """配置了磁盘预算时淘汰的贴图写入磁盘，再次读取时内容不变"""
+    cache = TextureCache(memory_mb=0, disk_mb=1)
+    cache.memory_budget = TEXTURE_BYTES
+    first = _texture(10)
+    cache.put(("bundle", 1), first)
+    cache.put(("bundle", 2), _texture(20))
+
+    assert ("bundle", 1) not in cache.memory
+    assert ("bundle", 1) in cache.disk
+    assert cache.disk_bytes == TEXTURE_BYTES
+
+    restored = cache.get(("bundle", 1))
+    assert restored is not None
+    assert restored.size == TEXTURE_SIZE
+    assert restored.tobytes() == first.tobytes()
+
+    disk_dir = cache.disk_dir
+    cache.clear()
+    assert not os.path.exists(disk_dir)
+    assert cache.get(("bundle", 1)) is None
+
+
+@_with_store
+def test_get_or_decode_once():
+    """同一个贴图只解码一次"""
+    cache = TextureCache(memory_mb=1, disk_mb=0)
+    calls = []
+
+    def decode():
+        calls.append(1)
+        return _texture(5)
+
+    cache.get_or_decode(("bundle", 7), decode)
+    cache.get_or_decode(("bundle", 7), decode)
+    assert len(calls) == 1
+
+
+@_with_store
+def test_alias_and_forget_dir():
+    """按 PNG 路径查找缓存，文件被修改或目录删除后不再命中"""
+    cache = TextureCache(memory_mb=1, disk_mb=0)
+    with tempfile.TemporaryDirectory() as scan_dir:
+        png_path = os.path.join(scan_dir, "a.png")
+        with open(png_path, "wb") as f:
+            f.write(b"png")
+        cache.put(("bundle", 1), _texture(1))
+        cache.alias(png_path, ("bundle", 1), 3)
+        assert cache.get_path(png_path) is not None
+
+        with open(png_path, "wb") as f:
+            f.write(b"edited png")
+        assert cache.get_path(png_path) is None
+
+        cache.alias(png_path, ("bundle", 1), os.path.getsize(png_path))
+        cache.forget_dir(scan_dir)
+        assert cache.get_path(png_path) is None
+
+
+@_with_store
+def test_alias_packed_path():
+    """扫描结果只在打包文件中（没有真实文件）时也能按路径命中，不需要先写出文件"""
+    cache = TextureCache(memory_mb=1, disk_mb=0)
+    with tempfile.TemporaryDirectory() as scan_dir:
+        png_path = os.path.join(scan_dir, "Texture2D", "a.png")
+        cache.put(("bundle", 1), _texture(1))
+        cache.alias(png_path, ("bundle", 1), 3)
+        assert cache.get_path(png_path).tobytes() == _texture(1).tobytes()
+        assert not os.path.exists(png_path)
+
+
+def test_bundle_fingerprint():
+    """资源包内容变化后指纹随之变化"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "a.ab")
+        with open(path, "wb") as f:
+            f.write(b"bundle")
+        fingerprint = bundle_fingerprint(path)
+        assert bundle_fingerprint(path) == fingerprint
+        with open(path, "wb") as f:
+            f.write(b"bundle v2")
+        assert bundle_fingerprint(path) != fingerprint
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"{name} 通过")
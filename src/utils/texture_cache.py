@@ -0,0 +1,292 @@
+"""
+解码后的贴图缓存
+Texture2D 解码（压缩格式转 RGBA）是扫描、预览、导出图片、重新提取中最耗时的步骤，
+同一个贴图按 (资源包指纹, path_id) 缓存解码结果，在一次运行中最多解码一次:
+    扫描      解码后缓存，再编码为 PNG 写入临时目录
+    预览      临时目录中的 PNG 命中缓存时直接使用解码结果，不再解码 PNG
+    导出图片  同上
+    提取      在当前线程提取时复用缓存（进程池中的子进程不共享缓存）
+
+缓存按内存预算淘汰最久未使用的贴图，配置了磁盘预算时淘汰的贴图以原始 RGBA 数据写入临时目录，
+再次使用时从磁盘读回，不需要重新加载资源包
+"""
+import atexit
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from PIL import Image
+
+from src.utils.temp_store import TEXTURE_PREFIX, TempQuotaExceeded, get_temp_store
+
+# 默认预算（MB），0 表示不缓存 / 不写入磁盘
+DEFAULT_MEMORY_MB = 256
+DEFAULT_DISK_MB = 0
+
+# (资源包指纹, path_id)
+TextureKey = Tuple[str, int]
+
+logger = logging.getLogger(__name__)
+
+
+def bundle_fingerprint(asset_path: str) -> str:
+    """
+    计算资源包指纹，文件路径、大小或修改时间变化后指纹随之变化
+
+    Args:
+        asset_path: 资源包路径
+
+    Returns:
+        str: 指纹
+    """
+    stat = os.stat(asset_path)
+    text = f"{os.path.abspath(asset_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(text.encode("utf-8", "surrogateescape")).hexdigest()[:16]
+
+
+def _image_bytes(image: Image.Image) -> int:
+    return image.width * image.height * 4
+
+
+class TextureCache:
+    """解码后的贴图缓存（线程安全）"""
+
+    def __init__(self, memory_mb: Optional[int] = None, disk_mb: Optional[int] = None):
+        """
+        初始化贴图缓存
+
+        Args:
+            memory_mb: 内存预算（MB），None 时读取配置 texture_cache_memory_mb
+            disk_mb: 磁盘预算（MB），None 时读取配置 texture_cache_disk_mb，0 表示不写入磁盘
+        """
+        if memory_mb is None or disk_mb is None:
+            try:
+                from src.config.config_manager import ConfigManager
+                config = ConfigManager()
+                if memory_mb is None:
+                    memory_mb = config.get('texture_cache_memory_mb', DEFAULT_MEMORY_MB)
+                if disk_mb is None:
+                    disk_mb = config.get('texture_cache_disk_mb', DEFAULT_DISK_MB)
+            except Exception as e:
+                logger.debug(f"读取贴图缓存配置失败，使用默认值: {str(e)}")
+                memory_mb = DEFAULT_MEMORY_MB if memory_mb is None else memory_mb
+                disk_mb = DEFAULT_DISK_MB if disk_mb is None else disk_mb
+        self.memory_budget = max(0, int(memory_mb or 0)) * 1024 * 1024
+        self.disk_budget = max(0, int(disk_mb or 0)) * 1024 * 1024
+        self.lock = threading.Lock()
+        # 按最近使用顺序排列，最久未使用的在最前面
+        self.memory: "OrderedDict[TextureKey, Image.Image]" = OrderedDict()
+        self.memory_bytes = 0
+        # 写入磁盘的贴图: 键 -> (文件路径, 尺寸)
+        self.disk: "OrderedDict[TextureKey, Tuple[str, Tuple[int, int]]]" = OrderedDict()
+        self.disk_bytes = 0
+        self.disk_dir: Optional[str] = None
+        # 扫描生成的 PNG 路径 -> (键, PNG 大小)，用于预览和导出图片时按路径查找
+        self.aliases: Dict[str, Tuple[TextureKey, int]] = {}
+
+    def get(self, key: TextureKey) -> Optional[Image.Image]:
+        """
+        读取缓存的贴图并标记为最近使用
+
+        Args:
+            key: (资源包指纹, path_id)
+
+        Returns:
+            Optional[Image.Image]: RGBA 图片（共享对象，调用方不能修改），未缓存时返回None
+        """
+        with self.lock:
+            image = self.memory.get(key)
+            if image is not None:
+                self.memory.move_to_end(key)
+                return image
+            spilled = self.disk.get(key)
+        if spilled is None:
+            return None
+
+        path, size = spilled
+        try:
+            with open(path, "rb") as f:
+                image = Image.frombytes("RGBA", size, f.read())
+        except Exception as e:
+            logger.warning(f"读取贴图缓存失败 {path}: {str(e)}")
+            with self.lock:
+                self._drop_spilled(key)
+            return None
+        self.put(key, image)
+        return image
+
+    def put(self, key: TextureKey, image: Image.Image) -> Image.Image:
+        """
+        缓存贴图，超过内存预算时淘汰最久未使用的贴图
+
+        Args:
+            key: (资源包指纹, path_id)
+            image: 解码后的图片
+
+        Returns:
+            Image.Image: 缓存的 RGBA 图片
+        """
+        if image.mode != "RGBA":
+            image = image.convert("RGBA")
+        cost = _image_bytes(image)
+        with self.lock:
+            if not self.memory_budget or cost > self.memory_budget:
+                # 单张超过预算时不进入内存，直接尝试写入磁盘
+                self._spill(key, image)
+                return image
+            old = self.memory.pop(key, None)
+            if old is not None:
+                self.memory_bytes -= _image_bytes(old)
+            self.memory[key] = image
+            self.memory_bytes += cost
+            while self.memory_bytes > self.memory_budget and len(self.memory) > 1:
+                old_key, old_image = self.memory.popitem(last=False)
+                self.memory_bytes -= _image_bytes(old_image)
+                self._spill(old_key, old_image)
+        return image
+
+    def get_or_decode(self, key: TextureKey, decode: Callable[[], Image.Image]) -> Image.Image:
+        """
+        读取缓存，未缓存时解码并写入缓存
+
+        Args:
+            key: (资源包指纹, path_id)
+            decode: 解码函数
+
+        Returns:
+            Image.Image: RGBA 图片（共享对象，调用方不能修改）
+        """
+        image = self.get(key)
+        if image is None:
+            image = self.put(key, decode())
+        return image
+
+    def alias(self, path: str, key: TextureKey, file_size: int):
+        """
+        记录扫描生成的 PNG 文件对应的贴图
+
+        Args:
+            path: PNG 文件路径
+            key: (资源包指纹, path_id)
+            file_size: PNG 文件大小，用于发现文件被修改
+        """
+        with self.lock:
+            self.aliases[os.path.abspath(path)] = (key, file_size)
+
+    def get_path(self, path: str) -> Optional[Image.Image]:
+        """
+        按扫描生成的 PNG 路径读取缓存的贴图
+
+        Args:
+            path: PNG 文件路径
+
+        Returns:
+            Optional[Image.Image]: RGBA 图片（共享对象，调用方不能修改），未缓存或文件已被修改时返回None
+        """
+        path = os.path.abspath(path)
+        with self.lock:
+            entry = self.aliases.get(path)
+        if entry is None:
+            return None
+        key, file_size = entry
+        try:
+            if os.path.exists(path) and os.path.getsize(path) != file_size:
+                # 文件被编辑或替换过，不再对应原来的贴图
+                with self.lock:
+                    self.aliases.pop(path, None)
+                return None
+        except OSError:
+            return None
+        return self.get(key)
+
+    def forget_dir(self, directory: str):
+        """
+        删除临时目录下所有 PNG 路径的记录（临时目录删除时调用，缓存的贴图保留）
+
+        Args:
+            directory: 临时目录
+        """
+        prefix = os.path.join(os.path.abspath(directory), "")
+        with self.lock:
+            for path in [path for path in self.aliases if path.startswith(prefix)]:
+                del self.aliases[path]
+
+    def clear(self):
+        """清空缓存并删除磁盘缓存目录"""
+        with self.lock:
+            self.memory.clear()
+            self.memory_bytes = 0
+            self.disk.clear()
+            self.disk_bytes = 0
+            self.aliases.clear()
+            disk_dir, self.disk_dir = self.disk_dir, None
+        if disk_dir:
+            get_temp_store().remove_dir(disk_dir)
+
+    def _spill(self, key: TextureKey, image: Image.Image):
+        """把贴图写入磁盘缓存（调用方持有锁）"""
+        cost = _image_bytes(image)
+        if not self.disk_budget or cost > self.disk_budget or key in self.disk:
+            return
+        try:
+            if self.disk_dir is None:
+                self.disk_dir = get_temp_store().create_dir(TEXTURE_PREFIX)
+            while self.disk_bytes + cost > self.disk_budget and self.disk:
+                self._drop_spilled(next(iter(self.disk)))
+            get_temp_store().charge(cost)
+            path = os.path.join(self.disk_dir, f"{key[0]}_{key[1]}.rgba")
+            with open(path, "wb") as f:
+                f.write(image.tobytes())
+            self.disk[key] = (path, image.size)
+            self.disk_bytes += cost
+        except TempQuotaExceeded:
+            logger.debug("临时目录占用已达上限，贴图不写入磁盘缓存")
+        except Exception as e:
+            logger.warning(f"写入贴图缓存失败: {str(e)}")
+
+    def _drop_spilled(self, key: TextureKey):
+        """删除磁盘缓存中的贴图（调用方持有锁）"""
+        spilled = self.disk.pop(key, None)
+        if spilled is None:
+            return
+        path, size = spilled
+        cost = size[0] * size[1] * 4
+        self.disk_bytes -= cost
+        try:
+            os.remove(path)
+            get_temp_store().release(cost)
+        except OSError:
+            pass
+
+
+_cache: Optional[TextureCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_texture_cache() -> TextureCache:
+    """
+    获取进程内共享的贴图缓存，首次调用时创建
+
+    Returns:
+        TextureCache: 贴图缓存
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TextureCache()
+            atexit.register(_cache.clear)
+        return _cache
+
+
+def forget_dir(directory: Optional[str]):
+    """
+    删除临时目录下所有 PNG 路径的记录，缓存尚未创建时不做任何事
+
+    Args:
+        directory: 临时目录
+    """
+    if directory and _cache is not None:
+        _cache.forget_dir(directory)
@@ -1,49 +1,72 @@
 from PyQt6.QtCore import QThread, pyqtSignal
-from typing import List, Tuple
+from typing import List
 
 from src.utils.BundleValidator import BundleValidator
+from src.utils.executor_registry import IO_POOL, get_executor
 
 
 class BundleValidateWorker(QThread):
     """AB文件验证工作线程"""
     progress = pyqtSignal(str)  # 进度信号
+    batch_validated = pyqtSignal(list)  # 分批发送已验证的有效文件
     validated = pyqtSignal(list)  # 验证完成信号，发送有效的文件列表
     error = pyqtSignal(str)  # 错误信号
     validator = BundleValidator()  # AB文件验证器实例
 
+    BATCH_SIZE = 256  # 每批发送的有效文件数量
+    PROGRESS_INTERVAL = 500  # 每验证多少个文件发送一次进度
+
     def __init__(self, files: List[str]):
         """
         初始化验证工作线程
 
         Args:
-            files: 要验证的文件路径列表
-            validator: AB文件验证器实例
+            files: 要验证的文件或目录路径列表，目录会在工作线程中递归枚举
         """
         super().__init__()
         self.files = files
+        self.is_running = True
 
     def run(self):
         """执行验证任务"""
         try:
+            # 枚举候选文件（按大小和扩展名预过滤）
+            candidates = list(self.validator.iter_candidates(self.files))
+            total = len(candidates)
+            self.progress.emit(f"找到 {total} 个候选文件，开始验证...")
 
             valid_files = []
-            total = len(self.files)
-
-            for index, file_path in enumerate(self.files, 1):
-                try:
-                    is_valid, _ = self.validator.is_valid_bundle(file_path)
-                    if is_valid:
-                        valid_files.append(file_path)
+            pending = []
+            # 签名检查以磁盘I/O为主，使用共享I/O线程池，与其他批量功能同时运行时不会额外创建线程
+            executor = get_executor(IO_POOL)
+            futures = [executor.submit(self.validator.has_unity_signature, file_path) for file_path in candidates]
+            for index, (file_path, future) in enumerate(zip(candidates, futures), 1):
+                if not self.is_running:
+                    # 共享线程池不能关闭，只取消本次提交且尚未开始的任务
+                    for pending_future in futures[index - 1:]:
+                        pending_future.cancel()
+                    break
+                if future.result():
+                    pending.append(file_path)
 
-                    # 发送进度信息
+                # 分批发送结果和进度，避免每个文件都发送信号
+                if len(pending) >= self.BATCH_SIZE:
+                    valid_files.extend(pending)
+                    self.batch_validated.emit(pending)
+                    pending = []
+                if index % self.PROGRESS_INTERVAL == 0 or index == total:
                     progress = (index / total) * 100
                     self.progress.emit(f"正在验证: {index}/{total} ({progress:.1f}%)")
 
-                except Exception as e:
-                    self.progress.emit(f"验证文件 {file_path} 时出错: {str(e)}")
-                    continue
+            if pending:
+                valid_files.extend(pending)
+                self.batch_validated.emit(pending)
 
             self.validated.emit(valid_files)
 
         except Exception as e:
-            self.error.emit(f"验证过程出错: {str(e)}")
\ No newline at end of file
+            self.error.emit(f"验证过程出错: {str(e)}")
+
+    def stop(self):
+        """停止验证"""
+        self.is_running = False
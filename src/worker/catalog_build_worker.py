@@ -0,0 +1,49 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+from typing import List, Optional
+
+from src.core.asset_catalog import AssetCatalog
+
+
+class CatalogBuildWorker(QThread):
+    """资源目录构建工作线程"""
+    progress = pyqtSignal(int, int, str)  # 已完成数、总数、资源包路径
+    finished = pyqtSignal(dict)  # 构建完成，发送统计信息
+    error = pyqtSignal(str)  # 错误信号
+
+    def __init__(self, root_dirs: List[str], bundle_paths: Optional[List[str]] = None):
+        """
+        初始化构建工作线程
+
+        Args:
+            root_dirs: 游戏资源目录列表
+            bundle_paths: 指定时只索引这些资源包（批量导入），不扫描目录
+        """
+        super().__init__()
+        self.root_dirs = root_dirs
+        self.bundle_paths = bundle_paths
+        self.is_running = True
+
+    def run(self):
+        """执行增量构建"""
+        try:
+            # SQLite 连接只能在创建它的线程中使用
+            with AssetCatalog() as catalog:
+                if self.bundle_paths is not None:
+                    stats = catalog.index_bundles(
+                        self.bundle_paths,
+                        progress_callback=self.progress.emit,
+                        should_stop=lambda: not self.is_running
+                    )
+                else:
+                    stats = catalog.build(
+                        self.root_dirs,
+                        progress_callback=self.progress.emit,
+                        should_stop=lambda: not self.is_running
+                    )
+            self.finished.emit(stats)
+        except Exception as e:
+            self.error.emit(f"构建资源目录时出错: {str(e)}")
+
+    def stop(self):
+        """停止构建，已解析的资源包会保留"""
+        self.is_running = False
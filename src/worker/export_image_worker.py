@@ -1,12 +1,13 @@
 """
 导出图片的worker线程
 """
-import shutil
-
 import numpy as np
 from PIL import Image
 from PyQt6.QtCore import QThread, pyqtSignal
 
+from src.utils import scratch_pack
+from src.utils.texture_cache import get_texture_cache
+
 class ExportImageWorker(QThread):
     """导出图片的worker线程"""
     progress = pyqtSignal(int)  # 进度信号
@@ -14,14 +15,23 @@ class ExportImageWorker(QThread):
     error = pyqtSignal(str)  # 错误信号
 
     def __init__(self, source_path, target_path):
+        """
+        初始化导出线程
+
+        Args:
+            source_path: 源图片路径，可以是扫描结果在打包文件中的路径
+            target_path: 保存路径
+        """
         super().__init__()
         self.source_path = source_path
         self.target_path = target_path
 
     def run(self):
         try:
-            # 打开源图片
-            img = Image.open(self.source_path).convert("RGBA")
+            # 打开源图片，扫描生成的贴图直接使用缓存的解码结果，未命中时才在工作线程中写出真实文件
+            img = get_texture_cache().get_path(self.source_path)
+            if img is None:
+                img = Image.open(scratch_pack.local_path(self.source_path)).convert("RGBA")
             
             # 应用 straight_alpha 转换
             processed_img = self.straight_alpha(img)
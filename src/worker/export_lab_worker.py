@@ -1,13 +1,13 @@
 import logging
 import os
 import shutil
-import tempfile
 
 from PyQt6.QtCore import pyqtSignal, QThread
 
 from src.core.asset_extractor import AssetExtractor
 from src.utils.zip_utils import compress_to_zip
 from src.utils.image_zip import ImageZip
+from src.utils.temp_store import EXPORT_LAB_PREFIX, dir_size, get_temp_store
 
 
 class ExportLabWorker(QThread):
@@ -37,7 +37,8 @@ class ExportLabWorker(QThread):
 
     def run(self):
         try:
-            self.temp_dir = tempfile.mkdtemp(prefix='arknight_export_lab_')
+            temp_store = get_temp_store()
+            self.temp_dir = temp_store.create_dir(EXPORT_LAB_PREFIX)
             self.logger.info(f"创建临时目录: {self.temp_dir}")
             #创建mod_type子目录
             mod_type_dir = os.path.join(self.temp_dir, self.mod_type)
@@ -67,6 +68,8 @@ class ExportLabWorker(QThread):
             )
 
             if success_ab:
+                # 超过临时目录上限时中止导出
+                temp_store.charge(dir_size(mod_type_dir))
                 self.progress.emit("导出AB完成！")
                 # 导出LAB压缩包
                 success_lab = compress_to_zip(
@@ -89,7 +92,7 @@ class ExportLabWorker(QThread):
                             return
                     
                     # 删除临时目录
-                    shutil.rmtree(self.temp_dir)
+                    temp_store.remove_dir(self.temp_dir)
                     self.progress.emit(f"导出LAB压缩包完成！")
                     self.finished.emit()
                 else:
@@ -102,6 +105,5 @@ class ExportLabWorker(QThread):
             self.error.emit(str(e))
         finally:
             # 删除临时目录
-            if self.temp_dir and os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir)
+            if get_temp_store().remove_dir(self.temp_dir):
                 self.logger.info(f"删除临时目录: {self.temp_dir}")
\ No newline at end of file
@@ -0,0 +1,73 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+from typing import Dict, List, Optional, Tuple
+
+from src.core.asset_extractor import AssetExtractor
+from src.utils.archive_writer import ArchiveWriter
+
+
+class ExtractObjectsWorker(QThread):
+    """直接导出选中对象的工作线程"""
+    progress = pyqtSignal(int, int)  # 已处理数、总数
+    finished = pyqtSignal(dict)  # 导出完成，发送统计信息
+    error = pyqtSignal(str)  # 错误信号
+
+    def __init__(self, asset_path: str, path_ids: List[int], output_dir: Optional[str] = None,
+                 archive_path: Optional[str] = None,
+                 replaced_files: Optional[Dict[int, Tuple[str, str]]] = None):
+        """
+        初始化导出工作线程
+
+        Args:
+            asset_path: 资源包路径
+            path_ids: 要导出的对象 path_id 列表
+            output_dir: 输出目录
+            archive_path: 指定时写入该压缩包（.zip / .tar / .tar.gz），不创建目录
+            replaced_files: path_id 到 (类型/文件名, 文件路径) 的映射，编辑或替换过的对象直接写入该文件
+        """
+        super().__init__()
+        self.asset_path = asset_path
+        self.path_ids = path_ids
+        self.output_dir = output_dir
+        self.archive_path = archive_path
+        self.replaced_files = replaced_files or {}
+        self.is_running = True
+
+    def run(self):
+        """执行导出"""
+        try:
+            extractor = AssetExtractor()
+            if self.archive_path:
+                archive = ArchiveWriter(self.archive_path)
+                try:
+                    stats = extractor.extract_objects(
+                        self.asset_path,
+                        self.path_ids,
+                        progress_callback=self.progress.emit,
+                        should_stop=lambda: not self.is_running,
+                        archive=archive,
+                        replaced_files=self.replaced_files
+                    )
+                except Exception:
+                    archive.abort()
+                    raise
+                # 取消时不保留不完整的压缩包
+                if stats["cancelled"]:
+                    archive.abort()
+                else:
+                    archive.close()
+            else:
+                stats = extractor.extract_objects(
+                    self.asset_path,
+                    self.path_ids,
+                    self.output_dir,
+                    progress_callback=self.progress.emit,
+                    should_stop=lambda: not self.is_running,
+                    replaced_files=self.replaced_files
+                )
+            self.finished.emit(stats)
+        except Exception as e:
+            self.error.emit(f"导出资源时出错: {str(e)}")
+
+    def stop(self):
+        """停止导出，已导出的文件会保留"""
+        self.is_running = False
@@ -0,0 +1,42 @@
+"""
+JSON预览的worker线程
+在后台一次性读取并解析文件，小文件生成格式化文本供编辑，大文件只保留截断的原始文本
+"""
+import json
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+# 不超过该字符数时生成格式化文本，可以直接编辑保存
+EDITABLE_TEXT_LIMIT = 2 * 1024 * 1024
+
+# 大文件原始文本视图最多显示的字符数
+RAW_TEXT_LIMIT = 1024 * 1024
+
+
+class JsonPreviewWorker(QThread):
+    """JSON预览的worker线程"""
+    loaded = pyqtSignal(int, object, str, bool)  # 请求编号、解析结果（失败为None）、文本、文本是否被截断
+    error = pyqtSignal(int, str)  # 请求编号、错误信息
+
+    def __init__(self, request_id: int, path: str):
+        super().__init__()
+        self.request_id = request_id
+        self.path = path
+
+    def run(self):
+        try:
+            with open(self.path, 'rb') as f:
+                content = f.read().decode('utf-8', errors='replace')
+
+            try:
+                data = json.loads(content)
+            except json.JSONDecodeError:
+                data = None
+
+            if len(content) <= EDITABLE_TEXT_LIMIT:
+                text = json.dumps(data, indent=2, ensure_ascii=False) if data is not None else content
+                self.loaded.emit(self.request_id, data, text, False)
+            else:
+                self.loaded.emit(self.request_id, data, content[:RAW_TEXT_LIMIT], True)
+        except Exception as e:
+            self.error.emit(self.request_id, str(e))